@@ -0,0 +1,81 @@
+import os
+import requests
+from typing import Dict, Optional
+
+from app.rate_limiter import TokenBucketScheduler, INTERACTIVE, LANE_NAMES
+
+ALPHA_VANTAGE_URL = "https://www.alphavantage.co/query"
+
+
+class AlphaVantageThrottled(Exception):
+    """Alpha Vantage kept answering with its rate-limit notice"""
+
+
+class AlphaVantageClient:
+    """
+    Every Alpha Vantage request goes through one shared token-bucket
+    scheduler, so the per-minute budget is respected across the whole
+    process. Interactive requests jump ahead of background warmups and
+    backfills, and a throttle notice puts the request back in line instead of
+    being mistaken for missing data.
+    """
+
+    def __init__(self, api_key: str = None, calls_per_minute: float = None, max_attempts: int = 3):
+        self.api_key = api_key
+        calls_per_minute = calls_per_minute or float(os.getenv("ALPHA_VANTAGE_CALLS_PER_MINUTE", "5"))
+        self.scheduler = TokenBucketScheduler(calls_per_minute)
+        self.max_attempts = max_attempts
+        # Seconds a user request queues before its caller falls back to another source; well
+        # under EXECUTOR_TIMEOUT, so the fallback can still answer before the handler gives up
+        self.interactive_wait = float(os.getenv("ALPHA_VANTAGE_INTERACTIVE_WAIT", "10"))
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.api_key) and self.api_key != "your_alphavantage_key_here"
+
+    def queue_timeout(self, lane: int) -> Optional[float]:
+        """Queueing budget for a lane: interactive_wait for user requests, unbounded in the background"""
+        return self.interactive_wait if lane == INTERACTIVE else None
+
+    def query(self, params: Dict[str, str], lane: int = INTERACTIVE, timeout: float = None) -> requests.Response:
+        """
+        Run one API call once the rate budget allows it. timeout bounds the
+        time spent queueing (None waits as long as it takes); if the queue is
+        already longer than that, TimeoutError is raised right away.
+        """
+        params = {**params, "apikey": self.api_key}
+        label = f"{params.get('function')} {params.get('symbol', '')}".strip()
+
+        for attempt in range(self.max_attempts):
+            ticket = self.scheduler.enqueue(lane)
+            if ticket.position > 0 or ticket.expected_wait > 0:
+                print(f"  [QUEUE] Alpha Vantage {label} ({LANE_NAMES[lane]}): "
+                      f"position {ticket.position}, ~{ticket.expected_wait:.0f}s wait")
+            if timeout is not None and ticket.expected_wait > timeout:
+                # No point queueing for a token that won't come in time
+                self.scheduler.cancel(ticket)
+                raise TimeoutError(f"Alpha Vantage queue wait (~{ticket.expected_wait:.0f}s) exceeds {timeout:g}s")
+            self.scheduler.wait(ticket, timeout)
+
+            response = requests.get(ALPHA_VANTAGE_URL, params=params, timeout=10)
+            notice = self._throttle_notice(response)
+            if notice is None:
+                return response
+
+            print(f"  [THROTTLED] Alpha Vantage {label}: {notice}")
+            self.scheduler.throttled()
+
+        raise AlphaVantageThrottled(f"Alpha Vantage rate limit hit {self.max_attempts} times for {label}")
+
+    def _throttle_notice(self, response: requests.Response):
+        """The rate-limit message, if this response is one (JSON even for CSV endpoints)"""
+        if not response.text.lstrip().startswith("{"):
+            return None
+        try:
+            data = response.json()
+        except ValueError:
+            return None
+        notice = data.get("Note") or data.get("Information")
+        if notice and ("call frequency" in notice or "rate limit" in notice.lower()):
+            return notice
+        return None
@@ -0,0 +1,112 @@
+import hashlib
+import os
+import re
+import threading
+import unicodedata
+from datetime import timedelta
+from typing import Dict, Iterable
+
+from app.cache import BoundedCache
+
+# Bump whenever relevance terms, the sentiment lexicon or summarization change,
+# so results computed by the old code stop being served
+SCORING_VERSION = 1
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def content_key(title: str, description: str, provider: str = "") -> str:
+    """
+    Hash of an article's provider and normalized title and description.
+    Case, Unicode forms and whitespace don't matter, so the same story
+    fetched again in a later poll maps to the same key. The provider is part
+    of the key because summaries are built differently per provider.
+    """
+    def normalize(text: str) -> str:
+        return _WHITESPACE.sub(" ", unicodedata.normalize("NFKC", text or "")).strip().casefold()
+
+    content = f"{provider}\n{normalize(title)}\n{normalize(description)}"
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+class AnalysisCache:
+    """
+    Per-article analysis results (matched relevance terms, sentiment label
+    and polarity, summary) keyed by content_key(). A memory-bounded LRU sits
+    in front of the article_analyses table, so repeats within a process
+    never leave memory and repeats across restarts or workers skip the
+    scoring. Rows written under another SCORING_VERSION count as misses and
+    are overwritten.
+    """
+
+    def __init__(self, database=None, max_bytes: int = None, version: int = SCORING_VERSION):
+        self.database = database
+        self.version = version
+        self.memory = BoundedCache(
+            max_bytes=max_bytes or int(os.getenv("ANALYSIS_CACHE_MAX_MB", "32")) * 1024 * 1024,
+            ttls={"analysis": timedelta(days=7)},
+        )
+        self._lock = threading.Lock()
+        self.store_hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.store_errors = 0
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Dict]:
+        """Cached analyses for whichever keys have one"""
+        found = {}
+        missing = []
+        for key in set(keys):
+            analysis = self.memory.get("analysis", key)
+            if analysis is None:
+                missing.append(key)
+            else:
+                found[key] = analysis
+
+        stored = {}
+        if missing and self.database is not None:
+            try:
+                stored = self.database.get_article_analyses(missing, self.version)
+            except Exception as e:
+                print(f"Analysis cache read error: {e}")
+                self.store_errors += 1
+        for key, analysis in stored.items():
+            self.memory.set("analysis", key, analysis)
+        found.update(stored)
+
+        with self._lock:
+            self.store_hits += len(stored)
+            self.misses += len(missing) - len(stored)
+        return found
+
+    def put_many(self, analyses: Dict[str, Dict]):
+        """Cache freshly computed analyses in memory and in the store"""
+        if not analyses:
+            return
+        for key, analysis in analyses.items():
+            self.memory.set("analysis", key, analysis)
+        if self.database is not None:
+            try:
+                self.database.save_article_analyses(analyses, self.version)
+            except Exception as e:
+                print(f"Analysis cache write error: {e}")
+                self.store_errors += 1
+                return
+        with self._lock:
+            self.writes += len(analyses)
+
+    def stats(self) -> Dict:
+        memory = self.memory.stats()
+        with self._lock:
+            lookups = memory["hits"] + self.store_hits + self.misses
+            return {
+                "scoring_version": self.version,
+                "memory_entries": memory["entries"],
+                "memory_bytes": memory["bytes"],
+                "memory_hits": memory["hits"],
+                "store_hits": self.store_hits,
+                "misses": self.misses,
+                "hit_rate": round((memory["hits"] + self.store_hits) / lookups, 4) if lookups else 0.0,
+                "writes": self.writes,
+                "store_errors": self.store_errors,
+            }
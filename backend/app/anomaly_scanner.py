@@ -0,0 +1,103 @@
+import numpy as np
+from typing import Dict
+
+from numpy.lib.stride_tricks import sliding_window_view
+
+from app.event_study import ESTIMATION_WINDOW, _prefix_sums
+from app.market_model import fit_from_sums
+
+# Defaults for flagging a day as an event
+Z_THRESHOLD = 3.0
+VOLATILITY_WINDOW = 5
+VOLATILITY_THRESHOLD = 2.5
+
+
+def scan_anomalies(
+    stock_returns: np.ndarray,
+    market_returns: np.ndarray,
+    estimation_days: int = ESTIMATION_WINDOW,
+    volatility_window: int = VOLATILITY_WINDOW,
+    z_threshold: float = Z_THRESHOLD,
+    volatility_threshold: float = VOLATILITY_THRESHOLD,
+    min_estimation: int = 60,
+) -> Dict[str, np.ndarray]:
+    """
+    Scan whole return histories for days that look like events.
+
+    stock_returns is one series or a (days x tickers) panel aligned with the
+    market series, NaN marking a missing return. For every day t the market
+    model is refitted on the estimation_days sessions ending just before the
+    trailing volatility window [t - volatility_window + 1, t], so the day
+    being scored never contaminates its own baseline.
+
+    A day is flagged when its abnormal return is more than z_threshold
+    residual standard deviations from zero, or when the trailing window's
+    volatility first rises above volatility_threshold times the estimation
+    window's. Regression sums come from cumulative sums and the trailing
+    windows from strided views, so the cost is linear in days x tickers.
+
+    Returns (days x tickers) arrays of abnormal_return (in percent), z,
+    volatility_ratio and flagged.
+    """
+    if stock_returns.ndim == 1:
+        stock_returns = stock_returns[:, np.newaxis]
+    days = len(stock_returns)
+
+    market_returns = market_returns[:, np.newaxis]
+    observed = np.isfinite(stock_returns) & np.isfinite(market_returns)
+    x = np.where(observed, market_returns, 0.0)
+    y = np.where(observed, stock_returns, 0.0)
+
+    count = _prefix_sums(observed.astype(np.float64))
+    sum_x = _prefix_sums(x)
+    sum_y = _prefix_sums(y)
+    sum_xx = _prefix_sums(x * x)
+    sum_xy = _prefix_sums(x * y)
+    sum_yy = _prefix_sums(y * y)
+
+    # Estimation window [lo, hi) for every day, as row offsets into the prefix sums
+    t = np.arange(days)
+    hi = np.clip(t - volatility_window + 1, 0, days)
+    lo = np.clip(hi - estimation_days, 0, days)
+
+    n_est = count[hi] - count[lo]
+    sy = sum_y[hi] - sum_y[lo]
+    syy = sum_yy[hi] - sum_yy[lo]
+
+    # Trailing volatility window as strided views over the day axis (no copies)
+    trailing_n = np.full(y.shape, np.nan)
+    trailing_sy = np.full(y.shape, np.nan)
+    trailing_syy = np.full(y.shape, np.nan)
+    if days >= volatility_window:
+        trailing_n[volatility_window - 1:] = sliding_window_view(observed, volatility_window, axis=0).sum(axis=-1)
+        trailing_sy[volatility_window - 1:] = sliding_window_view(y, volatility_window, axis=0).sum(axis=-1)
+        trailing_syy[volatility_window - 1:] = sliding_window_view(y * y, volatility_window, axis=0).sum(axis=-1)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        model = fit_from_sums(
+            n_est, sum_x[hi] - sum_x[lo], sy, sum_xx[hi] - sum_xx[lo], sum_xy[hi] - sum_xy[lo], syy
+        )
+        abnormal = stock_returns - model.alpha - model.beta * market_returns
+        z = abnormal / np.sqrt(model.residual_variance)
+
+        baseline_vol = np.sqrt((syy - sy * sy / n_est) / (n_est - 1))
+        trailing_vol = np.sqrt((trailing_syy - trailing_sy * trailing_sy / trailing_n) / (trailing_n - 1))
+        volatility_ratio = trailing_vol / baseline_vol
+
+    enough = (n_est >= min_estimation) & observed
+    z = np.where(enough & np.isfinite(z), z, np.nan)
+    volatility_ratio = np.where(enough & np.isfinite(volatility_ratio), volatility_ratio, np.nan)
+
+    # Only the day volatility crosses the threshold counts, not the days it stays there
+    high_volatility = volatility_ratio >= volatility_threshold
+    volatility_onset = high_volatility.copy()
+    volatility_onset[1:] &= ~high_volatility[:-1]
+
+    flagged = (np.abs(z) >= z_threshold) | volatility_onset
+
+    return {
+        "abnormal_return": abnormal * 100,
+        "z": z,
+        "volatility_ratio": volatility_ratio,
+        "flagged": flagged,
+    }
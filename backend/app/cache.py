@@ -0,0 +1,112 @@
+import sys
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Any, Dict, Hashable
+
+import numpy as np
+import pandas as pd
+
+_MISSING = object()
+
+
+def estimate_size(value: Any) -> int:
+    """Rough in-memory footprint of a cached value, in bytes"""
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        usage = value.memory_usage(deep=True)
+        return int(usage.sum() if isinstance(usage, pd.Series) else usage)
+    if isinstance(value, np.memmap):
+        # File-backed pages belong to the OS page cache, not the heap
+        return sys.getsizeof(value)
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes) + sys.getsizeof(value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(estimate_size(k) + estimate_size(v) for k, v in value.items())
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return sys.getsizeof(value) + sum(estimate_size(item) for item in value)
+    return sys.getsizeof(value)
+
+
+class BoundedCache:
+    """
+    Thread-safe LRU cache bounded by the estimated memory footprint of its
+    entries rather than their count. Every key belongs to a key class (e.g.
+    "past_events") with its own TTL, and hit/miss/eviction counters are kept
+    for monitoring.
+    """
+
+    def __init__(self, max_bytes: int, ttls: Dict[str, timedelta] = None,
+                 default_ttl: timedelta = timedelta(minutes=15)):
+        self.max_bytes = max_bytes
+        self.ttls = ttls or {}
+        self.default_ttl = default_ttl
+        self._entries: "OrderedDict[tuple, tuple]" = OrderedDict()  # key -> (value, size, expires_at)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key_class: str, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value, or default if it is missing or expired"""
+        entry_key = (key_class, key)
+        with self._lock:
+            entry = self._entries.get(entry_key, _MISSING)
+            if entry is _MISSING:
+                self.misses += 1
+                return default
+
+            value, size, expires_at = entry
+            if datetime.now() >= expires_at:
+                self._remove(entry_key)
+                self.expirations += 1
+                self.misses += 1
+                return default
+
+            self._entries.move_to_end(entry_key)
+            self.hits += 1
+            return value
+
+    def set(self, key_class: str, key: Hashable, value: Any, ttl: timedelta = None):
+        """Cache a value, evicting least recently used entries to stay under max_bytes"""
+        entry_key = (key_class, key)
+        size = estimate_size(value)
+        expires_at = datetime.now() + (ttl or self.ttls.get(key_class, self.default_ttl))
+
+        with self._lock:
+            if entry_key in self._entries:
+                self._remove(entry_key)
+            if size > self.max_bytes:
+                # Never worth flushing the whole cache for one oversized value
+                return
+
+            self._entries[entry_key] = (value, size, expires_at)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                oldest_key = next(iter(self._entries))
+                self._remove(oldest_key)
+                self.evictions += 1
+
+    def invalidate(self, key_class: str, key: Hashable):
+        with self._lock:
+            if (key_class, key) in self._entries:
+                self._remove((key_class, key))
+
+    def _remove(self, entry_key: tuple):
+        _, size, _ = self._entries.pop(entry_key)
+        self._bytes -= size
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
@@ -1,7 +1,8 @@
-from sqlalchemy import create_engine, Column, Integer, String, Float, TIMESTAMP, JSON
+from sqlalchemy import create_engine, inspect, text, Column, BigInteger, Integer, String, Float, TIMESTAMP, JSON, ForeignKey, Index, and_, case, or_
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from datetime import datetime
+from typing import Optional
 
 Base = declarative_base()
 
@@ -18,6 +19,10 @@ class Stock(Base):
     id = Column(Integer, primary_key=True, index=True)
     ticker = Column(String, unique=True, index=True)
     company_name = Column(String)
+    # Last time a user asked for this ticker's news; news ingestion stops for stale ones
+    last_requested_at = Column(TIMESTAMP)
+    # Last anomaly scan of the ticker's history; an empty scan is still a scan
+    anomalies_scanned_at = Column(TIMESTAMP)
 
 class Event(Base):
     __tablename__ = "events"
@@ -35,12 +40,59 @@ class Article(Base):
     __tablename__ = "articles"
 
     id = Column(Integer, primary_key=True, index=True)
-    ticker = Column(String, index=True)
+    canonical_url = Column(String, unique=True, nullable=False)
+    provider = Column(String)
     title = Column(String)
     url = Column(String)
+    published_at = Column(TIMESTAMP, index=True)
+    sentiment = Column(String)
+    polarity = Column(Float)
+    summary = Column(String)
+    created_at = Column(TIMESTAMP, default=datetime.now)
+
+class ArticleTicker(Base):
+    """Which tickers an article is relevant to (published_at copied for the per-ticker index)"""
+    __tablename__ = "article_tickers"
+    __table_args__ = (Index("idx_article_tickers_recent", "ticker", "published_at"),)
+
+    article_id = Column(Integer, ForeignKey("articles.id", ondelete="CASCADE"), primary_key=True)
+    ticker = Column(String, primary_key=True)
+    relevance = Column(Integer)
     published_at = Column(TIMESTAMP)
+
+class ArticleFingerprint(Base):
+    """Headline SimHash of each stored story, filed once per band for near-duplicate lookups"""
+    __tablename__ = "article_fingerprints"
+
+    band = Column(Integer, primary_key=True)
+    value = Column(Integer, primary_key=True)
+    article_id = Column(Integer, ForeignKey("articles.id", ondelete="CASCADE"), primary_key=True)
+    # 64-bit fingerprint stored as a signed BIGINT
+    fingerprint = Column(BigInteger)
+
+class NewsWatermark(Base):
+    """Newest published_at seen per ticker and provider, so polls only ask for newer items"""
+    __tablename__ = "news_watermarks"
+
+    ticker = Column(String, primary_key=True)
+    provider = Column(String, primary_key=True)
+    last_published_at = Column(TIMESTAMP)
+    last_polled_at = Column(TIMESTAMP)
+
+class ArticleAnalysis(Base):
+    __tablename__ = "article_analyses"
+
+    content_hash = Column(String(64), primary_key=True)
+    scoring_version = Column(Integer)
+    matches = Column(JSON)
     sentiment = Column(String)
+    polarity = Column(Float)
     summary = Column(String)
+    created_at = Column(TIMESTAMP, default=datetime.now)
+
+def _signed64(value: int) -> int:
+    """Unsigned 64-bit value as the signed integer a BIGINT column holds"""
+    return value - (1 << 64) if value >= 1 << 63 else value
 
 class Database:
     def __init__(self, database_url: str = None):
@@ -54,13 +106,44 @@ class Database:
             # Fallback to SQLite for easy hackathon setup
             self.engine = create_engine("sqlite:///./stocklens.db")
 
+        self._migrate()
         Base.metadata.create_all(bind=self.engine)
         self.SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
 
+    def _migrate(self):
+        """
+        Bring tables created by older versions up to the current models
+        (create_all only creates missing tables). The old one-row-per-ticker
+        articles table is kept as articles_legacy and a new one is created.
+        """
+        inspector = inspect(self.engine)
+        tables = inspector.get_table_names()
+        if "articles" in tables and "canonical_url" not in {c["name"] for c in inspector.get_columns("articles")}:
+            print("Migrating articles table (old rows kept in articles_legacy)")
+            with self.engine.begin() as connection:
+                connection.execute(text("ALTER TABLE articles RENAME TO articles_legacy"))
+                # Index names are shared per schema; free them for the new table
+                for index in inspect(connection).get_indexes("articles_legacy"):
+                    connection.execute(text(f'DROP INDEX IF EXISTS "{index["name"]}"'))
+        if "stocks" in tables:
+            columns = {c["name"] for c in inspector.get_columns("stocks")}
+            with self.engine.begin() as connection:
+                for column in ("last_requested_at", "anomalies_scanned_at"):
+                    if column not in columns:
+                        connection.execute(text(f"ALTER TABLE stocks ADD COLUMN {column} TIMESTAMP"))
+
     def get_session(self):
         """Get database session"""
         return self.SessionLocal()
 
+    def _insert(self, model):
+        """INSERT that supports ON CONFLICT upserts on both PostgreSQL and SQLite"""
+        if self.engine.dialect.name == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+        return insert(model)
+
     def add_stock(self, ticker: str, company_name: str):
         """Add a stock to the database"""
         session = self.get_session()
@@ -75,6 +158,44 @@ class Database:
         finally:
             session.close()
 
+    def track_tickers(self, tickers: dict, requested_at: datetime):
+        """
+        Add tickers ({ticker: company name}) to the tracked set (the stocks
+        table), or mark ones already there as requested at requested_at
+        """
+        session = self.get_session()
+        try:
+            insert = self._insert(Stock)
+            session.execute(
+                insert.values([
+                    {"ticker": ticker, "company_name": company_name, "last_requested_at": requested_at}
+                    for ticker, company_name in tickers.items()
+                ])
+                .on_conflict_do_update(
+                    index_elements=["ticker"],
+                    set_={"last_requested_at": insert.excluded.last_requested_at},
+                )
+            )
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            raise e
+        finally:
+            session.close()
+
+    def get_tracked_tickers(self, requested_since: datetime) -> dict:
+        """{ticker: last requested at} for tickers someone asked for since the given time"""
+        session = self.get_session()
+        try:
+            rows = (
+                session.query(Stock.ticker, Stock.last_requested_at)
+                .filter(Stock.last_requested_at >= requested_since)
+                .all()
+            )
+            return dict(rows)
+        finally:
+            session.close()
+
     def add_event(self, ticker: str, event_type: str, date: datetime, car: float, vol_ratio: float, sentiment: str):
         """Add an event to the database"""
         session = self.get_session()
@@ -95,3 +216,325 @@ class Database:
             raise e
         finally:
             session.close()
+
+    def replace_detected_events(self, ticker: str, events: list):
+        """Replace a ticker's stored anomaly-scan results with a fresh scan, and mark it scanned"""
+        session = self.get_session()
+        try:
+            insert = self._insert(Stock)
+            session.execute(
+                insert.values(ticker=ticker, anomalies_scanned_at=datetime.now())
+                .on_conflict_do_update(
+                    index_elements=["ticker"],
+                    set_={"anomalies_scanned_at": insert.excluded.anomalies_scanned_at},
+                )
+            )
+            session.query(Event).filter(Event.ticker == ticker, Event.type == "Detected Anomaly").delete()
+            session.add_all([
+                Event(
+                    ticker=ticker,
+                    type="Detected Anomaly",
+                    date=datetime.fromisoformat(event["date"]),
+                    meta={"z_score": event["z_score"], "conclusion": event["conclusion"]},
+                    car_0_1=event["car_0_1"],
+                    volatility_ratio=event["volatility_change"],
+                    sentiment=event["sentiment"]
+                )
+                for event in events
+            ])
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            raise e
+        finally:
+            session.close()
+
+    def get_detected_events(self, ticker: str) -> Optional[list]:
+        """Stored anomaly-scan results for a ticker, oldest first, or None if it was never scanned"""
+        session = self.get_session()
+        try:
+            rows = (
+                session.query(Event)
+                .filter(Event.ticker == ticker, Event.type == "Detected Anomaly")
+                .order_by(Event.date)
+                .all()
+            )
+            # Results stored before scans were marked count as scanned too
+            scanned = bool(rows) or session.query(Stock.id).filter(
+                Stock.ticker == ticker, Stock.anomalies_scanned_at.isnot(None)
+            ).first() is not None
+            if not scanned:
+                return None
+            return [
+                {
+                    "ticker": row.ticker,
+                    "event": row.type,
+                    "date": row.date.isoformat(),
+                    "car_0_1": row.car_0_1,
+                    "volatility_change": row.volatility_ratio,
+                    "sentiment": row.sentiment,
+                    "conclusion": (row.meta or {}).get("conclusion", ""),
+                    "z_score": (row.meta or {}).get("z_score", 0.0),
+                }
+                for row in rows
+            ]
+        finally:
+            session.close()
+
+    def get_article_analyses(self, content_hashes: list, scoring_version: int) -> dict:
+        """Stored article analyses by content hash, only those from the current scoring version"""
+        session = self.get_session()
+        try:
+            rows = (
+                session.query(ArticleAnalysis)
+                .filter(
+                    ArticleAnalysis.content_hash.in_(content_hashes),
+                    ArticleAnalysis.scoring_version == scoring_version,
+                )
+                .all()
+            )
+            return {
+                row.content_hash: {
+                    "matches": row.matches or [],
+                    "sentiment": row.sentiment,
+                    "polarity": row.polarity,
+                    "summary": row.summary,
+                }
+                for row in rows
+            }
+        finally:
+            session.close()
+
+    def save_article_analyses(self, analyses: dict, scoring_version: int):
+        """Insert or overwrite article analyses keyed by content hash"""
+        session = self.get_session()
+        try:
+            for content_hash, analysis in analyses.items():
+                session.merge(ArticleAnalysis(
+                    content_hash=content_hash,
+                    scoring_version=scoring_version,
+                    matches=analysis["matches"],
+                    sentiment=analysis["sentiment"],
+                    polarity=analysis["polarity"],
+                    summary=analysis["summary"],
+                    created_at=datetime.now()
+                ))
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            raise e
+        finally:
+            session.close()
+
+    def upsert_articles(self, articles: list):
+        """
+        Store articles keyed by canonical_url, with the tickers each one is
+        relevant to ({ticker: relevance} under "tags"). A re-fetched article
+        keeps its first published_at. An article whose "story" is another
+        stored article (a syndicated copy) only adds its tickers to that
+        article; the stored row is left as it is. Stories are stored with
+        their headline "fingerprint" and bands ({band: value} under "bands")
+        when given.
+        """
+        session = self.get_session()
+        try:
+            for start in range(0, len(articles), 100):
+                chunk = articles[start:start + 100]
+                stories = {
+                    canonical_url: (article_id, published_at)
+                    for canonical_url, article_id, published_at in (
+                        session.query(Article.canonical_url, Article.id, Article.published_at)
+                        .filter(Article.canonical_url.in_([
+                            article["story"] for article in chunk
+                            if article.get("story", article["canonical_url"]) != article["canonical_url"]
+                        ]))
+                        .all()
+                    )
+                }
+                # Copies of a story that is no longer stored are stored themselves
+                keys = [
+                    article["story"] if article.get("story") in stories else article["canonical_url"]
+                    for article in chunk
+                ]
+                rows = [article for article, key in zip(chunk, keys) if key == article["canonical_url"]]
+
+                if rows:
+                    insert = self._insert(Article)
+                    session.execute(insert.values([
+                        {
+                            "canonical_url": article["canonical_url"],
+                            "provider": article["provider"],
+                            "title": article["title"],
+                            "url": article["url"],
+                            "published_at": article["published_at"],
+                            "sentiment": article["sentiment"],
+                            "polarity": article["polarity"],
+                            "summary": article["summary"],
+                            "created_at": datetime.now(),
+                        }
+                        for article in rows
+                    ]).on_conflict_do_update(
+                        index_elements=["canonical_url"],
+                        set_={
+                            "title": insert.excluded.title,
+                            "sentiment": insert.excluded.sentiment,
+                            "polarity": insert.excluded.polarity,
+                            "summary": insert.excluded.summary,
+                        },
+                    ))
+                    ids = dict(
+                        session.query(Article.canonical_url, Article.id)
+                        .filter(Article.canonical_url.in_([article["canonical_url"] for article in rows]))
+                        .all()
+                    )
+                    for article in rows:
+                        stories[article["canonical_url"]] = (ids[article["canonical_url"]], article["published_at"])
+
+                    fingerprint_rows = [
+                        {
+                            "band": band,
+                            "value": value,
+                            "article_id": ids[article["canonical_url"]],
+                            "fingerprint": _signed64(article["fingerprint"]),
+                        }
+                        for article in rows if article.get("fingerprint")
+                        for band, value in article.get("bands", {}).items()
+                    ]
+                    if fingerprint_rows:
+                        session.execute(self._insert(ArticleFingerprint).values(fingerprint_rows)
+                                        .on_conflict_do_nothing())
+
+                # Tagged under the stored story, with its published_at for the per-ticker index
+                tag_rows = {}
+                for article, key in zip(chunk, keys):
+                    article_id, published_at = stories[key]
+                    for ticker, relevance in article["tags"].items():
+                        tag_rows[(article_id, ticker)] = {
+                            "article_id": article_id,
+                            "ticker": ticker,
+                            "relevance": relevance,
+                            "published_at": published_at,
+                        }
+                if tag_rows:
+                    insert = self._insert(ArticleTicker)
+                    session.execute(insert.values(list(tag_rows.values())).on_conflict_do_update(
+                        index_elements=["article_id", "ticker"],
+                        set_={"relevance": insert.excluded.relevance},
+                    ))
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            raise e
+        finally:
+            session.close()
+
+    def get_story_fingerprints(self, bands: dict, since: datetime) -> dict:
+        """
+        {canonical_url: fingerprint} of stories published since the given time
+        that share a band value ({band: [values]}) with the headlines asked about
+        """
+        conditions = [
+            and_(ArticleFingerprint.band == band, ArticleFingerprint.value.in_(list(values)))
+            for band, values in bands.items() if values
+        ]
+        if not conditions:
+            return {}
+        session = self.get_session()
+        try:
+            rows = (
+                session.query(Article.canonical_url, ArticleFingerprint.fingerprint)
+                .join(Article, Article.id == ArticleFingerprint.article_id)
+                .filter(or_(*conditions), Article.published_at >= since)
+                .distinct()
+                .all()
+            )
+            return {canonical_url: fingerprint & 0xFFFFFFFFFFFFFFFF for canonical_url, fingerprint in rows}
+        finally:
+            session.close()
+
+    def get_recent_articles(self, tickers: list, since: datetime, limit: int = 20) -> list:
+        """Newest stored articles for the tickers, one row per (article, ticker)"""
+        session = self.get_session()
+        try:
+            rows = (
+                session.query(ArticleTicker.ticker, Article)
+                .join(Article, Article.id == ArticleTicker.article_id)
+                .filter(ArticleTicker.ticker.in_(tickers), ArticleTicker.published_at >= since)
+                .order_by(ArticleTicker.published_at.desc())
+                .limit(limit)
+                .all()
+            )
+            return [
+                {
+                    "ticker": ticker,
+                    "title": article.title,
+                    "sentiment": article.sentiment,
+                    "summary": article.summary,
+                    "url": article.url,
+                    "published_at": article.published_at.isoformat(),
+                }
+                for ticker, article in rows
+            ]
+        finally:
+            session.close()
+
+    def get_tickers_with_articles(self, tickers: list, since: datetime) -> set:
+        """Which of the tickers have any stored article since the given time"""
+        session = self.get_session()
+        try:
+            rows = (
+                session.query(ArticleTicker.ticker)
+                .filter(ArticleTicker.ticker.in_(tickers), ArticleTicker.published_at >= since)
+                .distinct()
+                .all()
+            )
+            return {ticker for ticker, in rows}
+        finally:
+            session.close()
+
+    def get_news_watermarks(self, tickers: list) -> dict:
+        """{(ticker, provider): {"last_published_at", "last_polled_at"}} for the tickers"""
+        session = self.get_session()
+        try:
+            rows = session.query(NewsWatermark).filter(NewsWatermark.ticker.in_(tickers)).all()
+            return {
+                (row.ticker, row.provider): {
+                    "last_published_at": row.last_published_at,
+                    "last_polled_at": row.last_polled_at,
+                }
+                for row in rows
+            }
+        finally:
+            session.close()
+
+    def advance_news_watermarks(self, watermarks: dict, polled_at: datetime):
+        """
+        Record a poll per (ticker, provider) and move its high-water mark up to
+        the newest published_at seen (None if the poll returned nothing).
+        Marks never move backwards.
+        """
+        session = self.get_session()
+        try:
+            for (ticker, provider), last_published_at in watermarks.items():
+                insert = self._insert(NewsWatermark).values(
+                    ticker=ticker, provider=provider,
+                    last_published_at=last_published_at, last_polled_at=polled_at
+                )
+                existing = NewsWatermark.__table__.c.last_published_at
+                newer = insert.excluded.last_published_at
+                session.execute(insert.on_conflict_do_update(
+                    index_elements=["ticker", "provider"],
+                    set_={
+                        "last_polled_at": insert.excluded.last_polled_at,
+                        "last_published_at": case(
+                            (or_(existing.is_(None), newer > existing), newer),
+                            else_=existing,
+                        ),
+                    },
+                ))
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            raise e
+        finally:
+            session.close()
@@ -0,0 +1,250 @@
+import hashlib
+import re
+import threading
+import time
+from collections import deque
+from functools import lru_cache
+from typing import Dict, Hashable, List, Optional, Set, Tuple
+from urllib.parse import parse_qsl, unquote, urlencode, urlsplit, urlunsplit
+
+import numpy as np
+
+# Query parameters that only track where a click came from
+TRACKING_PARAMS = {
+    "fbclid", "gclid", "dclid", "msclkid", "yclid", "mc_cid", "mc_eid", "_hsenc", "_hsmi",
+    "ref", "ref_src", "referrer", "src", "source", "cmpid", "cmp", "ncid", "ocid", "soc_src",
+    "soc_trk", "taid", "guccounter", "guce_referrer", "guce_referrer_sig", "siteid", "yptr",
+    "mod", "feedtype", "outputtype", "amp", "__twitter_impression", "sr_share", "smid", "partner",
+}
+TRACKING_PREFIXES = ("utm_", "utm-", "pk_", "mtm_", "hsa_", "at_", "itm_")
+
+# Hamming distance up to which two headlines count as the same story
+MAX_DISTANCE = 3
+# 64-bit fingerprints split into 4 x 16-bit bands: MAX_DISTANCE + 1 bands means
+# two fingerprints within MAX_DISTANCE agree exactly on at least one band
+BANDS = 4
+
+_WORD = re.compile(r"[a-z0-9]+(?:['’.][a-z0-9]+)*")
+# " - Reuters", " | Yahoo Finance": the outlet appended to syndicated headlines
+_SOURCE_SUFFIX = re.compile(r"\s+[-|–—]\s+[^-|–—]{1,40}$")
+_BIT_SHIFTS = np.arange(64, dtype=np.uint64)
+
+
+def canonical_url(url: str) -> str:
+    """
+    One spelling per article URL: lowercase scheme and host without "www."
+    or "amp.", no tracking parameters, AMP paths or fragments, remaining
+    parameters sorted, no trailing slash. Google AMP cache links resolve
+    to the publisher URL they wrap.
+    """
+    if not url:
+        return ""
+    parts = urlsplit(url.strip())
+    host = (parts.hostname or "").lower()
+    path = parts.path
+
+    # https://www.google.com/amp/s/publisher.com/story -> https://publisher.com/story
+    if host.endswith("google.com") and path.startswith("/amp/"):
+        wrapped = path[len("/amp/"):]
+        if wrapped.startswith("s/"):
+            wrapped = wrapped[2:]
+        return canonical_url("https://" + unquote(wrapped))
+    # publisher-com.cdn.ampproject.org/c/s/publisher.com/story
+    if host.endswith("cdn.ampproject.org"):
+        wrapped = re.sub(r"^/[a-z]/(s/)?", "", path)
+        return canonical_url("https://" + unquote(wrapped))
+
+    for prefix in ("www.", "amp.", "m."):
+        if host.startswith(prefix):
+            host = host[len(prefix):]
+    if parts.port and parts.port not in (80, 443):
+        host = f"{host}:{parts.port}"
+
+    path = re.sub(r"/amp(?:/|\.html)?$", "", path)
+    path = re.sub(r"/amp/", "/", path)
+    path = re.sub(r"\.amp(\.html?)?$", r"\1", path)
+    path = path.rstrip("/") or "/"
+
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith(TRACKING_PREFIXES)
+    )
+    scheme = "https" if parts.scheme in ("http", "https", "") else parts.scheme.lower()
+    return urlunsplit((scheme, host, path, urlencode(query), ""))
+
+
+@lru_cache(maxsize=65536)
+def _feature_hash(feature: str) -> int:
+    return int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def simhash(text: str) -> int:
+    """
+    64-bit SimHash of a headline over its words and word pairs. Headlines
+    that differ by a word or two land a few bits apart; unrelated ones
+    about 32 apart.
+    """
+    words = _WORD.findall(_SOURCE_SUFFIX.sub("", text or "").lower())
+    features = set(words) | {f"{a} {b}" for a, b in zip(words, words[1:])}
+    if not features:
+        return 0
+    hashes = np.fromiter((_feature_hash(feature) for feature in features), dtype=np.uint64, count=len(features))
+    # Each feature votes +1 / -1 on every bit; the fingerprint keeps the majority
+    bits = (hashes[:, None] >> _BIT_SHIFTS) & np.uint64(1)
+    votes = 2 * bits.sum(axis=0, dtype=np.int64) - len(features)
+    return int(np.packbits((votes > 0)[::-1]).view(">u8")[0])
+
+
+class SimHashIndex:
+    """
+    Near-duplicate lookup over 64-bit fingerprints. Each fingerprint is
+    filed under its bands (BANDS slices of 64 / BANDS bits). A query only
+    compares against fingerprints that share a band with it, so lookups
+    cost a few bucket reads however many fingerprints are indexed.
+    """
+
+    def __init__(self, bands: int = BANDS, max_distance: int = MAX_DISTANCE):
+        if bands <= max_distance:
+            raise ValueError("Need more bands than max_distance to guarantee matches")
+        self.bands = bands
+        self.max_distance = max_distance
+        self._width = 64 // bands
+        self._mask = (1 << self._width) - 1
+        self._buckets: List[Dict[int, Set[Hashable]]] = [{} for _ in range(bands)]
+        self._fingerprints: Dict[Hashable, int] = {}
+
+    def band_values(self, fingerprint: int) -> List[int]:
+        return [(fingerprint >> (band * self._width)) & self._mask for band in range(self.bands)]
+
+    def add(self, key: Hashable, fingerprint: int):
+        self.remove(key)
+        self._fingerprints[key] = fingerprint
+        for buckets, value in zip(self._buckets, self.band_values(fingerprint)):
+            buckets.setdefault(value, set()).add(key)
+
+    def remove(self, key: Hashable):
+        fingerprint = self._fingerprints.pop(key, None)
+        if fingerprint is None:
+            return
+        for buckets, value in zip(self._buckets, self.band_values(fingerprint)):
+            bucket = buckets.get(value)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del buckets[value]
+
+    def find(self, fingerprint: int) -> Optional[Hashable]:
+        """Key of the closest indexed fingerprint within max_distance, if any"""
+        best, best_distance = None, self.max_distance + 1
+        for buckets, value in zip(self._buckets, self.band_values(fingerprint)):
+            for key in buckets.get(value, ()):
+                distance = (self._fingerprints[key] ^ fingerprint).bit_count()
+                if distance < best_distance:
+                    best, best_distance = key, distance
+        return best
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._fingerprints
+
+    def __len__(self) -> int:
+        return len(self._fingerprints)
+
+
+class Deduplicator:
+    """
+    Groups copies of the same story: same canonical URL, or a headline
+    within MAX_DISTANCE bits of one seen before. Stories stay indexed for
+    retention_seconds, so repeats across polls and providers map to the
+    story key of their first copy.
+    """
+
+    def __init__(self, retention_seconds: float = 7 * 24 * 3600):
+        self.retention_seconds = retention_seconds
+        self.index = SimHashIndex()
+        self._urls: Dict[str, str] = {}  # canonical url -> story key
+        self._added: deque = deque()  # (time added, story key, canonical url, created the story)
+        self._lock = threading.Lock()
+        self.url_duplicates = 0
+        self.near_duplicates = 0
+
+    def story_key(self, article: Dict) -> str:
+        """Story key for an article (the canonical URL of its first copy), indexing it if new"""
+        return self._story(article)[0]
+
+    def _story(self, article: Dict) -> Tuple[str, str, int]:
+        """(story key, canonical url, headline fingerprint), indexing the article if new"""
+        url = canonical_url(article.get("url", ""))
+        fingerprint = simhash(article.get("title", ""))
+        with self._lock:
+            self._expire()
+            story = self._urls.get(url) if url else None
+            if story is not None:
+                self.url_duplicates += 1
+                return story, url, fingerprint
+
+            story = self.index.find(fingerprint) if fingerprint else None
+            created = story is None
+            if created:
+                story = url or f"simhash:{fingerprint:016x}"
+                self.index.add(story, fingerprint)
+            else:
+                self.near_duplicates += 1
+            if url:
+                self._urls[url] = story
+            self._added.append((time.monotonic(), story, url, created))
+            return story, url, fingerprint
+
+    def seed(self, stories: Dict[str, int]):
+        """
+        Index stories stored earlier ({story key: fingerprint}), e.g. by
+        another worker or before a restart, so their copies map to them.
+        Stories already indexed are left as they are.
+        """
+        with self._lock:
+            for story, fingerprint in stories.items():
+                url = "" if story.startswith("simhash:") else story
+                if story in self.index or (url and url in self._urls):
+                    continue
+                self.index.add(story, fingerprint)
+                if url:
+                    self._urls[url] = story
+                self._added.append((time.monotonic(), story, url, True))
+
+    def dedupe(self, articles: List[Dict]) -> List[Dict]:
+        """
+        First copy of each story, with its canonical_url, headline fingerprint
+        and story key. The tickers the copies were fetched for (fetched_for)
+        are merged into it.
+        """
+        unique = {}
+        for article in articles:
+            story, url, fingerprint = self._story(article)
+            if story not in unique:
+                unique[story] = {
+                    **article,
+                    "canonical_url": url,
+                    "fingerprint": fingerprint,
+                    "story": story,
+                    "fetched_for": set(article.get("fetched_for", ())),
+                }
+            else:
+                unique[story]["fetched_for"] |= set(article.get("fetched_for", ()))
+        return list(unique.values())
+
+    def _expire(self):
+        cutoff = time.monotonic() - self.retention_seconds
+        while self._added and self._added[0][0] < cutoff:
+            _, story, url, created = self._added.popleft()
+            if url and self._urls.get(url) == story:
+                del self._urls[url]
+            if created:
+                self.index.remove(story)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "stories": len(self.index),
+                "urls": len(self._urls),
+                "url_duplicates": self.url_duplicates,
+                "near_duplicates": self.near_duplicates,
+            }
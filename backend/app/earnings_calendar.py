@@ -0,0 +1,153 @@
+import csv
+import os
+import threading
+from datetime import date, datetime, timedelta
+from io import StringIO
+from typing import Dict, List, NamedTuple, Optional
+
+import numpy as np
+
+from app.alpha_vantage import AlphaVantageClient
+from app.rate_limiter import BACKGROUND, INTERACTIVE
+from app.single_flight import SingleFlight
+
+
+class TickerEarnings(NamedTuple):
+    """One ticker's scheduled reports, sorted by report date"""
+    dates: np.ndarray  # datetime64[D]
+    records: List[Dict]
+
+
+class EarningsCalendar:
+    """
+    Whole-market earnings calendar from one bulk Alpha Vantage
+    EARNINGS_CALENDAR call per refresh, indexed by ticker and sorted by date.
+    Lookups are dictionary hits plus a binary search; the raw CSV is kept on
+    disk so a restart doesn't need a new download.
+    """
+
+    def __init__(self, alpha_vantage: AlphaVantageClient, path: str = None,
+                 refresh_interval: timedelta = timedelta(hours=24), horizon: str = "3month"):
+        self.alpha_vantage = alpha_vantage
+        self.path = path or os.getenv("EARNINGS_CALENDAR_PATH", "./data/earnings_calendar.csv")
+        self.refresh_interval = refresh_interval
+        self.horizon = horizon
+        self._index: Dict[str, TickerEarnings] = {}
+        self.loaded_at: Optional[datetime] = None
+        self._last_attempt: Optional[datetime] = None
+        self._flights = SingleFlight()
+        self._load_from_disk()
+
+    def _load_from_disk(self):
+        try:
+            with open(self.path) as f:
+                text = f.read()
+            self._index = self._build_index(text)
+            self.loaded_at = datetime.fromtimestamp(os.path.getmtime(self.path))
+        except OSError:
+            pass
+
+    def _build_index(self, text: str) -> Dict[str, TickerEarnings]:
+        rows: Dict[str, List[Dict]] = {}
+        for row in csv.DictReader(StringIO(text)):
+            symbol = (row.get("symbol") or "").upper()
+            report_date = row.get("reportDate")
+            if not symbol or not report_date:
+                continue
+            rows.setdefault(symbol, []).append({
+                "ticker": symbol,
+                "date": report_date,
+                "fiscal_date_ending": row.get("fiscalDateEnding"),
+                "estimate": row.get("estimate") or None,
+            })
+
+        index = {}
+        for symbol, records in rows.items():
+            records.sort(key=lambda record: record["date"])
+            dates = np.array([record["date"] for record in records], dtype="datetime64[D]")
+            index[symbol] = TickerEarnings(dates, records)
+        return index
+
+    @property
+    def is_stale(self) -> bool:
+        return self.loaded_at is None or datetime.now() - self.loaded_at >= self.refresh_interval
+
+    def refresh(self, lane: int = BACKGROUND) -> bool:
+        """Download the whole calendar and swap in a new index"""
+        return self._flights.do("refresh", lambda: self._refresh(lane))
+
+    def _refresh(self, lane: int) -> bool:
+        if not self.alpha_vantage.enabled:
+            return False
+        self._last_attempt = datetime.now()
+        try:
+            print("Refreshing bulk earnings calendar...")
+            response = self.alpha_vantage.query(
+                {"function": "EARNINGS_CALENDAR", "horizon": self.horizon},
+                lane=lane,
+                timeout=self.alpha_vantage.queue_timeout(lane),
+            )
+            if response.status_code != 200 or not response.text.startswith("symbol"):
+                print(f"  Earnings calendar error: {response.text[:200]}")
+                return False
+
+            index = self._build_index(response.text)
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w") as f:
+                f.write(response.text)
+            os.replace(tmp_path, self.path)
+
+            self._index = index
+            self.loaded_at = datetime.now()
+            print(f"  SUCCESS! Indexed earnings calendar for {len(index)} tickers")
+            return True
+        except Exception as e:
+            print(f"  Earnings calendar error: {e}")
+            return False
+
+    def ensure_fresh(self):
+        """
+        Make sure there is a calendar to read. The very first load blocks;
+        later refreshes run in the background while the old index is served.
+        """
+        if not self.is_stale:
+            return
+        # Don't retry a failed download on every lookup
+        if self._last_attempt and datetime.now() - self._last_attempt < timedelta(minutes=15):
+            return
+        if not self._index:
+            self.refresh(lane=INTERACTIVE)
+        else:
+            threading.Thread(target=self.refresh, daemon=True).start()
+
+    def upcoming(self, ticker: str, after: date = None, limit: int = 3) -> List[Dict]:
+        """Next scheduled reports for a ticker"""
+        self.ensure_fresh()
+        entry = self._index.get(ticker.upper())
+        if entry is None:
+            return []
+        start = np.searchsorted(entry.dates, np.datetime64(after or date.today(), "D"), side="right")
+        return entry.records[start:start + limit]
+
+    def events_between(self, tickers: List[str], start: date, end: date) -> Dict[str, List[Dict]]:
+        """Every scheduled report for the given tickers with start <= date <= end"""
+        self.ensure_fresh()
+        lo_day, hi_day = np.datetime64(start, "D"), np.datetime64(end, "D")
+        results = {}
+        for ticker in tickers:
+            entry = self._index.get(ticker.upper())
+            if entry is None:
+                continue
+            lo = np.searchsorted(entry.dates, lo_day, side="left")
+            hi = np.searchsorted(entry.dates, hi_day, side="right")
+            if hi > lo:
+                results[ticker.upper()] = entry.records[lo:hi]
+        return results
+
+    def status(self) -> Dict:
+        return {
+            "tickers": len(self._index),
+            "loaded_at": self.loaded_at.isoformat() if self.loaded_at else None,
+            "stale": self.is_stale,
+        }
@@ -0,0 +1,143 @@
+import json
+import os
+import threading
+from datetime import date, datetime, timedelta
+from typing import Dict, List, NamedTuple
+
+import numpy as np
+
+from app.alpha_vantage import AlphaVantageClient
+from app.rate_limiter import BACKGROUND, INTERACTIVE
+from app.single_flight import SingleFlight
+
+
+class ReportHistory(NamedTuple):
+    """A ticker's reported quarters, sorted by report date"""
+    dates: np.ndarray  # datetime64[D]
+    fiscal_quarters: List[str]
+    fetched_at: datetime
+
+
+def fiscal_quarter_label(fiscal_date_ending: str) -> str:
+    """Label a fiscal period end like 2024-09-30 as "Q3 2024" (calendar quarter of the period end)"""
+    period_end = datetime.strptime(fiscal_date_ending, "%Y-%m-%d")
+    return f"Q{(period_end.month - 1) // 3 + 1} {period_end.year}"
+
+
+class EarningsHistory:
+    """
+    Actual historical earnings report dates per ticker from Alpha Vantage's
+    EARNINGS function, persisted as one JSON file per ticker. Lookups read the
+    in-memory index only; stale tickers are refreshed in the background on the
+    low-priority lane, so requests never wait on the API once a ticker is known.
+    """
+
+    def __init__(self, alpha_vantage: AlphaVantageClient, root: str = None,
+                 refresh_interval: timedelta = timedelta(days=7)):
+        self.alpha_vantage = alpha_vantage
+        self.root = root or os.getenv("EARNINGS_HISTORY_DIR", "./data/earnings")
+        self.refresh_interval = refresh_interval
+        self._index: Dict[str, ReportHistory] = {}
+        self._failed_at: Dict[str, datetime] = {}
+        self._flights = SingleFlight()
+        self._load_from_disk()
+
+    def _path(self, ticker: str) -> str:
+        return os.path.join(self.root, f"{ticker.upper()}.json")
+
+    def _load_from_disk(self):
+        if not os.path.isdir(self.root):
+            return
+        for filename in os.listdir(self.root):
+            if not filename.endswith(".json"):
+                continue
+            try:
+                with open(os.path.join(self.root, filename)) as f:
+                    stored = json.load(f)
+                self._index[stored["ticker"]] = self._build_history(stored)
+            except (OSError, ValueError, KeyError) as e:
+                print(f"  Skipping unreadable earnings history {filename}: {e}")
+
+    def _build_history(self, stored: Dict) -> ReportHistory:
+        reports = sorted(stored["reports"], key=lambda report: report["reported_date"])
+        return ReportHistory(
+            dates=np.array([report["reported_date"] for report in reports], dtype="datetime64[D]"),
+            fiscal_quarters=[fiscal_quarter_label(report["fiscal_date_ending"]) for report in reports],
+            fetched_at=datetime.fromisoformat(stored["fetched_at"]),
+        )
+
+    def refresh(self, ticker: str, lane: int = BACKGROUND) -> bool:
+        """Download a ticker's reported quarters and persist them"""
+        ticker = ticker.upper()
+        return self._flights.do(ticker, lambda: self._refresh(ticker, lane))
+
+    def _refresh(self, ticker: str, lane: int) -> bool:
+        if not self.alpha_vantage.enabled:
+            return False
+        try:
+            print(f"Refreshing earnings history for {ticker}...")
+            response = self.alpha_vantage.query(
+                {"function": "EARNINGS", "symbol": ticker},
+                lane=lane,
+                timeout=self.alpha_vantage.queue_timeout(lane),
+            )
+            data = response.json()
+            quarters = data.get("quarterlyEarnings")
+            if not quarters:
+                print(f"  Earnings history error: {data.get('Error Message', data.get('Information', 'no data'))}")
+                return False
+
+            stored = {
+                "ticker": ticker,
+                "fetched_at": datetime.now().isoformat(),
+                "reports": [
+                    {"reported_date": quarter["reportedDate"], "fiscal_date_ending": quarter["fiscalDateEnding"]}
+                    for quarter in quarters
+                    if quarter.get("reportedDate") and quarter.get("fiscalDateEnding")
+                ],
+            }
+            os.makedirs(self.root, exist_ok=True)
+            tmp_path = f"{self._path(ticker)}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(stored, f)
+            os.replace(tmp_path, self._path(ticker))
+
+            self._index[ticker] = self._build_history(stored)
+            print(f"  SUCCESS! Stored {len(stored['reports'])} reported quarters for {ticker}")
+            return True
+        except Exception as e:
+            print(f"  Earnings history error for {ticker}: {e}")
+            return False
+
+    def past_reports(self, ticker: str, count: int = 4, before: date = None) -> List[Dict]:
+        """
+        The most recent `count` reports before a date, newest first. Unknown
+        tickers are fetched once; known but stale ones are served as-is and
+        refreshed in the background.
+        """
+        ticker = ticker.upper()
+        history = self._index.get(ticker)
+        if history is None:
+            # Don't retry a ticker the API just failed on for every request
+            failed_at = self._failed_at.get(ticker)
+            if failed_at and datetime.now() - failed_at < timedelta(minutes=15):
+                return []
+            if not self.refresh(ticker, lane=INTERACTIVE):
+                self._failed_at[ticker] = datetime.now()
+                return []
+            history = self._index[ticker]
+        elif datetime.now() - history.fetched_at >= self.refresh_interval:
+            threading.Thread(target=self.refresh, args=(ticker,), daemon=True).start()
+
+        end = np.searchsorted(history.dates, np.datetime64(before or date.today(), "D"), side="left")
+        start = max(end - count, 0)
+        return [
+            {
+                "date": datetime.combine(history.dates[i].astype(date), datetime.min.time()),
+                "fiscal_quarter": history.fiscal_quarters[i],
+            }
+            for i in range(end - 1, start - 1, -1)
+        ]
+
+    def status(self) -> Dict:
+        return {"tickers": len(self._index)}
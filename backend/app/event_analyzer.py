@@ -2,43 +2,149 @@ import yfinance as yf
 import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
-from sklearn.linear_model import LinearRegression
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
 from textblob import TextBlob
-import requests
 import os
 
+from app.alpha_vantage import AlphaVantageClient
+from app.cache import BoundedCache
+from app.earnings_calendar import EarningsCalendar
+from app.earnings_history import EarningsHistory, fiscal_quarter_label
+from app.executor import Executor
+from app.price_store import PriceStore, PriceSeries
+from app.rate_limiter import INTERACTIVE, BACKGROUND
+from app.anomaly_scanner import scan_anomalies, Z_THRESHOLD
+from app.event_study import (
+    event_study, check_windows,
+    ESTIMATION_WINDOW, EVENT_WINDOW_BEFORE, EVENT_WINDOW_AFTER, CAR_WINDOWS,
+)
+from app.returns import ReturnSeries, daily_returns, align_to
+from app.significance import car_significance_many
+from app.single_flight import SingleFlight
+from app.trading_calendar import TradingCalendar
+
 class EventAnalyzer:
-    def __init__(self, alpha_vantage_key: str = None):
+    def __init__(self, alpha_vantage_key: str = None, price_store: PriceStore = None, executor: Executor = None):
         self.benchmark = "SPY"  # S&P 500 as benchmark
-        self.cache = {}  # Simple in-memory cache
-        self.cache_duration = timedelta(minutes=15)  # Cache for 15 minutes
+        # Memory-bounded LRU cache with a TTL per kind of entry
+        self.cache = BoundedCache(
+            max_bytes=int(os.getenv("EVENT_CACHE_MAX_MB", "128")) * 1024 * 1024,
+            ttls={
+                "past_events": timedelta(minutes=15),
+            },
+        )
         self.alpha_vantage_key = alpha_vantage_key or os.getenv("ALPHA_VANTAGE_KEY")
+        self.alpha_vantage = AlphaVantageClient(self.alpha_vantage_key)
+        self.earnings_calendar = EarningsCalendar(self.alpha_vantage)
+        self.earnings_history = EarningsHistory(self.alpha_vantage)
+        self.price_store = price_store or PriceStore()
+        self.price_refresh_interval = timedelta(hours=24)
+        self.calendar = TradingCalendar()
+        self._benchmark_returns: Optional[ReturnSeries] = None
+        self.flights = SingleFlight()
+        # Process pool for large panel computations (None runs them inline)
+        self.executor = executor
+
+    def get_price_series(self, ticker: str, lane: int = INTERACTIVE) -> Optional[PriceSeries]:
+        """
+        Get a ticker's daily bars from the persistent price store, refreshing
+        them from Alpha Vantage (or yfinance) when they are older than 24 hours.
+        lane is the Alpha Vantage priority lane used if a refresh is needed.
+        """
+        ticker = ticker.upper()
+        series = self.price_store.read(ticker)
+        if series is not None and datetime.now() - series.updated_at < self.price_refresh_interval:
+            print(f"  [STORE] Using stored daily bars for {ticker}")
+            return series
+
+        # Concurrent misses on the same ticker share one upstream refresh
+        return self.flights.do(("prices", ticker), lambda: self._refresh_price_series(ticker, lane))
+
+    def _refresh_price_series(self, ticker: str, lane: int, max_age: timedelta = None) -> Optional[PriceSeries]:
+        """Fetch missing bars for a ticker into the price store unless they were refreshed within max_age"""
+        # Another request may have refreshed the ticker while we were queued
+        max_age = self.price_refresh_interval if max_age is None else max_age
+        series = self.price_store.read(ticker)
+        if series is not None and datetime.now() - series.updated_at < max_age:
+            return series
+
+        if series is None:
+            # Nothing stored yet - seed the store with the full history
+            df = self._download_from_alpha_vantage(ticker, lane=lane)
+            if df.empty:
+                df = self._download_from_yfinance(ticker)
+            if not df.empty:
+                self.price_store.write(ticker, df)
+                return self.price_store.read(ticker)
+            return None
+
+        # Already stored - only fetch the bars from the last stored date on
+        df = self._download_bars_since(ticker, series.dates[-1], lane)
+        if not df.empty:
+            self.price_store.append(ticker, df)
+            return self.price_store.read(ticker)
+
+        # Upstream unavailable - stale bars are still better than none
+        return series
+
+    def refresh_prices(self, tickers: List[str], max_age: timedelta = timedelta(hours=1)):
+        """
+        Bring the stored daily bars of a watchlist up to date (background
+        priority), skipping tickers refreshed within max_age
+        """
+        for ticker in tickers:
+            ticker = ticker.upper()
+            try:
+                self.flights.do(("prices", ticker), lambda: self._refresh_price_series(ticker, BACKGROUND, max_age))
+            except Exception as e:
+                print(f"  Price refresh failed for {ticker}: {e}")
+
+    def _download_bars_since(self, ticker: str, last_date: np.datetime64, lane: int = INTERACTIVE) -> pd.DataFrame:
+        """
+        Fetch the daily bars from last_date on. The last stored bar is
+        fetched again, since it may have been a partial mid-session bar.
+        Alpha Vantage's compact output covers the latest 100 sessions, so the
+        full history is only requested when the stored series is further
+        behind than that.
+        """
+        # NYSE sessions in [last_date, today), holidays excluded
+        today = np.datetime64(datetime.now().date(), 'D')
+        missed_sessions = int(self.calendar.position(today) - self.calendar.position(last_date))
+        outputsize = "compact" if missed_sessions < 100 else "full"
+        print(f"  Refreshing {ticker} incrementally ({missed_sessions} sessions behind, {outputsize})")
+
+        df = self._download_from_alpha_vantage(ticker, outputsize=outputsize, lane=lane)
+        if df.empty:
+            df = self._download_from_yfinance(ticker, start=pd.Timestamp(last_date))
+        return df
+
+    def _queue_timeout(self, lane: int) -> Optional[float]:
+        """How long a request may wait for Alpha Vantage budget before falling back"""
+        return self.alpha_vantage.queue_timeout(lane)
+
+    def _download_prices(self, ticker: str) -> pd.DataFrame:
+        """Daily bars for a ticker as a DataFrame backed by the price store"""
+        series = self.get_price_series(ticker)
+        if series is None:
+            return pd.DataFrame()
+        return series.to_frame()
 
-    def _download_from_alpha_vantage(self, ticker: str) -> pd.DataFrame:
+    def _download_from_alpha_vantage(self, ticker: str, outputsize: str = "full",
+                                     lane: int = INTERACTIVE) -> pd.DataFrame:
         """Download historical data from Alpha Vantage (more reliable than yfinance)"""
-        if not self.alpha_vantage_key or self.alpha_vantage_key == "your_alphavantage_key_here":
+        if not self.alpha_vantage.enabled:
             return pd.DataFrame()
 
-        # Check cache for Alpha Vantage data (cache for 24 hours)
-        cache_key = f"alpha_vantage_{ticker}"
-        if cache_key in self.cache:
-            data, timestamp = self.cache[cache_key]
-            if datetime.now() - timestamp < timedelta(hours=24):
-                print(f"  [CACHE] Using cached Alpha Vantage data for {ticker}")
-                return data
-
         try:
             print(f"  Trying Alpha Vantage for {ticker}...")
-            url = f"https://www.alphavantage.co/query"
             params = {
                 "function": "TIME_SERIES_DAILY",
                 "symbol": ticker,
-                "outputsize": "full",  # Get full history
-                "apikey": self.alpha_vantage_key
+                "outputsize": outputsize,  # "full" history or latest 100 bars
             }
 
-            response = requests.get(url, params=params, timeout=10)
+            # Waits for the shared rate budget instead of getting throttled
+            response = self.alpha_vantage.query(params, lane=lane, timeout=self._queue_timeout(lane))
             data = response.json()
 
             if "Time Series (Daily)" not in data:
@@ -56,264 +162,406 @@ class EventAnalyzer:
             df = df.astype(float)
 
             print(f"  SUCCESS! Got {len(df)} days of REAL data from Alpha Vantage!")
-
-            # Cache the data for 24 hours
-            self.cache[cache_key] = (df, datetime.now())
             return df
 
         except Exception as e:
             print(f"  Alpha Vantage error: {e}")
             return pd.DataFrame()
 
-    def analyze_event(self, ticker: str, event_date: datetime) -> Dict:
-        """
-        Analyze the impact of an event on a stock
-        Calculates CAR (Cumulative Abnormal Return) and volatility changes
-        """
+    def _download_from_yfinance(self, ticker: str, start: datetime = None) -> pd.DataFrame:
+        """Download daily history from yfinance, either in full or from start onwards"""
         try:
-            # Download stock and market data
-            estimation_window = 120  # days for regression
-            event_window_before = 5
-            event_window_after = 5
-
-            start_date = event_date - timedelta(days=estimation_window + event_window_before)
-            end_date = event_date + timedelta(days=event_window_after + 5)
-
-            # Try to get stock data from Alpha Vantage first
-            stock_data = self._download_from_alpha_vantage(ticker)
-            if stock_data.empty:
-                stock_data = yf.download(ticker, start=start_date, end=end_date, progress=False)
-
-            # Try to get benchmark data from Alpha Vantage first
-            market_data = self._download_from_alpha_vantage(self.benchmark)
-            if market_data.empty:
-                market_data = yf.download(self.benchmark, start=start_date, end=end_date, progress=False)
-
-            if stock_data.empty or market_data.empty:
-                raise ValueError("Insufficient data")
-
-            # Filter to date range
-            stock_data = stock_data[(stock_data.index >= start_date) & (stock_data.index <= end_date)]
-            market_data = market_data[(market_data.index >= start_date) & (market_data.index <= end_date)]
-
-            # Calculate returns
-            stock_returns = stock_data['Close'].pct_change().dropna()
-            market_returns = market_data['Close'].pct_change().dropna()
-
-            # Align data
-            aligned_data = pd.DataFrame({
-                'stock': stock_returns,
-                'market': market_returns
-            }).dropna()
-
-            # Split into estimation and event windows
-            estimation_cutoff = event_date - timedelta(days=event_window_before)
-            estimation_data = aligned_data[aligned_data.index < estimation_cutoff]
-            event_data = aligned_data[
-                (aligned_data.index >= event_date - timedelta(days=event_window_before)) &
-                (aligned_data.index <= event_date + timedelta(days=event_window_after))
-            ]
-
-            if len(estimation_data) < 30 or len(event_data) == 0:
-                raise ValueError("Insufficient data for analysis")
-
-            # Market model regression (estimation window)
-            X = estimation_data['market'].values.reshape(-1, 1)
-            y = estimation_data['stock'].values
-            reg = LinearRegression().fit(X, y)
-            alpha = reg.intercept_
-            beta = reg.coef_[0]
-
-            # Calculate abnormal returns in event window
-            expected_returns = alpha + beta * event_data['market'].values
-            abnormal_returns = event_data['stock'].values - expected_returns
+            print(f"  Trying yfinance for {ticker}...")
+            if start is not None:
+                df = yf.download(ticker, start=start, progress=False)
+            else:
+                df = yf.download(ticker, period="max", progress=False)
+            if df.empty:
+                return pd.DataFrame()
 
-            # Cumulative Abnormal Return (CAR)
-            car = np.sum(abnormal_returns) * 100  # Convert to percentage
+            # Newer yfinance versions return (field, ticker) column pairs
+            if isinstance(df.columns, pd.MultiIndex):
+                df.columns = df.columns.get_level_values(0)
+            if df.index.tz is not None:
+                df.index = df.index.tz_localize(None)
 
-            # Volatility analysis
-            pre_event_vol = estimation_data['stock'].std()
-            post_event_vol = event_data['stock'].std()
-            volatility_ratio = post_event_vol / pre_event_vol if pre_event_vol > 0 else 1.0
+            return df[['Open', 'High', 'Low', 'Close', 'Volume']].dropna(subset=['Close'])
 
-            # Determine sentiment based on CAR
-            if car > 2:
-                sentiment = "positive"
-                conclusion = f"Strong positive market reaction with {car:.2f}% abnormal return."
-            elif car < -2:
-                sentiment = "negative"
-                conclusion = f"Negative market reaction with {car:.2f}% abnormal return."
-            else:
-                sentiment = "neutral"
-                conclusion = f"Muted market reaction with {car:.2f}% abnormal return."
-
-            # Add volatility context
-            if volatility_ratio > 1.5:
-                conclusion += f" Volatility increased significantly by {volatility_ratio:.2f}x."
-            elif volatility_ratio < 0.7:
-                conclusion += f" Volatility decreased to {volatility_ratio:.2f}x."
+        except Exception as e:
+            print(f"  yfinance error: {e}")
+            return pd.DataFrame()
 
-            return {
-                "ticker": ticker,
-                "event": "Event Analysis",
-                "date": event_date.isoformat(),
-                "car_0_1": round(car, 2),
-                "volatility_change": round(volatility_ratio, 2),
-                "sentiment": sentiment,
-                "conclusion": conclusion
-            }
+    def _get_benchmark_returns(self) -> ReturnSeries:
+        """
+        Benchmark daily returns on the exchange calendar's sessions, computed
+        once per price refresh and shared by every analysis. Stock returns are
+        aligned to the same session axis.
+        """
+        series = self.get_price_series(self.benchmark)
+        if series is None or len(series) < 2:
+            raise ValueError("Insufficient benchmark data")
+
+        cached = self._benchmark_returns
+        if cached is None or cached.updated_at != series.updated_at:
+            returns = align_to(daily_returns(series), self.calendar.sessions)
+            cached = ReturnSeries(self.calendar.sessions, returns, series.updated_at)
+            self._benchmark_returns = cached
+        return cached
+
+    def _get_aligned_returns(self, ticker: str, benchmark: ReturnSeries) -> np.ndarray:
+        """A ticker's daily returns placed on the benchmark's session axis (NaN where missing)"""
+        series = self.get_price_series(ticker)
+        if series is None or len(series) < 2:
+            raise ValueError("Insufficient data")
+        return align_to(daily_returns(series), benchmark.dates)
+
+    def analyze_event(self, ticker: str, event_date: datetime, windows: List[Tuple[int, int]] = None,
+                      significance: bool = False) -> Dict:
+        """
+        Analyze the impact of an event on a stock
+        Calculates CAR (Cumulative Abnormal Return) and volatility changes,
+        plus CAR over each (first, last) trading-day window in windows and,
+        if significance is set, tests of the main window's CAR
+        """
+        try:
+            analysis = self.analyze_events(ticker, [event_date], windows=windows, significance=significance)[0]
+            if analysis is None:
+                raise ValueError("Insufficient data for analysis")
+            return analysis
 
         except Exception as e:
             print(f"Error analyzing event for {ticker}: {e}")
             # Re-raise the exception so the calling function can fall back to mock data
             raise e
 
-    def get_past_earnings_events(self, ticker: str) -> List[Dict]:
+    def analyze_events(self, ticker: str, event_dates: List[datetime],
+                       windows: List[Tuple[int, int]] = None, significance: bool = False) -> List[Optional[Dict]]:
+        """
+        Analyze many events for one ticker in a single vectorized pass.
+        Returns one analysis per event date (None where there isn't enough
+        data around the event).
+        """
+        benchmark = self._get_benchmark_returns()
+        stock_returns = self._get_aligned_returns(ticker, benchmark)
+
+        results = self._run_cpu(
+            event_study,
+            benchmark.dates,
+            stock_returns,
+            benchmark.returns,
+            np.array([np.datetime64(d.date(), 'D') for d in event_dates]),
+            windows=windows,
+        )
+
+        tests = {}
+        if significance:
+            tests = self._event_significance({
+                i: (stock_returns, benchmark.returns, event_date, results["alpha"][i], results["beta"][i])
+                for i, event_date in enumerate(event_dates) if results["valid"][i]
+            })
+
+        analyses = []
+        for i, event_date in enumerate(event_dates):
+            if not results["valid"][i]:
+                analyses.append(None)
+                continue
+            analyses.append(self._summarize_event(
+                ticker, event_date, float(results["car"][i]), float(results["volatility_ratio"][i]),
+                cars={label: float(car[i]) for label, car in results["cars"].items()},
+                significance=tests.get(i),
+            ))
+        return analyses
+
+    def analyze_events_batch(self, events: List[Tuple[str, datetime]],
+                             windows: List[Tuple[int, int]] = None, significance: bool = False) -> List[Optional[Dict]]:
+        """
+        Analyze many (ticker, event date) pairs as one matrix computation.
+        Every ticker's returns are aligned onto the benchmark's trading days
+        to form a (days x tickers) panel that is fitted in a single pass.
+        Returns one analysis per pair (None where there isn't enough data).
+        """
+        if not events:
+            return []
+
+        benchmark = self._get_benchmark_returns()
+        windows = check_windows(CAR_WINDOWS if windows is None else windows)
+
+        # Only keep the sessions any event or CAR window can reach (as views, not copies)
+        event_dates = np.array([np.datetime64(d.date(), 'D') for _, d in events])
+        reach_before = max([ESTIMATION_WINDOW + EVENT_WINDOW_BEFORE] + [-first for first, _ in windows])
+        reach_after = max([EVENT_WINDOW_AFTER] + [last for _, last in windows])
+        first = self.calendar.window(event_dates.min(), -reach_before, 0)[0]
+        last = self.calendar.window(event_dates.max(), 0, reach_after)[1]
+        dates = benchmark.dates[first:last]
+        market_returns = benchmark.returns[first:last]
+
+        tickers = list(dict.fromkeys(ticker.upper() for ticker, _ in events))
+        column_of = {ticker: i for i, ticker in enumerate(tickers)}
+        panel = np.full((len(dates), len(tickers)), np.nan)
+
+        for ticker in tickers:
+            series = self.get_price_series(ticker)
+            if series is None or len(series) < 2:
+                print(f"  [SKIP] No price data for {ticker}")
+                continue
+            panel[:, column_of[ticker]] = align_to(daily_returns(series), dates)
+
+        results = self._run_cpu(
+            event_study,
+            dates,
+            panel,
+            market_returns,
+            event_dates,
+            columns=np.array([column_of[ticker.upper()] for ticker, _ in events]),
+            windows=windows,
+        )
+
+        tests = {}
+        if significance:
+            tests = self._event_significance({
+                i: (panel[:, column_of[ticker.upper()]], market_returns, event_date,
+                    results["alpha"][i], results["beta"][i])
+                for i, (ticker, event_date) in enumerate(events) if results["valid"][i]
+            }, offset=first)
+
+        analyses = []
+        for i, (ticker, event_date) in enumerate(events):
+            if not results["valid"][i]:
+                analyses.append(None)
+                continue
+            analyses.append(self._summarize_event(
+                ticker, event_date, float(results["car"][i]), float(results["volatility_ratio"][i]),
+                cars={label: float(car[i]) for label, car in results["cars"].items()},
+                significance=tests.get(i),
+            ))
+        return analyses
+
+    def _run_cpu(self, fn, *args, **kwargs):
+        """Run a pure numpy computation on the executor's process pool, if there is one"""
+        if self.executor is None:
+            return fn(*args, **kwargs)
+        return self.executor.run_cpu(fn, *args, **kwargs)
+
+    def detect_events(self, ticker: str, z_threshold: float = Z_THRESHOLD) -> List[Dict]:
+        """
+        Scan a ticker's whole daily history for abnormal-return and volatility
+        jumps instead of analyzing guessed dates
+        """
+        return self.detect_events_batch([ticker], z_threshold).get(ticker.upper(), [])
+
+    def detect_events_batch(self, tickers: List[str], z_threshold: float = Z_THRESHOLD) -> Dict[str, List[Dict]]:
+        """
+        Scan many tickers at once: every history is aligned onto the benchmark's
+        sessions and the whole (days x tickers) panel is scored in one pass.
+        Returns the flagged days per ticker, oldest first.
+        """
+        benchmark = self._get_benchmark_returns()
+
+        tickers = list(dict.fromkeys(ticker.upper() for ticker in tickers))
+        panel = np.full((len(benchmark.dates), len(tickers)), np.nan)
+        for column, ticker in enumerate(tickers):
+            series = self.get_price_series(ticker)
+            if series is None or len(series) < 2:
+                print(f"  [SKIP] No price data for {ticker}")
+                continue
+            panel[:, column] = align_to(daily_returns(series), benchmark.dates)
+
+        # Trim to the sessions any ticker has data for
+        has_data = np.isfinite(panel).any(axis=1)
+        if not has_data.any():
+            return {}
+        first, last = np.argmax(has_data), len(has_data) - np.argmax(has_data[::-1])
+        scan = self._run_cpu(scan_anomalies, panel[first:last], benchmark.returns[first:last], z_threshold=z_threshold)
+
+        detected = {ticker: [] for ticker in tickers}
+        for row, column in zip(*np.nonzero(scan["flagged"])):
+            ticker = tickers[column]
+            abnormal_return = float(scan["abnormal_return"][row, column])
+            z = float(np.nan_to_num(scan["z"][row, column]))
+            volatility_ratio = float(np.nan_to_num(scan["volatility_ratio"][row, column], nan=1.0))
+            event_date = benchmark.dates[first + row].astype(datetime)
+            event_date = datetime.combine(event_date, datetime.min.time())
+
+            analysis = self._summarize_event(ticker, event_date, abnormal_return, volatility_ratio,
+                                             event_name="Detected Anomaly")
+            analysis["z_score"] = round(z, 2)
+            detected[ticker].append(analysis)
+
+        print(f"  Detected {sum(len(events) for events in detected.values())} anomalies across {len(tickers)} tickers")
+        return detected
+
+    def _event_significance(self, events: Dict[int, Tuple], offset: int = 0) -> Dict[int, Optional[Dict[str, float]]]:
+        """
+        Significance tests of each event's main window (None where they can't
+        be computed), for events given as {key: (stock_returns, market_returns,
+        event_date, alpha, beta)}. The return arrays start at session `offset`
+        of the trading calendar. Only the windows' slices are sent to the
+        process pool, and the bootstraps of every event run there in one call.
+        """
+        cases = []
+        for stock_returns, market_returns, event_date, alpha, beta in events.values():
+            estimation = slice(*(i - offset for i in self.calendar.window(
+                event_date, -(ESTIMATION_WINDOW + EVENT_WINDOW_BEFORE), -EVENT_WINDOW_BEFORE - 1
+            )))
+            event = slice(*(i - offset for i in self.calendar.window(event_date, -EVENT_WINDOW_BEFORE, EVENT_WINDOW_AFTER)))
+            cases.append((
+                stock_returns[estimation], market_returns[estimation],
+                stock_returns[event], market_returns[event], float(alpha), float(beta),
+            ))
+        if not cases:
+            return {}
+        return dict(zip(events, self._run_cpu(car_significance_many, cases)))
+
+    def _summarize_event(self, ticker: str, event_date: datetime, car: float, volatility_ratio: float,
+                         event_name: str = "Event Analysis", cars: Dict[str, float] = None,
+                         significance: Dict[str, float] = None) -> Dict:
+        """Turn CAR and volatility ratio into the event analysis response"""
+        # Determine sentiment based on CAR
+        if car > 2:
+            sentiment = "positive"
+            conclusion = f"Strong positive market reaction with {car:.2f}% abnormal return."
+        elif car < -2:
+            sentiment = "negative"
+            conclusion = f"Negative market reaction with {car:.2f}% abnormal return."
+        else:
+            sentiment = "neutral"
+            conclusion = f"Muted market reaction with {car:.2f}% abnormal return."
+
+        # Add volatility context
+        if volatility_ratio > 1.5:
+            conclusion += f" Volatility increased significantly by {volatility_ratio:.2f}x."
+        elif volatility_ratio < 0.7:
+            conclusion += f" Volatility decreased to {volatility_ratio:.2f}x."
+
+        # Say whether the reaction survives a statistical test, when one was run
+        if significance is not None:
+            level = f"{significance['confidence']:.0%}"
+            if significance["p_value"] < 1 - significance["confidence"]:
+                conclusion += f" Statistically significant at {level} (p = {significance['p_value']:.3f})."
+            else:
+                conclusion += f" Not statistically significant at {level} (p = {significance['p_value']:.3f})."
+
+        analysis = {
+            "ticker": ticker,
+            "event": event_name,
+            "date": event_date.isoformat(),
+            "car_0_1": round(car, 2),
+            "cars": {label: round(value, 2) for label, value in (cars or {}).items()},
+            "volatility_change": round(volatility_ratio, 2),
+            "sentiment": sentiment,
+            "conclusion": conclusion
+        }
+        if significance is not None:
+            analysis["significance"] = significance
+        return analysis
+
+    def get_past_earnings_events(self, ticker: str, significance: bool = False) -> List[Dict]:
         """
         Get past earnings events and their analysis using real historical price data
         """
         # Check cache first
-        cache_key = f"past_events_{ticker}"
-        if cache_key in self.cache:
-            data, timestamp = self.cache[cache_key]
-            if datetime.now() - timestamp < self.cache_duration:
-                print(f"[CACHE] Using cached data for {ticker}")
-                return data
+        cache_key = (ticker, significance)
+        data = self.cache.get("past_events", cache_key)
+        if data is not None:
+            print(f"[CACHE] Using cached data for {ticker}")
+            return data
 
         try:
             print(f"Analyzing REAL price data for {ticker}...")
 
-            # Try Alpha Vantage first (more reliable)
-            stock_data = self._download_from_alpha_vantage(ticker)
-
-            # Fallback to yfinance if Alpha Vantage fails
-            if stock_data.empty:
-                print(f"  Trying yfinance for {ticker}...")
-                end_date = datetime.now()
-                start_date = end_date - timedelta(days=365)
-                stock_data = yf.download(ticker, start=start_date, end=end_date, progress=False)
+            # Stored bars, refreshed from Alpha Vantage or yfinance when stale
+            stock_data = self._download_prices(ticker)
 
             if stock_data.empty:
                 print(f"  No real data available for {ticker}, using smart mock data")
                 result = self._generate_mock_events(ticker)
-                self.cache[cache_key] = (result, datetime.now())
+                self.cache.set("past_events", cache_key, result)
                 return result
 
-            # We got REAL data! Filter to last year
-            one_year_ago = datetime.now() - timedelta(days=365)
-            stock_data = stock_data[stock_data.index >= one_year_ago]
             print(f"  SUCCESS! Analyzing REAL data with {len(stock_data)} trading days")
 
-            # Analyze quarterly events (approximately every 90 days)
-            # This simulates earnings dates which typically occur quarterly
+            # Actual report dates from the local earnings history index
             quarters = [
-                (45, "Q4 2024"),   # ~45 days ago
-                (135, "Q3 2024"),  # ~135 days ago (3 months)
-                (225, "Q2 2024"),  # ~225 days ago (6 months)
-                (315, "Q1 2024"),  # ~315 days ago (9 months)
+                (report["date"], report["fiscal_quarter"])
+                for report in self.earnings_history.past_reports(ticker, count=4)
             ]
+            estimated = not quarters
+            if estimated:
+                # No history for this ticker - approximate a quarterly cadence,
+                # labelled by the quarter that ended ~45 days before each date and
+                # marked as estimated, since these are not reported earnings dates
+                now = datetime.now()
+                quarters = [
+                    (now - timedelta(days=days_ago), fiscal_quarter_label((now - timedelta(days=days_ago + 45)).strftime("%Y-%m-%d")))
+                    for days_ago in (45, 135, 225, 315)
+                ]
+
+            first_date = stock_data.index[0].to_pydatetime().replace(tzinfo=None)
+            quarters = [(event_date, quarter_label) for event_date, quarter_label in quarters if event_date >= first_date]
+
+            # Analyze every quarter in one pass over the REAL price data
+            analyses = self.analyze_events(
+                ticker, [event_date for event_date, _ in quarters], significance=significance
+            ) if quarters else []
 
             events = []
-            for days_ago, quarter_label in quarters:
-                event_date = datetime.now() - timedelta(days=days_ago)
-
-                # Check if we have data for this date (handle timezone)
-                first_date = stock_data.index[0]
-                if hasattr(first_date, 'tz_localize'):
-                    first_date = first_date.tz_localize(None)
-                elif hasattr(first_date, 'tz_convert'):
-                    first_date = first_date.tz_convert(None).replace(tzinfo=None)
-
-                if event_date < first_date:
-                    continue
-
-                try:
-                    # Analyze this event using REAL price data and CAR calculation
-                    analysis = self.analyze_event(ticker, event_date)
-                    analysis["event"] = f"{quarter_label} Earnings"
-                    events.append(analysis)
-                    print(f"  [OK] Analyzed {quarter_label} for {ticker}: CAR = {analysis['car_0_1']}%")
-                except Exception as e:
-                    print(f"  [SKIP] Could not analyze {quarter_label} for {ticker}: {e}")
+            for (event_date, quarter_label), analysis in zip(quarters, analyses):
+                if analysis is None:
+                    print(f"  [SKIP] Could not analyze {quarter_label} for {ticker}: insufficient data")
                     continue
+                analysis["event"] = f"{quarter_label} Earnings" + (" (estimated date)" if estimated else "")
+                analysis["estimated"] = estimated
+                events.append(analysis)
+                print(f"  [OK] Analyzed {quarter_label} for {ticker}: CAR = {analysis['car_0_1']}%")
 
             # Return real analysis if we got any, otherwise fallback
             result = events if events else self._generate_mock_events(ticker)
 
             # Cache the result
-            self.cache[cache_key] = (result, datetime.now())
+            self.cache.set("past_events", cache_key, result)
             return result
 
         except Exception as e:
             print(f"Error analyzing {ticker}: {e}")
             fallback = self._generate_mock_events(ticker)
-            self.cache[cache_key] = (fallback, datetime.now())
+            self.cache.set("past_events", cache_key, fallback)
             return fallback
 
     def get_upcoming_events(self, ticker: str) -> List[Dict]:
         """
-        Get upcoming events for a ticker using Alpha Vantage earnings calendar
+        Get upcoming events for a ticker from the bulk Alpha Vantage earnings calendar
         """
-        # Check cache first
-        cache_key = f"upcoming_events_{ticker}"
-        if cache_key in self.cache:
-            data, timestamp = self.cache[cache_key]
-            if datetime.now() - timestamp < timedelta(hours=24):
-                print(f"[CACHE] Using cached upcoming events for {ticker}")
-                return data
-
         try:
-            print(f"Fetching real upcoming earnings for {ticker}...")
-
-            # Try Alpha Vantage Earnings Calendar API
-            if self.alpha_vantage_key and self.alpha_vantage_key != "your_alphavantage_key_here":
-                url = "https://www.alphavantage.co/query"
-                params = {
-                    "function": "EARNINGS_CALENDAR",
-                    "symbol": ticker,
-                    "apikey": self.alpha_vantage_key
-                }
-
-                response = requests.get(url, params=params, timeout=10)
-
-                if response.status_code == 200:
-                    # Parse CSV response
-                    from io import StringIO
-                    import csv
-
-                    csv_data = StringIO(response.text)
-                    reader = csv.DictReader(csv_data)
-
-                    upcoming_events = []
-                    for row in reader:
-                        report_date = row.get('reportDate')
-                        if report_date:
-                            event_date = datetime.strptime(report_date, '%Y-%m-%d')
-                            # Only include future dates
-                            if event_date > datetime.now():
-                                upcoming_events.append({
-                                    "ticker": ticker,
-                                    "type": "Earnings Report",
-                                    "date": event_date.isoformat(),
-                                    "expected_impact": "High"
-                                })
-
-                    if upcoming_events:
-                        print(f"  SUCCESS! Found {len(upcoming_events)} real upcoming earnings")
-                        self.cache[cache_key] = (upcoming_events[:3], datetime.now())
-                        return upcoming_events[:3]
+            reports = self.earnings_calendar.upcoming(ticker)
+            if reports:
+                return [self._format_upcoming_event(ticker, report) for report in reports]
 
             # Fallback to mock data
             print(f"  Using estimated earnings dates for {ticker}")
-            result = self._generate_mock_upcoming_events(ticker)
-            self.cache[cache_key] = (result, datetime.now())
-            return result
+            return self._generate_mock_upcoming_events(ticker)
 
         except Exception as e:
             print(f"Error fetching upcoming events for {ticker}: {e}")
-            result = self._generate_mock_upcoming_events(ticker)
-            self.cache[cache_key] = (result, datetime.now())
-            return result
+            return self._generate_mock_upcoming_events(ticker)
+
+    def get_earnings_calendar(self, tickers: List[str], start: datetime, end: datetime) -> List[Dict]:
+        """All scheduled earnings reports for a watchlist within [start, end], sorted by date"""
+        reports = self.earnings_calendar.events_between(tickers, start.date(), end.date())
+        events = [
+            self._format_upcoming_event(ticker, report)
+            for ticker, ticker_reports in reports.items()
+            for report in ticker_reports
+        ]
+        events.sort(key=lambda event: event["date"])
+        return events
+
+    def _format_upcoming_event(self, ticker: str, report: Dict) -> Dict:
+        return {
+            "ticker": ticker,
+            "type": "Earnings Report",
+            "date": datetime.strptime(report["date"], '%Y-%m-%d').isoformat(),
+            "expected_impact": "High"
+        }
 
     def _generate_mock_events(self, ticker: str) -> List[Dict]:
         """Generate realistic mock events with ticker-specific values"""
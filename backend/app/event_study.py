@@ -0,0 +1,152 @@
+import numpy as np
+from typing import Dict, List, Tuple
+
+from app.market_model import fit_market_model
+
+# Default windows, in trading days relative to the event day
+ESTIMATION_WINDOW = 120
+EVENT_WINDOW_BEFORE = 5
+EVENT_WINDOW_AFTER = 5
+
+# CAR windows reported side by side, as inclusive (first, last) trading-day offsets
+CAR_WINDOWS = [(-1, 1), (0, 1), (0, 5), (-5, 5)]
+
+
+def window_label(window: Tuple[int, int]) -> str:
+    """Response key for a CAR window: (-1, 1) is "[-1,+1]" and (0, 5) is "[0,+5]" """
+    first, last = window
+    return "[{},{}]".format(*(f"{offset:+d}" if offset else "0" for offset in (first, last)))
+
+
+def check_windows(windows: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """Validate window specs, returning them as a list of int pairs"""
+    checked = []
+    for first, last in windows:
+        if first > last:
+            raise ValueError(f"Invalid CAR window [{first},{last}]: start is after end")
+        checked.append((int(first), int(last)))
+    return checked
+
+
+def _prefix_sums(values: np.ndarray) -> np.ndarray:
+    """Cumulative sums down the rows with a leading zero, so window [lo, hi) is s[hi] - s[lo]"""
+    sums = np.zeros((len(values) + 1,) + values.shape[1:])
+    np.cumsum(values, axis=0, out=sums[1:])
+    return sums
+
+
+def event_study(
+    dates: np.ndarray,
+    stock_returns: np.ndarray,
+    market_returns: np.ndarray,
+    event_dates: np.ndarray,
+    columns: np.ndarray = None,
+    estimation_days: int = ESTIMATION_WINDOW,
+    days_before: int = EVENT_WINDOW_BEFORE,
+    days_after: int = EVENT_WINDOW_AFTER,
+    min_estimation: int = 30,
+    windows: List[Tuple[int, int]] = None,
+) -> Dict[str, np.ndarray]:
+    """
+    Run the market-model event study for many events at once.
+
+    dates must be sorted trading days (datetime64[D]) aligned with both return
+    arrays, with NaN marking a missing return. stock_returns is either one series or a
+    (dates x tickers) panel, in which case columns gives the panel column of
+    each event; the market series is shared by every column.
+
+    Windows are measured in trading days from the event's position on the
+    dates axis (the first trading day on or after the event date): the
+    estimation window is the estimation_days sessions before the event
+    window, and the event window runs from days_before sessions before the
+    event to days_after sessions after it, inclusive.
+
+    windows lists extra CAR windows (default CAR_WINDOWS) as inclusive
+    trading-day offsets around the event, all using the estimation window's
+    fit. The estimation windows are stacked and fitted in one
+    fit_market_model call; every other window sum is two lookups into one
+    set of cumulative sums, so each event costs a handful of array lookups
+    regardless of how many windows are requested.
+    Returns arrays (one entry per event) of alpha, beta, car (in percent),
+    volatility_ratio and a valid mask, plus cars: {window label: car array}.
+    """
+    windows = check_windows(CAR_WINDOWS if windows is None else windows)
+    event_dates = np.asarray(event_dates, dtype="datetime64[D]")
+    if stock_returns.ndim == 1:
+        stock_returns = stock_returns[:, np.newaxis]
+    if columns is None:
+        columns = np.zeros(len(event_dates), dtype=np.intp)
+
+    market_returns = market_returns[:, np.newaxis]
+    observed = np.isfinite(stock_returns) & np.isfinite(market_returns)
+    x = np.where(observed, market_returns, 0.0)
+    y = np.where(observed, stock_returns, 0.0)
+
+    count = _prefix_sums(observed.astype(np.float64))
+    sum_x = _prefix_sums(x)
+    sum_y = _prefix_sums(y)
+    sum_yy = _prefix_sums(y * y)
+
+    # Window bounds as trading-day offsets from each event's position in dates
+    position = np.searchsorted(dates, event_dates, side="left")
+    estimation_start = np.clip(position - days_before - estimation_days, 0, len(dates))
+    event_start = np.clip(position - days_before, 0, len(dates))
+    event_end = np.clip(position + days_after + 1, 0, len(dates))
+
+    def window(sums, lo, hi):
+        return sums[hi, columns] - sums[lo, columns]
+
+    # Each event's estimation window as one column of a (estimation_days x events)
+    # stack; days cut off by the start of the data point at a padding row of NaN
+    rows = estimation_start[:, np.newaxis] + np.arange(estimation_days)
+    rows = np.where(rows < event_start[:, np.newaxis], rows, len(dates))
+    padded_stock = np.vstack([stock_returns, np.full((1, stock_returns.shape[1]), np.nan)])
+    padded_market = np.append(market_returns[:, 0], np.nan)
+    estimation_stock = padded_stock[rows, columns[:, np.newaxis]].T
+    estimation_market = padded_market[rows].T
+
+    n_est = window(count, estimation_start, event_start)
+    sy = window(sum_y, estimation_start, event_start)
+    syy = window(sum_yy, estimation_start, event_start)
+
+    n_event = window(count, event_start, event_end)
+    sx_event = window(sum_x, event_start, event_end)
+    sy_event = window(sum_y, event_start, event_end)
+    syy_event = window(sum_yy, event_start, event_end)
+
+    valid = (n_est >= min_estimation) & (n_event > 0)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # Closed-form OLS of stock on market returns over the estimation window
+        model = fit_market_model(estimation_stock, estimation_market)
+        alpha, beta = model.alpha, model.beta
+
+        # CAR = sum of (actual - expected) returns over the event window
+        car = (sy_event - n_event * alpha - beta * sx_event) * 100
+
+        # Sample standard deviations (ddof=1) of stock returns in each window
+        pre_event_vol = np.sqrt((syy - sy * sy / n_est) / (n_est - 1))
+        post_event_vol = np.sqrt((syy_event - sy_event * sy_event / n_event) / (n_event - 1))
+        volatility_ratio = post_event_vol / pre_event_vol
+
+        # Every extra window from the same sums: sum(y) - n * alpha - beta * sum(x)
+        cars = {}
+        for first, last in windows:
+            lo = np.clip(position + first, 0, len(dates))
+            hi = np.clip(position + last + 1, 0, len(dates))
+            n_window = window(count, lo, hi)
+            cars[window_label((first, last))] = (
+                window(sum_y, lo, hi) - n_window * alpha - beta * window(sum_x, lo, hi)
+            ) * 100
+
+    volatility_ratio = np.where(np.isfinite(volatility_ratio) & (pre_event_vol > 0), volatility_ratio, 1.0)
+    valid &= np.isfinite(car)
+
+    return {
+        "alpha": alpha,
+        "beta": beta,
+        "car": car,
+        "volatility_ratio": volatility_ratio,
+        "valid": valid,
+        "cars": cars,
+    }
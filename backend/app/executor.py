@@ -0,0 +1,105 @@
+import asyncio
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from multiprocessing import get_context
+from typing import Any, Callable, Dict
+
+# Default per-call timeout for request handlers, in seconds
+DEFAULT_TIMEOUT = float(os.getenv("EXECUTOR_TIMEOUT", "60"))
+
+
+class ExecutorBusy(Exception):
+    """Too many calls are already queued on a pool"""
+
+
+class Executor:
+    """
+    Keeps blocking work off the asyncio event loop. Blocking I/O (price
+    downloads, yfinance, the database) runs on a thread pool; CPU-heavy numpy
+    work that doesn't need shared state runs on a process pool.
+
+    Each pool accepts at most max_pending calls (queued plus running). More
+    than that raises ExecutorBusy instead of letting the backlog grow without
+    limit. A call that times out stops being awaited but keeps its slot until
+    it really finishes, so the bound stays honest.
+    """
+
+    def __init__(self, io_workers: int = None, cpu_workers: int = None, max_pending: int = None):
+        io_workers = io_workers or int(os.getenv("IO_WORKERS", "16"))
+        cpu_workers = int(os.getenv("CPU_WORKERS", "2")) if cpu_workers is None else cpu_workers
+        self.max_pending = max_pending or int(os.getenv("EXECUTOR_MAX_PENDING", "64"))
+
+        self.io_pool = ThreadPoolExecutor(max_workers=io_workers, thread_name_prefix="io")
+        # spawn, not fork: the parent has threads (scheduler, pools) that fork would copy mid-state
+        self.cpu_pool = (
+            ProcessPoolExecutor(max_workers=cpu_workers, mp_context=get_context("spawn"))
+            if cpu_workers > 0 else None
+        )
+
+        self._lock = threading.Lock()
+        self._pending = {"io": 0, "cpu": 0}
+        self.rejected = 0
+        self.timeouts = 0
+
+    def _submit(self, lane: str, pool, fn: Callable, *args, **kwargs) -> Future:
+        with self._lock:
+            if self._pending[lane] >= self.max_pending:
+                self.rejected += 1
+                raise ExecutorBusy(f"{self._pending[lane]} {lane} calls already pending, try again shortly")
+            self._pending[lane] += 1
+
+        try:
+            future = pool.submit(partial(fn, *args, **kwargs))
+        except BaseException:
+            self._release(lane)
+            raise
+        future.add_done_callback(lambda _: self._release(lane))
+        return future
+
+    def _release(self, lane: str):
+        with self._lock:
+            self._pending[lane] -= 1
+
+    async def run_io(self, fn: Callable, *args, timeout: float = DEFAULT_TIMEOUT, **kwargs) -> Any:
+        """Await a blocking call on the thread pool. Raises TimeoutError after timeout seconds."""
+        future = self._submit("io", self.io_pool, fn, *args, **kwargs)
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            raise TimeoutError(f"{getattr(fn, '__name__', 'call')} took longer than {timeout:g}s")
+
+    def run_cpu(self, fn: Callable, *args, timeout: float = DEFAULT_TIMEOUT, **kwargs) -> Any:
+        """
+        Run a pure function on the process pool and block for its result. Meant
+        to be called from I/O-pool threads; fn and its arguments must pickle.
+        Runs inline when there is no process pool (CPU_WORKERS=0).
+        """
+        if self.cpu_pool is None:
+            return fn(*args, **kwargs)
+        future = self._submit("cpu", self.cpu_pool, fn, *args, **kwargs)
+        try:
+            return future.result(timeout)
+        except TimeoutError:
+            future.cancel()
+            self.timeouts += 1
+            raise
+
+    def status(self) -> Dict[str, int]:
+        with self._lock:
+            pending = dict(self._pending)
+        return {
+            "io_pending": pending["io"],
+            "cpu_pending": pending["cpu"],
+            "max_pending": self.max_pending,
+            "cpu_workers": self.cpu_pool._max_workers if self.cpu_pool else 0,
+            "rejected": self.rejected,
+            "timeouts": self.timeouts,
+        }
+
+    def shutdown(self):
+        self.io_pool.shutdown(wait=False, cancel_futures=True)
+        if self.cpu_pool is not None:
+            self.cpu_pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,310 @@
+import asyncio
+import os
+import re
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List
+
+# "AAPL", "BRK.B": anything else sent as a ticker isn't looked up at all
+TICKER_FORMAT = re.compile(r"^[A-Z]{1,5}(?:\.[A-Z])?$")
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class IngestionWorker:
+    """
+    Polls the news providers for every tracked ticker on a schedule and
+    writes analyzed articles to the store, so request handlers only read.
+
+    A ticker is tracked while users ask for it. track() validates it against
+    the ticker metadata and records the request time in the stocks table.
+    Tickers nobody has requested for stop_after seconds are no longer polled.
+
+    Each ticker's poll interval follows both signals:
+    - Article arrivals: a poll that brings new items halves the interval and
+      a quiet one stretches it by half, within min_interval..max_interval.
+    - Requests: once a ticker hasn't been requested for active_seconds, its
+      interval is scaled by how long it has been idle, up to
+      idle_max_interval.
+
+    Each cycle polls up to batch_size of the most overdue tickers together.
+    Tickers tracked by another process (e.g. the API, when this worker runs
+    on its own) are picked up from the stocks table every cycle.
+    """
+
+    def __init__(self, news_service, database, executor=None, min_interval: float = None,
+                 max_interval: float = None, batch_size: int = None):
+        self.news_service = news_service
+        self.database = database
+        # Pool for the blocking store calls; asyncio's default pool if None
+        self.executor = executor
+        self.min_interval = min_interval or float(os.getenv("INGEST_MIN_INTERVAL", "60"))
+        self.max_interval = max_interval or float(os.getenv("INGEST_MAX_INTERVAL", "1800"))
+        self.batch_size = batch_size or int(os.getenv("INGEST_BATCH_SIZE", "10"))
+        self.active_seconds = float(os.getenv("INGEST_ACTIVE_SECONDS", "3600"))
+        self.idle_max_interval = float(os.getenv("INGEST_IDLE_MAX_INTERVAL", "21600"))
+        self.stop_after = float(os.getenv("INGEST_STOP_AFTER", "86400"))
+
+        # ticker -> {"interval", "requested_at", "last_poll" (epoch seconds), "last_polled_at",
+        #            "last_new", "polled" (set after the ticker's first poll)}
+        self._schedule: Dict[str, Dict] = {}
+        self._names: Dict[str, str] = {}  # validated ticker -> company name
+        self._invalid: Dict[str, float] = {}  # ticker -> when its lookup failed
+        self._persisted: Dict[str, float] = {}  # ticker -> when its request time was last written
+        self._task: asyncio.Task = None
+        self._wake: asyncio.Event = None
+        self.cycles = 0
+        self.errors = 0
+        self.last_error = None
+        self.last_cycle_seconds = None
+        self.last_cycle_at = None
+
+    async def _run_blocking(self, fn, *args):
+        if self.executor is not None:
+            return await self.executor.run_io(fn, *args)
+        return await asyncio.to_thread(fn, *args)
+
+    def _request(self, ticker: str, requested_at: float) -> bool:
+        """Record a request for a ticker, scheduling it (due now) if new. True if it was new."""
+        entry = self._schedule.get(ticker)
+        if entry is not None:
+            entry["requested_at"] = max(entry["requested_at"], requested_at)
+            return False
+        self._schedule[ticker] = {
+            "interval": self.min_interval,
+            "requested_at": requested_at,
+            "last_poll": None,
+            "last_polled_at": None,
+            "last_new": None,
+            "polled": asyncio.Event(),
+        }
+        return True
+
+    async def _validate(self, tickers: List[str]) -> Dict[str, str]:
+        """{ticker: company name} for the tickers that exist"""
+        now = time.time()
+        lookups = [
+            ticker for ticker in tickers
+            if ticker not in self._names and TICKER_FORMAT.match(ticker)
+            # Don't look a bad ticker up again on every request
+            and now - self._invalid.get(ticker, 0.0) >= 900
+        ]
+        records = await asyncio.gather(
+            *(self._run_blocking(self.news_service.metadata.resolve, ticker) for ticker in lookups),
+            return_exceptions=True,
+        )
+        for ticker, record in zip(lookups, records):
+            if isinstance(record, dict):
+                self._names[ticker] = record["name"]
+            else:
+                self._invalid[ticker] = now
+        return {ticker: self._names[ticker] for ticker in tickers if ticker in self._names}
+
+    async def track(self, tickers: List[str]) -> List[str]:
+        """
+        Record a request for the tickers' news. Unknown tickers are ignored;
+        new ones are polled right away. Returns the valid tickers.
+        """
+        tickers = list(dict.fromkeys(ticker.strip().upper() for ticker in tickers))
+        valid = await self._validate(tickers)
+        now = time.time()
+
+        # Request times are written at most every few minutes per ticker
+        stale = {ticker: name for ticker, name in valid.items() if now - self._persisted.get(ticker, 0.0) >= 300}
+        if stale:
+            await self._run_blocking(self.database.track_tickers, stale, _utcnow())
+            for ticker in stale:
+                self._persisted[ticker] = now
+
+        added = False
+        for ticker in valid:
+            added = self._request(ticker, now) or added
+        if added and self._wake is not None:
+            self._wake.set()
+        return list(valid)
+
+    async def wait_for_first_poll(self, tickers: List[str], timeout: float = None):
+        """
+        Wait (up to timeout seconds) until every given ticker has been polled
+        once, so a newly tracked ticker's first read isn't empty. Returns at
+        once if this process isn't polling.
+        """
+        if self._task is None:
+            return
+        timeout = float(os.getenv("INGEST_FIRST_WAIT", "10")) if timeout is None else timeout
+        pending = [
+            self._schedule[ticker]["polled"].wait() for ticker in tickers
+            if ticker in self._schedule and not self._schedule[ticker]["polled"].is_set()
+        ]
+        if pending:
+            try:
+                await asyncio.wait_for(asyncio.gather(*pending), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    def _interval(self, entry: Dict, now: float) -> float:
+        """Poll interval from article activity, stretched while nobody requests the ticker"""
+        idle = now - entry["requested_at"]
+        if idle <= self.active_seconds:
+            return entry["interval"]
+        return max(entry["interval"], min(entry["interval"] * idle / self.active_seconds, self.idle_max_interval))
+
+    def _next_due(self, entry: Dict, now: float) -> float:
+        if entry["last_poll"] is None:
+            return now
+        return entry["last_poll"] + self._interval(entry, now)
+
+    def start(self):
+        """Start polling on the running event loop"""
+        if self._task is None:
+            self._wake = asyncio.Event()
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _sync(self):
+        """Pick up tickers requested through other processes; drop ones nobody wants any more"""
+        now = time.time()
+        try:
+            since = _utcnow() - timedelta(seconds=self.stop_after)
+            tracked = await self._run_blocking(self.database.get_tracked_tickers, since)
+            for ticker, requested_at in tracked.items():
+                self._request(ticker, requested_at.replace(tzinfo=timezone.utc).timestamp())
+        except Exception as e:
+            print(f"Ingestion worker could not load tracked tickers: {e}")
+
+        for ticker, entry in list(self._schedule.items()):
+            if now - entry["requested_at"] > self.stop_after:
+                print(f"Ingestion worker stopped polling {ticker}: not requested in {self.stop_after:g}s")
+                entry["polled"].set()
+                del self._schedule[ticker]
+
+    async def run(self):
+        print("Ingestion worker started")
+        while True:
+            await self._sync()
+
+            now = time.time()
+            due_at = {ticker: self._next_due(entry, now) for ticker, entry in self._schedule.items()}
+            due = sorted((ticker for ticker, at in due_at.items() if at <= now), key=due_at.get)[:self.batch_size]
+
+            if due:
+                await self._poll(due)
+                continue
+
+            # Sleep until the next ticker is due or track() adds one, and re-sync at least every minute
+            next_due = min(due_at.values(), default=now + 60)
+            self._wake.clear()
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=min(max(next_due - now, 0.1), 60))
+            except asyncio.TimeoutError:
+                pass
+
+    async def _poll(self, tickers: List[str]):
+        start = time.time()
+        try:
+            # The worker keeps its own schedule, so the providers are asked every time. Other
+            # tracked tickers are tagged too, but only where the article names them.
+            counts = await self.news_service.ingest(
+                tickers, universe=list(self._schedule), min_poll_interval=timedelta(0)
+            )
+        except Exception as e:
+            print(f"Ingestion error for {tickers}: {e}")
+            self.errors += 1
+            self.last_error = f"{datetime.now().isoformat()}: {e}"
+            counts = None
+
+        finished = time.time()
+        for ticker in tickers:
+            entry = self._schedule.get(ticker)
+            if entry is None:
+                continue
+            entry["last_poll"] = finished
+            # Readers waiting on a first poll get whatever there is, even after a failure
+            entry["polled"].set()
+            if counts is None:
+                # Retry after min_interval without shrinking or stretching the interval
+                entry["last_poll"] = finished - self._interval(entry, finished) + self.min_interval
+                continue
+            new = counts.get(ticker, 0)
+            if new:
+                entry["interval"] = max(self.min_interval, entry["interval"] / 2)
+            else:
+                entry["interval"] = min(self.max_interval, entry["interval"] * 1.5)
+            entry["last_polled_at"] = datetime.now()
+            entry["last_new"] = new
+
+        self.cycles += 1
+        self.last_cycle_seconds = round(finished - start, 3)
+        self.last_cycle_at = datetime.now()
+
+    def status(self) -> Dict:
+        """
+        lag_seconds: how long the most overdue ticker has been waiting for its
+        poll. backlog: tickers currently due or overdue. idle: tickers polled
+        less often because nobody has requested them for active_seconds.
+        """
+        now = time.time()
+        due_at = {ticker: self._next_due(entry, now) for ticker, entry in self._schedule.items()}
+        overdue = [now - at for at in due_at.values() if at <= now]
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "tracked": len(self._schedule),
+            "idle": sum(1 for entry in self._schedule.values() if now - entry["requested_at"] > self.active_seconds),
+            "backlog": len(overdue),
+            "lag_seconds": round(max(overdue), 1) if overdue else 0.0,
+            "cycles": self.cycles,
+            "last_cycle_seconds": self.last_cycle_seconds,
+            "last_cycle_at": self.last_cycle_at.isoformat() if self.last_cycle_at else None,
+            "errors": self.errors,
+            "last_error": self.last_error,
+            "tickers": {
+                ticker: {
+                    "interval_seconds": round(self._interval(entry, now), 1),
+                    "due_in_seconds": round(max(due_at[ticker] - now, 0.0), 1),
+                    "idle_seconds": round(now - entry["requested_at"], 1),
+                    "last_polled_at": entry["last_polled_at"].isoformat() if entry["last_polled_at"] else None,
+                    "last_new_articles": entry["last_new"],
+                }
+                for ticker, entry in sorted(self._schedule.items())
+            },
+        }
+
+
+async def _main():
+    # Standalone worker for deployments that run the API with INGESTION_WORKER=external
+    from dotenv import load_dotenv
+
+    from app.analysis_cache import AnalysisCache
+    from app.database import Database
+    from app.news_service import NewsService
+
+    load_dotenv()
+    database = Database(os.getenv("DATABASE_URL"))
+    news_service = NewsService(
+        news_api_key=os.getenv("NEWS_API_KEY"),
+        finnhub_api_key=os.getenv("FINNHUB_API_KEY"),
+        analysis_cache=AnalysisCache(database),
+        database=database,
+    )
+    worker = IngestionWorker(news_service, database)
+    try:
+        worker.start()
+        await worker._task
+    finally:
+        await worker.stop()
+        await news_service.aclose()
+
+
+if __name__ == "__main__":
+    # python -m app.ingestion_worker
+    asyncio.run(_main())
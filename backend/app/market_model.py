@@ -0,0 +1,62 @@
+import numpy as np
+from typing import NamedTuple
+
+
+class MarketModel(NamedTuple):
+    """Market-model fit r_stock = alpha + beta * r_market + e (one value per series)"""
+    alpha: np.ndarray
+    beta: np.ndarray
+    residual_variance: np.ndarray
+    t_alpha: np.ndarray
+    t_beta: np.ndarray
+    n: np.ndarray
+
+
+def fit_from_sums(n, sum_x, sum_y, sum_xx, sum_xy, sum_yy) -> MarketModel:
+    """
+    Closed-form OLS of y on x from window sums. Every argument may be a scalar
+    or an array, so one call fits as many windows or series as are passed in.
+    """
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # Centered sums of squares and cross products
+        sxx = sum_xx - sum_x * sum_x / n
+        sxy = sum_xy - sum_x * sum_y / n
+        syy = sum_yy - sum_y * sum_y / n
+
+        beta = sxy / sxx
+        alpha = (sum_y - beta * sum_x) / n
+
+        # Unbiased residual variance and coefficient standard errors
+        residual_variance = np.maximum(syy - beta * sxy, 0.0) / (n - 2)
+        se_beta = np.sqrt(residual_variance / sxx)
+        se_alpha = np.sqrt(residual_variance * (1.0 / n + (sum_x / n) ** 2 / sxx))
+
+        t_alpha = alpha / se_alpha
+        t_beta = beta / se_beta
+
+    return MarketModel(alpha, beta, residual_variance, t_alpha, t_beta, n)
+
+
+def fit_market_model(stock_returns: np.ndarray, market_returns: np.ndarray) -> MarketModel:
+    """
+    Fit the market model for one return series or for a (days x series)
+    stack of them, against a single market series or a stack of the same
+    shape. Days where a return is NaN are left out of that series' fit.
+    """
+    stock_returns = np.asarray(stock_returns, dtype=np.float64)
+    market_returns = np.asarray(market_returns, dtype=np.float64)
+    if stock_returns.ndim == 2 and market_returns.ndim == 1:
+        market_returns = market_returns[:, np.newaxis]
+
+    observed = np.isfinite(stock_returns) & np.isfinite(market_returns)
+    x = np.where(observed, market_returns, 0.0)
+    y = np.where(observed, stock_returns, 0.0)
+
+    return fit_from_sums(
+        observed.sum(axis=0).astype(np.float64),
+        x.sum(axis=0),
+        y.sum(axis=0),
+        (x * x).sum(axis=0),
+        (x * y).sum(axis=0),
+        (y * y).sum(axis=0),
+    )
@@ -1,84 +1,357 @@
-import requests
-from typing import List, Dict
-from datetime import datetime, timedelta
-from textblob import TextBlob
+import asyncio
+import os
+import httpx
+from typing import Any, List, Dict, Optional, Tuple
+from datetime import datetime, timedelta, timezone
 import re
 
+from app.analysis_cache import AnalysisCache, content_key
+from app.dedup import Deduplicator, simhash
+from app.relevance import RelevanceEngine, COMPANY_VARIATIONS, RELEVANCE_THRESHOLD, symbols_in
+from app.sentiment import BatchSentiment, label_for
+from app.single_flight import SingleFlight
+from app.ticker_metadata import TickerMetadata
+
 class NewsService:
-    def __init__(self, news_api_key: str = None, finnhub_api_key: str = None):
+    def __init__(self, news_api_key: str = None, finnhub_api_key: str = None, metadata: TickerMetadata = None,
+                 analysis_cache: AnalysisCache = None, executor=None, database=None):
         self.news_api_key = news_api_key
         self.finnhub_api_key = finnhub_api_key
         self.news_api_url = "https://newsapi.org/v2/everything"
         self.finnhub_url = "https://finnhub.io/api/v1/company-news"
+        self.flights = SingleFlight()
+        self.metadata = metadata or TickerMetadata()
+        # Every relevance term compiled once, scored with one scan per article
+        self.relevance = RelevanceEngine()
+        # Lexicon compiled once; a whole feed is scored in one vectorized pass
+        self.sentiment = BatchSentiment()
+        # Syndicated copies (same canonical URL or near-identical headline) collapse to one story
+        self.dedup = Deduplicator()
+        # Analyses of content seen before (earlier poll, other worker) are reused
+        self.analysis_cache = analysis_cache or AnalysisCache()
+        # Pool for the blocking analysis step (cache store lookups); asyncio's default pool if None
+        self.executor = executor
+        # Article store with per-(ticker, provider) high-water marks; without one, fetches are
+        # answered from what was just downloaded
+        self.database = database
+        self.window = timedelta(days=7)
+        # A (ticker, provider) polled more recently than this is answered from the store
+        self.min_poll_interval = timedelta(seconds=int(os.getenv("NEWS_MIN_POLL_SECONDS", "300")))
+        # NewsAPI pages fetched per poll while walking back to the high-water mark
+        self.page_size = 10
+        self.max_pages = int(os.getenv("NEWS_MAX_PAGES", "10"))
+
+        # One keep-alive connection pool for every provider, created on first use
+        self._client: httpx.AsyncClient = None
+        # Cap on in-flight provider calls overall, and per provider
+        self._max_concurrency = int(os.getenv("NEWS_MAX_CONCURRENCY", "16"))
+        self._concurrency = asyncio.Semaphore(self._max_concurrency)
+        self._provider_limits = {
+            "newsapi": asyncio.Semaphore(int(os.getenv("NEWSAPI_MAX_CONCURRENCY", "5"))),
+            "finnhub": asyncio.Semaphore(int(os.getenv("FINNHUB_MAX_CONCURRENCY", "8"))),
+        }
 
-    async def fetch_news_for_tickers(self, tickers: List[str]) -> List[Dict]:
-        """Fetch and analyze news for given tickers"""
-        all_articles = []
-
-        for ticker in tickers:
-            articles = await self._fetch_ticker_news(ticker)
-            all_articles.extend(articles)
-
-        # Sort by published date (newest first)
-        all_articles.sort(key=lambda x: x["published_at"], reverse=True)
-
-        return all_articles[:20]  # Return top 20 articles
-
-    async def _fetch_ticker_news(self, ticker: str) -> List[Dict]:
-        """Fetch news for a specific ticker"""
-        articles = []
-
-        # Try NewsAPI first
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=10.0,
+                limits=httpx.Limits(max_connections=self._max_concurrency,
+                                    max_keepalive_connections=self._max_concurrency),
+            )
+        return self._client
+
+    async def aclose(self):
+        """Close the pooled HTTP connections"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def _get_json(self, provider: str, url: str, params: Dict) -> Any:
+        """GET a provider endpoint through the shared client, within both concurrency limits"""
+        # Provider slot first, so a call waiting on its provider doesn't hold a global slot
+        async with self._provider_limits[provider], self._concurrency:
+            response = await self._get_client().get(url, params=params)
+        response.raise_for_status()
+        return response.json()
+
+    async def fetch_news_for_tickers(self, tickers: List[str], universe: List[str] = None) -> List[Dict]:
+        """
+        Fetch, analyze and return news for given tickers in one go. With an
+        article store this is ingest() followed by read_news(); without one
+        the freshly fetched articles are returned directly.
+        """
+        tickers = [ticker.upper() for ticker in tickers]
+        if self.database:
+            await self.ingest(tickers, universe)
+            return await self.read_news(tickers)
+
+        tagged, _ = await self._collect(tickers, universe or tickers, {}, self.min_poll_interval)
+        all_articles = [
+            {
+                "ticker": ticker,
+                "title": article["title"],
+                "sentiment": article["sentiment"],
+                "summary": article["summary"],
+                "url": article["url"],
+                "published_at": article["published_at"].isoformat(),
+            }
+            for article in tagged
+            for ticker in article["tags"]
+        ]
+        return self._with_mock_news(all_articles, tickers, {article["ticker"] for article in all_articles})
+
+    async def ingest(self, tickers: List[str], universe: List[str] = None,
+                     min_poll_interval: timedelta = None) -> Dict[str, int]:
+        """
+        Poll the providers for the tickers and store what is relevant. Each
+        ticker and provider is asked only for items newer than its stored
+        high-water mark, and not at all if it was polled within
+        min_poll_interval (default: NEWS_MIN_POLL_SECONDS). Articles are tagged
+        against the whole universe (default: the tickers), so a story fetched
+        for one ticker is stored under every ticker it is relevant to.
+
+        Returns the number of new items the providers returned per ticker.
+        """
+        tickers = [ticker.upper() for ticker in tickers]
+        universe = [ticker.upper() for ticker in universe] if universe else tickers
+        polled_at = datetime.now(timezone.utc).replace(tzinfo=None)
+        min_poll_interval = self.min_poll_interval if min_poll_interval is None else min_poll_interval
+
+        watermarks = await self._run_blocking(self.database.get_news_watermarks, tickers)
+        tagged, fetched = await self._collect(tickers, universe, watermarks, min_poll_interval, polled_at)
+
+        # Each story is stored under its own URL with its fingerprint bands; a copy of a
+        # stored story only adds its tickers to that story
+        for article in tagged:
+            article["canonical_url"] = article["canonical_url"] or f"simhash:{article['fingerprint']:016x}"
+            article["bands"] = dict(enumerate(self.dedup.index.band_values(article["fingerprint"])))
+        await self._run_blocking(self.database.upsert_articles, tagged)
+
+        # Marks move only after the articles behind them are stored
+        newest = {
+            key: max((article["published_at"] for article in articles), default=None)
+            for key, articles in fetched.items()
+        }
+        await self._run_blocking(self.database.advance_news_watermarks, newest, polled_at)
+
+        counts = {ticker: 0 for ticker in tickers}
+        for (ticker, _), articles in fetched.items():
+            counts[ticker] += len(articles)
+        return counts
+
+    async def read_news(self, tickers: List[str], limit: int = 20) -> List[Dict]:
+        """Newest stored articles for the tickers, without calling any provider"""
+        tickers = [ticker.upper() for ticker in tickers]
+        since = datetime.now(timezone.utc).replace(tzinfo=None) - self.window
+        all_articles = await self._run_blocking(self.database.get_recent_articles, tickers, since, limit)
+        covered = await self._run_blocking(self.database.get_tickers_with_articles, tickers, since)
+        return self._with_mock_news(all_articles, tickers, covered, limit)
+
+    async def _collect(self, tickers: List[str], universe: List[str], watermarks: Dict,
+                       min_poll_interval: timedelta, polled_at: datetime = None) -> Tuple[List[Dict], Dict]:
+        """
+        Fetch the tickers' new articles, collapse syndicated copies, analyze
+        each story once and tag it against the universe. Returns the tagged
+        articles and the raw articles per (ticker, provider) actually polled.
+        """
+        polled_at = polled_at or datetime.now(timezone.utc).replace(tzinfo=None)
+
+        # Every ticker (and each ticker's providers) in flight at once
+        raw_articles = []
+        fetched: Dict[Tuple[str, str], List[Dict]] = {}
+        results = await asyncio.gather(*(
+            self._fetch_ticker_news(ticker, watermarks, polled_at, min_poll_interval) for ticker in tickers
+        ))
+        for ticker, by_provider in zip(tickers, results):
+            for provider, articles in by_provider.items():
+                raw_articles.extend({**article, "fetched_for": {ticker}} for article in articles)
+                fetched[(ticker, provider)] = articles
+
+        # Stories stored by other workers, or before a restart, that these headlines may copy
+        if self.database and raw_articles:
+            bands = {}
+            fingerprints = {simhash(article.get("title", "")) for article in raw_articles} - {0}
+            for fingerprint in fingerprints:
+                for band, value in enumerate(self.dedup.index.band_values(fingerprint)):
+                    bands.setdefault(band, set()).add(value)
+            self.dedup.seed(await self._run_blocking(
+                self.database.get_story_fingerprints, bands, polled_at - self.window
+            ))
+
+        # Sentiment and summary once per article, however many tickers it is attributed to
+        analyzed = await self._run_blocking(self.analyze_articles, self.dedup.dedupe(raw_articles))
+        return self.tag_articles(analyzed, universe), fetched
+
+    def _providers(self) -> List[Tuple[str, Any]]:
+        """(name, fetch) for every provider with an API key configured"""
+        providers = []
         if self.news_api_key and self.news_api_key != "your_newsapi_key_here":
-            articles.extend(await self._fetch_from_newsapi(ticker))
-
-        # Fallback to Finnhub
+            providers.append(("newsapi", self._fetch_from_newsapi))
         if self.finnhub_api_key and self.finnhub_api_key != "your_finnhub_key_here":
-            articles.extend(await self._fetch_from_finnhub(ticker))
+            providers.append(("finnhub", self._fetch_from_finnhub))
+        return providers
 
-        # If no API keys, return mock data for demo
-        if not articles:
-            articles = self._generate_mock_news(ticker)
+    def _with_mock_news(self, all_articles: List[Dict], tickers: List[str], covered, limit: int = 20) -> List[Dict]:
+        # No API keys: mock data for demo (with keys, a ticker without news just has none)
+        if not self._providers():
+            for ticker in tickers:
+                if ticker not in covered:
+                    all_articles.extend(self._generate_mock_news(ticker))
 
-        return articles
+        # Sort by published date (newest first)
+        all_articles.sort(key=lambda x: x["published_at"], reverse=True)
 
-    async def _fetch_from_newsapi(self, ticker: str) -> List[Dict]:
-        """Fetch news from NewsAPI"""
+        return all_articles[:limit]  # Return top articles
+
+    async def _fetch_ticker_news(self, ticker: str, watermarks: Dict = None, polled_at: datetime = None,
+                                 min_poll_interval: timedelta = None) -> Dict[str, List[Dict]]:
+        """
+        Raw (untagged, unanalyzed) news for a specific ticker, by provider,
+        newer than each provider's high-water mark. Providers that were
+        skipped or failed are left out.
+        """
+        watermarks = watermarks or {}
+        polled_at = polled_at or datetime.now(timezone.utc).replace(tzinfo=None)
+        min_poll_interval = self.min_poll_interval if min_poll_interval is None else min_poll_interval
+
+        names, fetches, marks = [], [], []
+        for provider, fetch in self._providers():
+            mark = watermarks.get((ticker, provider), {})
+            last_polled_at = mark.get("last_polled_at")
+            if last_polled_at and polled_at - last_polled_at < min_poll_interval:
+                continue
+            last_published_at = mark.get("last_published_at")
+            since = max(last_published_at, polled_at - self.window) if last_published_at else polled_at - self.window
+
+            # NewsAPI and Finnhub concurrently (concurrent requests for a ticker share one call)
+            names.append(provider)
+            marks.append(last_published_at)
+            fetches.append(self.flights.do_async(
+                (provider, ticker, since), lambda fetch=fetch, since=since: fetch(ticker, since)
+            ))
+
+        by_provider = {}
+        for provider, last_published_at, articles in zip(names, marks, await asyncio.gather(*fetches)):
+            if articles is None:
+                continue
+            if last_published_at:
+                # Finnhub filters by day only, and NewsAPI's "from" is inclusive
+                articles = [article for article in articles if article["published_at"] > last_published_at]
+            by_provider[provider] = articles
+        return by_provider
+
+    async def _run_blocking(self, fn, *args):
+        if self.executor is not None:
+            return await self.executor.run_io(fn, *args)
+        return await asyncio.to_thread(fn, *args)
+
+    def analyze_articles(self, articles: List[Dict]) -> List[Dict]:
+        """
+        Matched relevance terms, sentiment and summary for each article.
+        Content analyzed before comes from the analysis cache; the rest is
+        scored in one sentiment batch and cached.
+        """
+        keys = [content_key(article["title"], article["description"], article["provider"]) for article in articles]
+        analyses = self.analysis_cache.get_many(keys)
+
+        fresh = {}
+        for key, article in zip(keys, articles):
+            if key not in analyses:
+                fresh.setdefault(key, article)
+        if fresh:
+            polarities = self._get_polarities([article["text"] for article in fresh.values()])
+            for (key, article), polarity in zip(fresh.items(), polarities):
+                analyses[key] = {
+                    "matches": sorted(self.relevance.matches(article["text"])),
+                    "sentiment": label_for(polarity),
+                    "polarity": round(float(polarity), 4),
+                    "summary": self._summarize(article),
+                }
+            self.analysis_cache.put_many({key: analyses[key] for key in fresh})
+
+        return [{**article, **analyses[key]} for key, article in zip(keys, articles)]
+
+    def tag_articles(self, articles: List[Dict], universe: List[str]) -> List[Dict]:
+        """
+        Score each analyzed article against every ticker in the universe from
+        its matched terms, without rescanning the text. Returns the articles
+        relevant to at least one ticker, each with tags: {ticker: relevance score}.
+
+        A ticker the article was fetched for (fetched_for) only needs the
+        score. Any other ticker must also be named in the text, by symbol or
+        company name, so generic keywords can't attach a story to it.
+        """
+        tagged = []
+        for article in articles:
+            try:
+                text = article["text"]
+                matches = frozenset(article["matches"])
+                fetched_for = article.get("fetched_for", ())
+                symbols = symbols_in(text)
+                tags = {}
+                for ticker in universe:
+                    if ticker not in fetched_for and not self.relevance.mentions(ticker, text, matches, symbols):
+                        continue
+                    score = self.relevance.score(ticker, text, matches)
+                    if score >= RELEVANCE_THRESHOLD:
+                        tags[ticker] = score
+            except Exception as e:
+                print(f"Error tagging article: {e}")
+                continue
+            if tags:
+                tagged.append({**article, "tags": tags})
+        return tagged
+
+    async def _fetch_from_newsapi(self, ticker: str, since: datetime) -> Optional[List[Dict]]:
+        """
+        Fetch news from NewsAPI published since the given UTC time (None on
+        failure). Results come newest first, so pages are fetched until one
+        comes back short, i.e. everything back to since has been seen, or
+        max_pages is reached.
+        """
         try:
-            # Get company name from yfinance
-            import yfinance as yf
-            stock = yf.Ticker(ticker)
-            company_name = stock.info.get("longName", ticker)
-
-            params = {
-                "q": f"{ticker} OR {company_name}",
-                "apiKey": self.news_api_key,
-                "language": "en",
-                "sortBy": "publishedAt",
-                "pageSize": 10,
-                "from": (datetime.now() - timedelta(days=7)).isoformat()
-            }
-
-            response = requests.get(self.news_api_url, params=params, timeout=10)
-            response.raise_for_status()
-            data = response.json()
-
-            articles = []
-            for article in data.get("articles", []):
-                analyzed = self._analyze_article(ticker, article)
-                if analyzed:
-                    articles.append(analyzed)
-
-            return articles
+            # Company name from the metadata cache (unknown tickers are looked up in the background)
+            company_name = self.metadata.company_name(ticker)
         except Exception as e:
             print(f"NewsAPI error for {ticker}: {e}")
-            return []
+            return None
+        params = {
+            "q": f"{ticker} OR {company_name}",
+            "apiKey": self.news_api_key,
+            "language": "en",
+            "sortBy": "publishedAt",
+            "pageSize": self.page_size,
+            "from": since.strftime("%Y-%m-%dT%H:%M:%S")
+        }
 
-    async def _fetch_from_finnhub(self, ticker: str) -> List[Dict]:
-        """Fetch news from Finnhub"""
+        articles = []
+        for page in range(1, self.max_pages + 1):
+            try:
+                data = await self._get_json("newsapi", self.news_api_url, {**params, "page": page})
+            except Exception as e:
+                print(f"NewsAPI error for {ticker} (page {page}): {e}")
+                if page == 1:
+                    return None
+                # Keep the pages already fetched; the plan's result cap ends paging too
+                break
+            batch = data.get("articles", [])
+            articles.extend(self._normalize_article(article) for article in batch)
+            if len(batch) < self.page_size or len(articles) >= data.get("totalResults", 0):
+                break
+        else:
+            print(f"NewsAPI: over {len(articles)} new items for {ticker} since {since:%Y-%m-%d %H:%M}; "
+                  f"older ones are skipped (raise NEWS_MAX_PAGES to fetch more)")
+        return articles
+
+    async def _fetch_from_finnhub(self, ticker: str, since: datetime) -> Optional[List[Dict]]:
+        """
+        Fetch news from Finnhub published since the given UTC time (None on
+        failure). Finnhub returns the whole date range in one response, so
+        every item from since on is kept.
+        """
         try:
-            from_date = (datetime.now() - timedelta(days=7)).strftime("%Y-%m-%d")
-            to_date = datetime.now().strftime("%Y-%m-%d")
+            from_date = since.strftime("%Y-%m-%d")
+            to_date = datetime.now(timezone.utc).strftime("%Y-%m-%d")
 
             params = {
                 "symbol": ticker,
@@ -87,306 +360,68 @@ class NewsService:
                 "token": self.finnhub_api_key
             }
 
-            response = requests.get(self.finnhub_url, params=params, timeout=10)
-            response.raise_for_status()
-            data = response.json()
+            data = await self._get_json("finnhub", self.finnhub_url, params)
 
-            articles = []
-            for item in data[:10]:
-                analyzed = self._analyze_finnhub_article(ticker, item)
-                if analyzed:
-                    articles.append(analyzed)
-
-            return articles
+            articles = [self._normalize_finnhub_article(item) for item in data]
+            # The range is by day; drop what is older than since within its first day
+            return [article for article in articles if article["published_at"] >= since]
         except Exception as e:
             print(f"Finnhub error for {ticker}: {e}")
-            return []
-
-    def _analyze_article(self, ticker: str, article: Dict) -> Dict:
-        """Analyze sentiment and summarize article"""
-        try:
-            title = article.get("title", "")
-            description = article.get("description", "") or ""
-            content = article.get("content", "") or ""
-
-            # Combine text for analysis
-            full_text = f"{title}. {description}"
-
-            # Check if article is actually relevant to the ticker
-            if not self._is_relevant_to_ticker(ticker, full_text):
-                return None
-
-            # Sentiment analysis using TextBlob
-            sentiment = self._get_sentiment(full_text)
+            return None
 
-            # Generate summary (first 2 sentences)
-            summary = self._generate_summary(description or title)
+    def _normalize_article(self, article: Dict) -> Dict:
+        """NewsAPI article in the common raw shape"""
+        title = article.get("title", "") or ""
+        description = article.get("description", "") or ""
+
+        return {
+            "provider": "newsapi",
+            "title": title,
+            "description": description,
+            # Combined text used for tagging and sentiment
+            "text": f"{title}. {description}",
+            "url": article.get("url", "") or "",
+            "published_at": self._parse_published(article.get("publishedAt"))
+        }
 
-            return {
-                "ticker": ticker,
-                "title": title,
-                "sentiment": sentiment,
-                "summary": summary,
-                "url": article.get("url", ""),
-                "published_at": article.get("publishedAt", datetime.now().isoformat())
-            }
-        except Exception as e:
-            print(f"Error analyzing article: {e}")
-            return None
+    def _normalize_finnhub_article(self, article: Dict) -> Dict:
+        """Finnhub article in the common raw shape"""
+        headline = article.get("headline", "") or ""
+        summary_text = article.get("summary", "") or ""
+
+        return {
+            "provider": "finnhub",
+            "title": headline,
+            "description": summary_text,
+            "text": f"{headline}. {summary_text}",
+            "url": article.get("url", "") or "",
+            "published_at": datetime.fromtimestamp(article.get("datetime", 0), timezone.utc).replace(tzinfo=None)
+        }
 
-    def _analyze_finnhub_article(self, ticker: str, article: Dict) -> Dict:
-        """Analyze Finnhub article"""
+    def _parse_published(self, value: str) -> datetime:
+        """NewsAPI's ISO 8601 publishedAt as a naive UTC datetime (now if missing)"""
         try:
-            headline = article.get("headline", "")
-            summary_text = article.get("summary", "")
-
-            full_text = f"{headline}. {summary_text}"
-            
-            # Check if article is actually relevant to the ticker
-            if not self._is_relevant_to_ticker(ticker, full_text):
-                return None
-                
-            sentiment = self._get_sentiment(full_text)
-
-            return {
-                "ticker": ticker,
-                "title": headline,
-                "sentiment": sentiment,
-                "summary": summary_text[:200] + "..." if len(summary_text) > 200 else summary_text,
-                "url": article.get("url", ""),
-                "published_at": datetime.fromtimestamp(article.get("datetime", 0)).isoformat()
-            }
-        except Exception as e:
-            print(f"Error analyzing Finnhub article: {e}")
-            return None
-
-    def _is_relevant_to_ticker(self, ticker: str, text: str) -> bool:
-        """Check if article is actually relevant to the ticker using scoring system"""
+            published = datetime.fromisoformat(value.replace("Z", "+00:00"))
+            if published.tzinfo is not None:
+                published = published.astimezone(timezone.utc).replace(tzinfo=None)
+            return published
+        except (AttributeError, ValueError):
+            return datetime.now(timezone.utc).replace(tzinfo=None)
+
+    def _get_polarities(self, texts: List[str]) -> List[float]:
+        """Sentiment polarity for many texts at once"""
         try:
-            text_lower = text.lower()
-            ticker_lower = ticker.lower()
-            relevance_score = 0
-            
-            # Direct ticker mention (highest priority)
-            if ticker_lower in text_lower:
-                relevance_score += 10
-            
-            # Check for common company name variations
-            company_variations = self._get_company_variations(ticker)
-            for variation in company_variations:
-                if variation.lower() in text_lower:
-                    relevance_score += 8
-                    break  # Only count once for company name
-            
-            # Check for financial keywords that indicate stock-specific content
-            stock_specific_keywords = [
-                "earnings", "revenue", "profit", "loss", "stock", "shares", 
-                "dividend", "ipo", "merger", "acquisition", "partnership",
-                "quarterly", "annual", "guidance", "forecast", "analyst",
-                "price target", "upgrade", "downgrade", "rating", "trading",
-                "market cap", "valuation", "investor", "shareholder"
-            ]
-            
-            # Count financial keyword mentions
-            financial_mentions = sum(1 for keyword in stock_specific_keywords if keyword in text_lower)
-            relevance_score += min(financial_mentions * 2, 6)  # Cap at 6 points
-            
-            # Check for industry-specific terms that might be relevant
-            industry_terms = self._get_industry_terms(ticker)
-            for term in industry_terms:
-                if term.lower() in text_lower:
-                    relevance_score += 3
-                    break
-            
-            # Check for competitor mentions (might be relevant)
-            competitors = self._get_competitors(ticker)
-            for competitor in competitors:
-                if competitor.lower() in text_lower:
-                    relevance_score += 2
-                    break
-            
-            # Minimum threshold for relevance
-            return relevance_score >= 5
-            
+            return list(self.sentiment.polarities(texts))
         except Exception as e:
-            print(f"Error checking relevance for {ticker}: {e}")
-            return True  # Default to including if we can't determine relevance
-
-    def _get_industry_terms(self, ticker: str) -> List[str]:
-        """Get industry-specific terms for a ticker"""
-        industry_mappings = {
-            "AAPL": ["smartphone", "iphone", "ipad", "mac", "ios", "app store", "services"],
-            "MSFT": ["software", "cloud", "azure", "office", "windows", "enterprise"],
-            "GOOGL": ["search", "advertising", "youtube", "android", "cloud", "ai"],
-            "AMZN": ["e-commerce", "aws", "retail", "logistics", "prime", "marketplace"],
-            "TSLA": ["electric vehicle", "ev", "autonomous", "battery", "solar", "energy"],
-            "META": ["social media", "facebook", "instagram", "whatsapp", "vr", "metaverse"],
-            "NVDA": ["gpu", "ai", "gaming", "data center", "cuda", "machine learning"],
-            "NFLX": ["streaming", "entertainment", "content", "subscription", "movies"],
-            "AMD": ["processor", "cpu", "gpu", "semiconductor", "gaming", "data center"],
-            "INTC": ["processor", "cpu", "semiconductor", "manufacturing", "foundry"],
-            "CRM": ["crm", "sales", "customer", "enterprise", "saas", "cloud"],
-            "ORCL": ["database", "enterprise", "cloud", "software", "erp"],
-            "IBM": ["enterprise", "cloud", "ai", "consulting", "mainframe", "watson"],
-            "CSCO": ["networking", "infrastructure", "security", "routing", "switching"],
-            "ADBE": ["creative", "design", "photoshop", "pdf", "document", "marketing"],
-            "PYPL": ["payment", "fintech", "digital wallet", "venmo", "online payment"],
-            "UBER": ["ride-sharing", "transportation", "mobility", "delivery", "logistics"],
-            "LYFT": ["ride-sharing", "transportation", "mobility", "sharing economy"],
-            "SNAP": ["social media", "snapchat", "camera", "messaging", "ar"],
-            "TWTR": ["twitter", "social media", "microblogging", "news", "x"],
-            "SQ": ["payment", "fintech", "point of sale", "pos", "block"],
-            "ROKU": ["streaming", "tv", "entertainment", "device", "platform"],
-            "ZM": ["video conferencing", "remote work", "communication", "meeting"],
-            "DOCU": ["document", "signature", "agreement", "workflow", "digital"],
-            "SNOW": ["data warehouse", "analytics", "cloud", "database", "snowflake"],
-            "PLTR": ["data analytics", "government", "defense", "intelligence", "palantir"],
-            "COIN": ["cryptocurrency", "bitcoin", "crypto", "trading", "exchange"],
-            "HOOD": ["trading", "brokerage", "commission", "retail investor", "robinhood"],
-            "SPOT": ["music", "streaming", "podcast", "entertainment", "subscription"],
-            "PINS": ["pinterest", "visual", "shopping", "inspiration", "social"],
-            "SHOP": ["e-commerce", "online store", "retail", "merchant", "shopify"],
-            "OKTA": ["identity", "authentication", "security", "sso", "cybersecurity"],
-            "CRWD": ["cybersecurity", "endpoint", "security", "threat", "crowdstrike"],
-            "ZS": ["cybersecurity", "zero trust", "security", "zscaler", "cloud"],
-            "NET": ["cloudflare", "cdn", "security", "performance", "infrastructure"],
-            "DDOG": ["monitoring", "observability", "devops", "apm", "datadog"],
-            "MDB": ["database", "nosql", "document", "mongodb", "developer"],
-            "ESTC": ["search", "elasticsearch", "analytics", "logging", "elastic"],
-            "SPLK": ["splunk", "log analysis", "security", "monitoring", "data"],
-            "WDAY": ["hr", "workday", "human resources", "payroll", "hcm"],
-            "NOW": ["servicenow", "it service", "workflow", "automation", "platform"],
-            "TEAM": ["atlassian", "jira", "confluence", "collaboration", "devops"],
-            "PTON": ["peloton", "fitness", "exercise", "bike", "subscription"],
-            "ABNB": ["airbnb", "travel", "accommodation", "sharing economy", "tourism"],
-            "DASH": ["doordash", "food delivery", "restaurant", "logistics", "delivery"]
-        }
-        
-        return industry_mappings.get(ticker.upper(), [])
-
-    def _get_competitors(self, ticker: str) -> List[str]:
-        """Get competitor companies for a ticker"""
-        competitor_mappings = {
-            "AAPL": ["Samsung", "Google", "Microsoft", "Amazon"],
-            "MSFT": ["Google", "Amazon", "Oracle", "Salesforce"],
-            "GOOGL": ["Microsoft", "Amazon", "Apple", "Meta"],
-            "AMZN": ["Walmart", "Target", "eBay", "Shopify"],
-            "TSLA": ["Ford", "GM", "BMW", "Mercedes", "Toyota"],
-            "META": ["Google", "TikTok", "Snapchat", "Twitter"],
-            "NVDA": ["AMD", "Intel", "Qualcomm"],
-            "NFLX": ["Disney", "Hulu", "Amazon Prime", "HBO"],
-            "AMD": ["Intel", "NVIDIA", "Qualcomm"],
-            "INTC": ["AMD", "NVIDIA", "Qualcomm", "TSMC"],
-            "CRM": ["Microsoft", "Oracle", "Salesforce", "HubSpot"],
-            "ORCL": ["Microsoft", "Amazon", "Google", "IBM"],
-            "IBM": ["Microsoft", "Amazon", "Google", "Oracle"],
-            "CSCO": ["Juniper", "Arista", "HPE", "Fortinet"],
-            "ADBE": ["Microsoft", "Canva", "Figma", "Sketch"],
-            "PYPL": ["Square", "Stripe", "Apple Pay", "Google Pay"],
-            "UBER": ["Lyft", "DoorDash", "Grab", "Bolt"],
-            "LYFT": ["Uber", "DoorDash", "Grab", "Bolt"],
-            "SNAP": ["TikTok", "Instagram", "Facebook", "Twitter"],
-            "TWTR": ["Facebook", "LinkedIn", "TikTok", "Mastodon"],
-            "SQ": ["PayPal", "Stripe", "Square", "Block"],
-            "ROKU": ["Apple TV", "Fire TV", "Chromecast", "Smart TV"],
-            "ZM": ["Microsoft Teams", "Google Meet", "Skype", "Webex"],
-            "DOCU": ["Adobe", "PandaDoc", "HelloSign", "SignNow"],
-            "SNOW": ["Amazon Redshift", "Google BigQuery", "Databricks", "Teradata"],
-            "PLTR": ["Palantir", "Splunk", "Tableau", "Qlik"],
-            "COIN": ["Binance", "Kraken", "Gemini", "FTX"],
-            "HOOD": ["E*TRADE", "TD Ameritrade", "Fidelity", "Schwab"],
-            "SPOT": ["Apple Music", "Amazon Music", "YouTube Music", "Pandora"],
-            "PINS": ["Instagram", "TikTok", "Facebook", "Tumblr"],
-            "SHOP": ["WooCommerce", "BigCommerce", "Magento", "Squarespace"],
-            "OKTA": ["Microsoft", "Google", "Auth0", "Ping Identity"],
-            "CRWD": ["Symantec", "McAfee", "Palo Alto", "FireEye"],
-            "ZS": ["Palo Alto", "Fortinet", "Check Point", "Cisco"],
-            "NET": ["Cloudflare", "AWS", "Google Cloud", "Azure"],
-            "DDOG": ["New Relic", "AppDynamics", "Splunk", "DataDog"],
-            "MDB": ["PostgreSQL", "MySQL", "Redis", "Cassandra"],
-            "ESTC": ["Splunk", "Logstash", "Kibana", "ELK"],
-            "SPLK": ["Elastic", "Datadog", "New Relic", "Splunk"],
-            "WDAY": ["SAP", "Oracle", "Workday", "BambooHR"],
-            "NOW": ["ServiceNow", "Jira", "Cherwell", "BMC"],
-            "TEAM": ["Microsoft", "Slack", "Asana", "Monday.com"],
-            "PTON": ["Peloton", "Nike", "Apple Fitness", "Mirror"],
-            "ABNB": ["Booking.com", "Expedia", "VRBO", "TripAdvisor"],
-            "DASH": ["Uber Eats", "Grubhub", "Postmates", "DoorDash"]
-        }
-        
-        return competitor_mappings.get(ticker.upper(), [])
-
-    def _get_company_variations(self, ticker: str) -> List[str]:
-        """Get common variations of company names for a ticker"""
-        # Common ticker to company name mappings
-        ticker_mappings = {
-            "AAPL": ["Apple", "Apple Inc", "Apple Computer"],
-            "MSFT": ["Microsoft", "Microsoft Corporation"],
-            "GOOGL": ["Google", "Alphabet", "Google Inc"],
-            "GOOG": ["Google", "Alphabet", "Google Inc"],
-            "AMZN": ["Amazon", "Amazon.com", "Amazon Inc"],
-            "TSLA": ["Tesla", "Tesla Motors", "Tesla Inc"],
-            "META": ["Meta", "Facebook", "Meta Platforms"],
-            "NVDA": ["NVIDIA", "Nvidia Corporation"],
-            "NFLX": ["Netflix", "Netflix Inc"],
-            "AMD": ["Advanced Micro Devices", "AMD Inc"],
-            "INTC": ["Intel", "Intel Corporation"],
-            "CRM": ["Salesforce", "Salesforce.com"],
-            "ORCL": ["Oracle", "Oracle Corporation"],
-            "IBM": ["IBM", "International Business Machines"],
-            "CSCO": ["Cisco", "Cisco Systems"],
-            "ADBE": ["Adobe", "Adobe Inc", "Adobe Systems"],
-            "PYPL": ["PayPal", "PayPal Holdings"],
-            "UBER": ["Uber", "Uber Technologies"],
-            "LYFT": ["Lyft", "Lyft Inc"],
-            "SNAP": ["Snapchat", "Snap Inc"],
-            "TWTR": ["Twitter", "X Corp"],
-            "SQ": ["Square", "Block Inc"],
-            "ROKU": ["Roku", "Roku Inc"],
-            "ZM": ["Zoom", "Zoom Video Communications"],
-            "DOCU": ["DocuSign", "DocuSign Inc"],
-            "SNOW": ["Snowflake", "Snowflake Inc"],
-            "PLTR": ["Palantir", "Palantir Technologies"],
-            "COIN": ["Coinbase", "Coinbase Global"],
-            "HOOD": ["Robinhood", "Robinhood Markets"],
-            "SPOT": ["Spotify", "Spotify Technology"],
-            "PINS": ["Pinterest", "Pinterest Inc"],
-            "SHOP": ["Shopify", "Shopify Inc"],
-            "OKTA": ["Okta", "Okta Inc"],
-            "CRWD": ["CrowdStrike", "CrowdStrike Holdings"],
-            "ZS": ["Zscaler", "Zscaler Inc"],
-            "NET": ["Cloudflare", "Cloudflare Inc"],
-            "DDOG": ["Datadog", "Datadog Inc"],
-            "MDB": ["MongoDB", "MongoDB Inc"],
-            "ESTC": ["Elastic", "Elastic N.V."],
-            "SPLK": ["Splunk", "Splunk Inc"],
-            "WDAY": ["Workday", "Workday Inc"],
-            "NOW": ["ServiceNow", "ServiceNow Inc"],
-            "TEAM": ["Atlassian", "Atlassian Corporation"],
-            "ZM": ["Zoom", "Zoom Video Communications"],
-            "PTON": ["Peloton", "Peloton Interactive"],
-            "ABNB": ["Airbnb", "Airbnb Inc"],
-            "DASH": ["DoorDash", "DoorDash Inc"],
-            "UBER": ["Uber", "Uber Technologies"],
-            "LYFT": ["Lyft", "Lyft Inc"]
-        }
-        
-        return ticker_mappings.get(ticker.upper(), [ticker])
+            print(f"Sentiment error: {e}")
+            return [0.0] * len(texts)
 
-    def _get_sentiment(self, text: str) -> str:
-        """Determine sentiment using TextBlob"""
-        try:
-            blob = TextBlob(text)
-            polarity = blob.sentiment.polarity
-
-            if polarity > 0.1:
-                return "positive"
-            elif polarity < -0.1:
-                return "negative"
-            else:
-                return "neutral"
-        except:
-            return "neutral"
+    def _summarize(self, article: Dict) -> str:
+        if article["provider"] == "finnhub":
+            description = article["description"]
+            return description[:200] + "..." if len(description) > 200 else description
+        # NewsAPI descriptions: first 2 sentences
+        return self._generate_summary(article["description"] or article["title"])
 
     def _generate_summary(self, text: str) -> str:
         """Generate a brief summary (first 2-3 sentences)"""
@@ -406,7 +441,7 @@ class NewsService:
     def _generate_mock_news(self, ticker: str) -> List[Dict]:
         """Generate mock news data for demo purposes"""
         # Get company name for more realistic mock data
-        company_name = self._get_company_variations(ticker)[0] if self._get_company_variations(ticker) else ticker
+        company_name = COMPANY_VARIATIONS.get(ticker.upper(), [ticker])[0]
         
         return [
             {
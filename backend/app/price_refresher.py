@@ -0,0 +1,95 @@
+import asyncio
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Dict
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class PriceRefresher:
+    """
+    Brings the stored daily bars of the benchmark and every recently tracked
+    ticker up to date once a day, after the session has closed, so user
+    requests find fresh bars in the price store instead of downloading them.
+    Downloads go through the Alpha Vantage background lane, behind any
+    interactive request.
+
+    Runs at refresh_hour (UTC, default 22:00, after the 16:00 New York close
+    in both summer and winter) on trading sessions only. A ticker is tracked
+    while its news has been requested within tracked_days.
+    """
+
+    def __init__(self, event_analyzer, database, refresh_hour: int = None, tracked_days: float = None):
+        self.event_analyzer = event_analyzer
+        self.database = database
+        self.refresh_hour = int(os.getenv("PRICE_REFRESH_HOUR_UTC", "22")) if refresh_hour is None else refresh_hour
+        self.tracked_days = tracked_days or float(os.getenv("PRICE_REFRESH_TRACKED_DAYS", "7"))
+        self._task: asyncio.Task = None
+        self.runs = 0
+        self.last_run_at = None
+        self.last_run_seconds = None
+        self.last_tickers = 0
+
+    def next_run(self, now: datetime) -> datetime:
+        """First refresh_hour after now that falls on a trading session"""
+        run_at = now.replace(hour=self.refresh_hour, minute=0, second=0, microsecond=0)
+        if run_at <= now:
+            run_at += timedelta(days=1)
+        # Bounded, in case the calendar doesn't reach that far ahead
+        for _ in range(10):
+            if self.event_analyzer.calendar.is_session(run_at.date()):
+                break
+            run_at += timedelta(days=1)
+        return run_at
+
+    def start(self):
+        """Start refreshing on the running event loop"""
+        if self._task is None:
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def run(self):
+        while True:
+            now = _utcnow()
+            await asyncio.sleep((self.next_run(now) - now).total_seconds())
+            await self.refresh()
+
+    async def refresh(self):
+        """Refresh the benchmark and the tracked tickers now"""
+        start = _utcnow()
+        try:
+            since = start - timedelta(days=self.tracked_days)
+            tracked = await asyncio.to_thread(self.database.get_tracked_tickers, since)
+            benchmark = self.event_analyzer.benchmark
+            tickers = [benchmark] + sorted({ticker.upper() for ticker in tracked} - {benchmark})
+            print(f"Refreshing daily bars for {len(tickers)} tickers...")
+            # Can take minutes at the Alpha Vantage budget, so it stays off the request pools
+            await asyncio.to_thread(self.event_analyzer.refresh_prices, tickers)
+        except Exception as e:
+            print(f"Price refresh error: {e}")
+            return
+
+        self.runs += 1
+        self.last_run_at = start
+        self.last_run_seconds = round((_utcnow() - start).total_seconds(), 1)
+        self.last_tickers = len(tickers)
+
+    def status(self) -> Dict:
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "next_run_at": self.next_run(_utcnow()).isoformat() + "Z",
+            "runs": self.runs,
+            "last_run_at": self.last_run_at.isoformat() + "Z" if self.last_run_at else None,
+            "last_run_seconds": self.last_run_seconds,
+            "last_tickers": self.last_tickers,
+        }
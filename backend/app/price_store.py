@@ -0,0 +1,202 @@
+import json
+import os
+import threading
+from datetime import datetime
+from typing import Dict, NamedTuple, Optional
+
+import numpy as np
+import pandas as pd
+
+# Column layout of a daily bar series. Dates are stored as datetime64[D]
+# (int64 days since epoch) so they can be searched without conversion.
+COLUMNS = {
+    "dates": "datetime64[D]",
+    "open": "float64",
+    "high": "float64",
+    "low": "float64",
+    "close": "float64",
+    "volume": "float64",
+}
+
+FRAME_COLUMNS = {
+    "open": "Open",
+    "high": "High",
+    "low": "Low",
+    "close": "Close",
+    "volume": "Volume",
+}
+
+
+class PriceSeries(NamedTuple):
+    """Read-only, memory-mapped view of a ticker's daily bars"""
+    ticker: str
+    dates: np.ndarray
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+    updated_at: datetime
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    def to_frame(self) -> pd.DataFrame:
+        """Wrap the mapped columns in a DataFrame without copying them"""
+        frame = pd.DataFrame(
+            {name: getattr(self, column) for column, name in FRAME_COLUMNS.items()},
+            index=pd.DatetimeIndex(self.dates, copy=False),
+            copy=False,
+        )
+        return frame
+
+
+class PriceStore:
+    """
+    Persistent columnar store for daily OHLCV bars.
+
+    Each ticker gets a directory with one raw binary file per column plus a
+    small meta.json holding the row count, last refresh time and the
+    generation of the column files. Reads map the column files into memory,
+    so repeated reads are served from the page cache without parsing or
+    copying.
+
+    Mapped bytes are never changed: new bars are appended past the mapped
+    rows, and anything that rewrites stored rows writes a new generation of
+    column files and switches to it by replacing meta.json. Readers holding
+    an older generation keep a consistent view of it.
+    """
+
+    def __init__(self, root: str = None):
+        self.root = root or os.getenv("PRICE_STORE_DIR", "./data/prices")
+        self._lock = threading.RLock()
+        self._mapped: Dict[str, PriceSeries] = {}
+
+    def _ticker_dir(self, ticker: str) -> str:
+        return os.path.join(self.root, ticker.upper())
+
+    def _read_meta(self, ticker: str) -> Optional[Dict]:
+        meta_path = os.path.join(self._ticker_dir(ticker), "meta.json")
+        try:
+            with open(meta_path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _column_path(self, ticker: str, column: str, generation: int) -> str:
+        # Generation 0 keeps the original file names, so existing stores still read
+        name = f"{column}.bin" if generation == 0 else f"{column}.{generation}.bin"
+        return os.path.join(self._ticker_dir(ticker), name)
+
+    def _write_meta(self, ticker: str, rows: int, generation: int):
+        directory = self._ticker_dir(ticker)
+        tmp_path = os.path.join(directory, "meta.json.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump({"rows": rows, "updated_at": datetime.now().isoformat(), "generation": generation}, f)
+        os.replace(tmp_path, os.path.join(directory, "meta.json"))
+
+    def read(self, ticker: str) -> Optional[PriceSeries]:
+        """Return the stored series for a ticker, or None if nothing is stored"""
+        ticker = ticker.upper()
+        meta = self._read_meta(ticker)
+        if not meta or meta["rows"] == 0:
+            return None
+
+        updated_at = datetime.fromisoformat(meta["updated_at"])
+        mapped = self._mapped.get(ticker)
+        if mapped is not None and len(mapped) == meta["rows"] and mapped.updated_at == updated_at:
+            return mapped
+
+        generation = meta.get("generation", 0)
+        columns = {
+            column: np.memmap(self._column_path(ticker, column, generation), dtype=dtype, mode="r",
+                              shape=(meta["rows"],))
+            for column, dtype in COLUMNS.items()
+        }
+        series = PriceSeries(ticker=ticker, updated_at=updated_at, **columns)
+        self._mapped[ticker] = series
+        return series
+
+    def _frame_to_columns(self, frame: pd.DataFrame) -> Dict[str, np.ndarray]:
+        frame = frame.sort_index()
+        arrays = {"dates": frame.index.values.astype("datetime64[D]")}
+        for column, name in FRAME_COLUMNS.items():
+            arrays[column] = frame[name].to_numpy(dtype="float64")
+        return arrays
+
+    def _write_generation(self, ticker: str, arrays: Dict[str, np.ndarray], meta: Optional[Dict]):
+        """Write arrays as the next generation of column files, switch to it and drop the old one"""
+        directory = self._ticker_dir(ticker)
+        os.makedirs(directory, exist_ok=True)
+        old_generation = meta.get("generation", 0) if meta else None
+        generation = 0 if old_generation is None else old_generation + 1
+
+        for column, dtype in COLUMNS.items():
+            path = self._column_path(ticker, column, generation)
+            np.ascontiguousarray(arrays[column], dtype=dtype).tofile(path + ".tmp")
+            os.replace(path + ".tmp", path)
+        self._write_meta(ticker, len(arrays["dates"]), generation)
+
+        if old_generation is not None and old_generation != generation:
+            for column in COLUMNS:
+                try:
+                    # Readers still mapping it keep their pages until they let go (POSIX);
+                    # where the OS refuses, the file is left behind
+                    os.remove(self._column_path(ticker, column, old_generation))
+                except OSError:
+                    pass
+
+    def write(self, ticker: str, frame: pd.DataFrame):
+        """Replace the stored series for a ticker with the bars in frame"""
+        ticker = ticker.upper()
+        with self._lock:
+            self._mapped.pop(ticker, None)
+            self._write_generation(ticker, self._frame_to_columns(frame), self._read_meta(ticker))
+
+    def append(self, ticker: str, frame: pd.DataFrame) -> int:
+        """
+        Add the bars in frame that are newer than the last stored date. If
+        frame also has a bar for the last stored date (which may have been
+        stored mid-session), the series is rewritten as a new generation with
+        that bar replaced; otherwise the new bars are appended in place.
+        Either way, already mapped series don't change. Returns the number of
+        rows added.
+        """
+        ticker = ticker.upper()
+        with self._lock:
+            meta = self._read_meta(ticker)
+            if not meta or meta["rows"] == 0:
+                self.write(ticker, frame)
+                return len(frame)
+
+            rows = meta["rows"]
+            generation = meta.get("generation", 0)
+            last_date = np.fromfile(
+                self._column_path(ticker, "dates", generation), dtype=COLUMNS["dates"], count=1, offset=(rows - 1) * 8
+            )[0]
+
+            arrays = self._frame_to_columns(frame)
+            new_rows = arrays["dates"] > last_date
+            appended = int(new_rows.sum())
+
+            if (arrays["dates"] == last_date).any():
+                # Rows up to the last one are kept; frame supplies the last one onwards
+                stored = self.read(ticker)
+                tail = arrays["dates"] >= last_date
+                self._write_generation(ticker, {
+                    column: np.concatenate((np.asarray(getattr(stored, column))[:rows - 1], arrays[column][tail]))
+                    for column in COLUMNS
+                }, meta)
+                return appended
+
+            if appended:
+                for column, dtype in COLUMNS.items():
+                    with open(self._column_path(ticker, column, generation), "r+b") as f:
+                        # Drop any partial tail left behind by an interrupted append (past every mapped row)
+                        f.truncate(rows * np.dtype(dtype).itemsize)
+                        f.seek(0, os.SEEK_END)
+                        np.ascontiguousarray(arrays[column][new_rows], dtype=dtype).tofile(f)
+
+            # Always bump updated_at so a refresh with no new bars isn't retried
+            self._write_meta(ticker, rows + appended, generation)
+            return appended
@@ -0,0 +1,148 @@
+import heapq
+import itertools
+import threading
+import time
+from typing import Dict, List, Optional
+
+# Priority lanes - lower values are served first
+INTERACTIVE = 0
+BACKGROUND = 1
+
+LANE_NAMES = {INTERACTIVE: "interactive", BACKGROUND: "background"}
+
+
+class Ticket:
+    """A queued request for one token; position and expected_wait update while it waits"""
+
+    def __init__(self, scheduler: "TokenBucketScheduler", lane: int, seq: int):
+        self.scheduler = scheduler
+        self.lane = lane
+        self.seq = seq
+        self.enqueued_at = time.monotonic()
+
+    def __lt__(self, other: "Ticket") -> bool:
+        return (self.lane, self.seq) < (other.lane, other.seq)
+
+    @property
+    def position(self) -> int:
+        """0 means next in line"""
+        return self.scheduler.position(self)
+
+    @property
+    def expected_wait(self) -> float:
+        """Seconds until this ticket is expected to get its token"""
+        return self.scheduler.expected_wait(self)
+
+
+class TokenBucketScheduler:
+    """
+    Token bucket shared by every caller of a rate-limited API. Requests queue
+    in priority lanes (interactive before background, FIFO within a lane) and
+    block until a token is available instead of failing when the budget is
+    spent. Callers enqueue() a ticket, can report its position and expected
+    wait, then wait() on it from a thread.
+    """
+
+    def __init__(self, rate_per_minute: float, burst: int = None):
+        self.rate = rate_per_minute / 60.0  # tokens per second
+        self.capacity = float(burst or max(1, int(rate_per_minute)))
+        self.tokens = self.capacity
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._queue: List[Ticket] = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self.granted = 0
+        self.throttle_events = 0
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def enqueue(self, lane: int = INTERACTIVE) -> Ticket:
+        """Join the queue; pass the ticket to wait() to block until it is served"""
+        with self._cond:
+            ticket = Ticket(self, lane, next(self._seq))
+            heapq.heappush(self._queue, ticket)
+            return ticket
+
+    def wait(self, ticket: Ticket, timeout: float = None) -> float:
+        """Block until the ticket gets a token. Returns the seconds spent waiting."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while True:
+                self._refill()
+                now = time.monotonic()
+                if self._queue and self._queue[0] is ticket and self.tokens >= 1 and now >= self._blocked_until:
+                    heapq.heappop(self._queue)
+                    self.tokens -= 1
+                    self.granted += 1
+                    self._cond.notify_all()
+                    return now - ticket.enqueued_at
+
+                sleep_for = self._seconds_until_token(now)
+                if deadline is not None:
+                    if now >= deadline:
+                        self.cancel(ticket)
+                        raise TimeoutError(f"Rate limit queue wait exceeded {timeout:g}s")
+                    sleep_for = min(sleep_for, deadline - now)
+                self._cond.wait(timeout=max(sleep_for, 0.01))
+
+    def cancel(self, ticket: Ticket):
+        """Leave the queue without taking a token"""
+        with self._cond:
+            if ticket in self._queue:
+                self._queue.remove(ticket)
+                heapq.heapify(self._queue)
+                self._cond.notify_all()
+
+    def throttled(self, retry_after: float = 60.0):
+        """The API reported its limit was hit anyway - drain the bucket and back off"""
+        with self._cond:
+            self.tokens = 0.0
+            self._updated = time.monotonic()
+            self._blocked_until = max(self._blocked_until, self._updated + retry_after)
+            self.throttle_events += 1
+            self._cond.notify_all()
+
+    def _seconds_until_token(self, now: float) -> float:
+        deficit = max(0.0, 1.0 - self.tokens)
+        return max(deficit / self.rate, self._blocked_until - now)
+
+    def position(self, ticket: Ticket) -> int:
+        with self._cond:
+            return sum(1 for other in self._queue if other < ticket)
+
+    def expected_wait(self, ticket: Ticket) -> float:
+        with self._cond:
+            self._refill()
+            ahead = sum(1 for other in self._queue if other < ticket)
+            return self._wait_for_position(ahead)
+
+    def estimate_wait(self, lane: int = INTERACTIVE) -> float:
+        """Expected wait for a request joining the given lane now"""
+        with self._cond:
+            self._refill()
+            ahead = sum(1 for other in self._queue if other.lane <= lane)
+            return self._wait_for_position(ahead)
+
+    def _wait_for_position(self, ahead: int) -> float:
+        now = time.monotonic()
+        deficit = max(0.0, ahead + 1 - self.tokens)
+        return round(max(deficit / self.rate, self._blocked_until - now, 0.0), 1)
+
+    def status(self) -> Dict[str, Optional[float]]:
+        with self._cond:
+            self._refill()
+            queued = {name: 0 for name in LANE_NAMES.values()}
+            for ticket in self._queue:
+                queued[LANE_NAMES[ticket.lane]] += 1
+        return {
+            "rate_per_minute": round(self.rate * 60, 2),
+            "tokens": round(self.tokens, 2),
+            "queued": queued,
+            "expected_wait": {name: self.estimate_wait(lane) for lane, name in LANE_NAMES.items()},
+            "granted": self.granted,
+            "throttle_events": self.throttle_events,
+        }
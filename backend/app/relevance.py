@@ -0,0 +1,313 @@
+import re
+from typing import Dict, FrozenSet, Iterable, List
+
+# Relevance score weights and the minimum score for an article to count
+TICKER_WEIGHT = 10
+COMPANY_WEIGHT = 8
+KEYWORD_WEIGHT = 2
+KEYWORD_CAP = 6
+INDUSTRY_WEIGHT = 3
+COMPETITOR_WEIGHT = 2
+RELEVANCE_THRESHOLD = 5
+
+# Financial keywords that indicate stock-specific content
+STOCK_KEYWORDS = [
+    "earnings", "revenue", "profit", "loss", "stock", "shares",
+    "dividend", "ipo", "merger", "acquisition", "partnership",
+    "quarterly", "annual", "guidance", "forecast", "analyst",
+    "price target", "upgrade", "downgrade", "rating", "trading",
+    "market cap", "valuation", "investor", "shareholder"
+]
+
+# Common ticker to company name mappings
+COMPANY_VARIATIONS = {
+    "AAPL": ["Apple", "Apple Inc", "Apple Computer"],
+    "MSFT": ["Microsoft", "Microsoft Corporation"],
+    "GOOGL": ["Google", "Alphabet", "Google Inc"],
+    "GOOG": ["Google", "Alphabet", "Google Inc"],
+    "AMZN": ["Amazon", "Amazon.com", "Amazon Inc"],
+    "TSLA": ["Tesla", "Tesla Motors", "Tesla Inc"],
+    "META": ["Meta", "Facebook", "Meta Platforms"],
+    "NVDA": ["NVIDIA", "Nvidia Corporation"],
+    "NFLX": ["Netflix", "Netflix Inc"],
+    "AMD": ["Advanced Micro Devices", "AMD Inc"],
+    "INTC": ["Intel", "Intel Corporation"],
+    "CRM": ["Salesforce", "Salesforce.com"],
+    "ORCL": ["Oracle", "Oracle Corporation"],
+    "IBM": ["IBM", "International Business Machines"],
+    "CSCO": ["Cisco", "Cisco Systems"],
+    "ADBE": ["Adobe", "Adobe Inc", "Adobe Systems"],
+    "PYPL": ["PayPal", "PayPal Holdings"],
+    "UBER": ["Uber", "Uber Technologies"],
+    "LYFT": ["Lyft", "Lyft Inc"],
+    "SNAP": ["Snapchat", "Snap Inc"],
+    "TWTR": ["Twitter", "X Corp"],
+    "SQ": ["Square", "Block Inc"],
+    "ROKU": ["Roku", "Roku Inc"],
+    "ZM": ["Zoom", "Zoom Video Communications"],
+    "DOCU": ["DocuSign", "DocuSign Inc"],
+    "SNOW": ["Snowflake", "Snowflake Inc"],
+    "PLTR": ["Palantir", "Palantir Technologies"],
+    "COIN": ["Coinbase", "Coinbase Global"],
+    "HOOD": ["Robinhood", "Robinhood Markets"],
+    "SPOT": ["Spotify", "Spotify Technology"],
+    "PINS": ["Pinterest", "Pinterest Inc"],
+    "SHOP": ["Shopify", "Shopify Inc"],
+    "OKTA": ["Okta", "Okta Inc"],
+    "CRWD": ["CrowdStrike", "CrowdStrike Holdings"],
+    "ZS": ["Zscaler", "Zscaler Inc"],
+    "NET": ["Cloudflare", "Cloudflare Inc"],
+    "DDOG": ["Datadog", "Datadog Inc"],
+    "MDB": ["MongoDB", "MongoDB Inc"],
+    "ESTC": ["Elastic", "Elastic N.V."],
+    "SPLK": ["Splunk", "Splunk Inc"],
+    "WDAY": ["Workday", "Workday Inc"],
+    "NOW": ["ServiceNow", "ServiceNow Inc"],
+    "TEAM": ["Atlassian", "Atlassian Corporation"],
+    "PTON": ["Peloton", "Peloton Interactive"],
+    "ABNB": ["Airbnb", "Airbnb Inc"],
+    "DASH": ["DoorDash", "DoorDash Inc"]
+}
+
+# Industry-specific terms per ticker
+INDUSTRY_TERMS = {
+    "AAPL": ["smartphone", "iphone", "ipad", "mac", "ios", "app store", "services"],
+    "MSFT": ["software", "cloud", "azure", "office", "windows", "enterprise"],
+    "GOOGL": ["search", "advertising", "youtube", "android", "cloud", "ai"],
+    "AMZN": ["e-commerce", "aws", "retail", "logistics", "prime", "marketplace"],
+    "TSLA": ["electric vehicle", "ev", "autonomous", "battery", "solar", "energy"],
+    "META": ["social media", "facebook", "instagram", "whatsapp", "vr", "metaverse"],
+    "NVDA": ["gpu", "ai", "gaming", "data center", "cuda", "machine learning"],
+    "NFLX": ["streaming", "entertainment", "content", "subscription", "movies"],
+    "AMD": ["processor", "cpu", "gpu", "semiconductor", "gaming", "data center"],
+    "INTC": ["processor", "cpu", "semiconductor", "manufacturing", "foundry"],
+    "CRM": ["crm", "sales", "customer", "enterprise", "saas", "cloud"],
+    "ORCL": ["database", "enterprise", "cloud", "software", "erp"],
+    "IBM": ["enterprise", "cloud", "ai", "consulting", "mainframe", "watson"],
+    "CSCO": ["networking", "infrastructure", "security", "routing", "switching"],
+    "ADBE": ["creative", "design", "photoshop", "pdf", "document", "marketing"],
+    "PYPL": ["payment", "fintech", "digital wallet", "venmo", "online payment"],
+    "UBER": ["ride-sharing", "transportation", "mobility", "delivery", "logistics"],
+    "LYFT": ["ride-sharing", "transportation", "mobility", "sharing economy"],
+    "SNAP": ["social media", "snapchat", "camera", "messaging", "ar"],
+    "TWTR": ["twitter", "social media", "microblogging", "news", "x"],
+    "SQ": ["payment", "fintech", "point of sale", "pos", "block"],
+    "ROKU": ["streaming", "tv", "entertainment", "device", "platform"],
+    "ZM": ["video conferencing", "remote work", "communication", "meeting"],
+    "DOCU": ["document", "signature", "agreement", "workflow", "digital"],
+    "SNOW": ["data warehouse", "analytics", "cloud", "database", "snowflake"],
+    "PLTR": ["data analytics", "government", "defense", "intelligence", "palantir"],
+    "COIN": ["cryptocurrency", "bitcoin", "crypto", "trading", "exchange"],
+    "HOOD": ["trading", "brokerage", "commission", "retail investor", "robinhood"],
+    "SPOT": ["music", "streaming", "podcast", "entertainment", "subscription"],
+    "PINS": ["pinterest", "visual", "shopping", "inspiration", "social"],
+    "SHOP": ["e-commerce", "online store", "retail", "merchant", "shopify"],
+    "OKTA": ["identity", "authentication", "security", "sso", "cybersecurity"],
+    "CRWD": ["cybersecurity", "endpoint", "security", "threat", "crowdstrike"],
+    "ZS": ["cybersecurity", "zero trust", "security", "zscaler", "cloud"],
+    "NET": ["cloudflare", "cdn", "security", "performance", "infrastructure"],
+    "DDOG": ["monitoring", "observability", "devops", "apm", "datadog"],
+    "MDB": ["database", "nosql", "document", "mongodb", "developer"],
+    "ESTC": ["search", "elasticsearch", "analytics", "logging", "elastic"],
+    "SPLK": ["splunk", "log analysis", "security", "monitoring", "data"],
+    "WDAY": ["hr", "workday", "human resources", "payroll", "hcm"],
+    "NOW": ["servicenow", "it service", "workflow", "automation", "platform"],
+    "TEAM": ["atlassian", "jira", "confluence", "collaboration", "devops"],
+    "PTON": ["peloton", "fitness", "exercise", "bike", "subscription"],
+    "ABNB": ["airbnb", "travel", "accommodation", "sharing economy", "tourism"],
+    "DASH": ["doordash", "food delivery", "restaurant", "logistics", "delivery"]
+}
+
+# Competitor companies per ticker
+COMPETITORS = {
+    "AAPL": ["Samsung", "Google", "Microsoft", "Amazon"],
+    "MSFT": ["Google", "Amazon", "Oracle", "Salesforce"],
+    "GOOGL": ["Microsoft", "Amazon", "Apple", "Meta"],
+    "AMZN": ["Walmart", "Target", "eBay", "Shopify"],
+    "TSLA": ["Ford", "GM", "BMW", "Mercedes", "Toyota"],
+    "META": ["Google", "TikTok", "Snapchat", "Twitter"],
+    "NVDA": ["AMD", "Intel", "Qualcomm"],
+    "NFLX": ["Disney", "Hulu", "Amazon Prime", "HBO"],
+    "AMD": ["Intel", "NVIDIA", "Qualcomm"],
+    "INTC": ["AMD", "NVIDIA", "Qualcomm", "TSMC"],
+    "CRM": ["Microsoft", "Oracle", "Salesforce", "HubSpot"],
+    "ORCL": ["Microsoft", "Amazon", "Google", "IBM"],
+    "IBM": ["Microsoft", "Amazon", "Google", "Oracle"],
+    "CSCO": ["Juniper", "Arista", "HPE", "Fortinet"],
+    "ADBE": ["Microsoft", "Canva", "Figma", "Sketch"],
+    "PYPL": ["Square", "Stripe", "Apple Pay", "Google Pay"],
+    "UBER": ["Lyft", "DoorDash", "Grab", "Bolt"],
+    "LYFT": ["Uber", "DoorDash", "Grab", "Bolt"],
+    "SNAP": ["TikTok", "Instagram", "Facebook", "Twitter"],
+    "TWTR": ["Facebook", "LinkedIn", "TikTok", "Mastodon"],
+    "SQ": ["PayPal", "Stripe", "Square", "Block"],
+    "ROKU": ["Apple TV", "Fire TV", "Chromecast", "Smart TV"],
+    "ZM": ["Microsoft Teams", "Google Meet", "Skype", "Webex"],
+    "DOCU": ["Adobe", "PandaDoc", "HelloSign", "SignNow"],
+    "SNOW": ["Amazon Redshift", "Google BigQuery", "Databricks", "Teradata"],
+    "PLTR": ["Palantir", "Splunk", "Tableau", "Qlik"],
+    "COIN": ["Binance", "Kraken", "Gemini", "FTX"],
+    "HOOD": ["E*TRADE", "TD Ameritrade", "Fidelity", "Schwab"],
+    "SPOT": ["Apple Music", "Amazon Music", "YouTube Music", "Pandora"],
+    "PINS": ["Instagram", "TikTok", "Facebook", "Tumblr"],
+    "SHOP": ["WooCommerce", "BigCommerce", "Magento", "Squarespace"],
+    "OKTA": ["Microsoft", "Google", "Auth0", "Ping Identity"],
+    "CRWD": ["Symantec", "McAfee", "Palo Alto", "FireEye"],
+    "ZS": ["Palo Alto", "Fortinet", "Check Point", "Cisco"],
+    "NET": ["Cloudflare", "AWS", "Google Cloud", "Azure"],
+    "DDOG": ["New Relic", "AppDynamics", "Splunk", "DataDog"],
+    "MDB": ["PostgreSQL", "MySQL", "Redis", "Cassandra"],
+    "ESTC": ["Splunk", "Logstash", "Kibana", "ELK"],
+    "SPLK": ["Elastic", "Datadog", "New Relic", "Splunk"],
+    "WDAY": ["SAP", "Oracle", "Workday", "BambooHR"],
+    "NOW": ["ServiceNow", "Jira", "Cherwell", "BMC"],
+    "TEAM": ["Microsoft", "Slack", "Asana", "Monday.com"],
+    "PTON": ["Peloton", "Nike", "Apple Fitness", "Mirror"],
+    "ABNB": ["Booking.com", "Expedia", "VRBO", "TripAdvisor"],
+    "DASH": ["Uber Eats", "Grubhub", "Postmates", "DoorDash"]
+}
+
+
+# Symbols written as a whole upper-case word ("TSLA", "BRK.B"), and cashtags / exchange
+# tags, the only places a one-letter symbol ("F") is taken as a mention
+_SYMBOL = re.compile(r"(?<![A-Za-z0-9$])([A-Z]{2,5}(?:\.[A-Z])?)(?![A-Za-z0-9])")
+_TAGGED_SYMBOL = re.compile(r"(?:\$|\(|(?:NYSE|NASDAQ|Nasdaq|AMEX):\s?)([A-Z]{1,5}(?:\.[A-Z])?)(?![A-Za-z0-9])")
+
+
+def symbols_in(text: str) -> FrozenSet[str]:
+    """Ticker-like symbols the text names on word boundaries (case-sensitive)"""
+    return frozenset(_SYMBOL.findall(text)) | frozenset(_TAGGED_SYMBOL.findall(text))
+
+
+def _trie_pattern(words: Iterable[str]) -> str:
+    """
+    Regex for a set of literals, shaped like their trie so matching follows
+    one path through the text instead of trying every word. Optional
+    branches are greedy, so the match is the longest word at that position.
+    """
+    trie: Dict = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node: Dict) -> str:
+        terminal = "" in node
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if terminal:
+            return "(?:" + body + ")?"
+        return body
+
+    return build(trie)
+
+
+class RelevanceEngine:
+    """
+    Scores how relevant an article is to a ticker. Every ticker symbol,
+    company name, keyword, industry term and competitor is compiled once into
+    a single trie-shaped regex. One scan of an article finds all of them, and
+    scoring against a ticker is a few set lookups. The cost per article
+    depends on the text length, not on how many terms are configured.
+
+    Matching keeps the plain substring semantics of `term in text`. The scan
+    finds the longest term starting at every position. Every shorter term
+    that also starts there is a prefix of it, so each term carries its
+    precomputed set of prefix terms.
+    """
+
+    def __init__(self, company_variations: Dict[str, List[str]] = None,
+                 industry_terms: Dict[str, List[str]] = None,
+                 competitors: Dict[str, List[str]] = None,
+                 keywords: List[str] = None):
+        company_variations = COMPANY_VARIATIONS if company_variations is None else company_variations
+        industry_terms = INDUSTRY_TERMS if industry_terms is None else industry_terms
+        competitors = COMPETITORS if competitors is None else competitors
+
+        self.keywords = frozenset(word.lower() for word in (STOCK_KEYWORDS if keywords is None else keywords))
+        self.variations = {t: frozenset(v.lower() for v in words) for t, words in company_variations.items()}
+        self.industry_terms = {t: frozenset(v.lower() for v in words) for t, words in industry_terms.items()}
+        self.competitors = {t: frozenset(v.lower() for v in words) for t, words in competitors.items()}
+
+        symbols = set(self.variations) | set(self.industry_terms) | set(self.competitors)
+        terms = set(self.keywords) | {symbol.lower() for symbol in symbols}
+        for mapping in (self.variations, self.industry_terms, self.competitors):
+            for words in mapping.values():
+                terms |= words
+        self.terms = frozenset(term for term in terms if term)
+
+        # Every term's prefixes that are terms themselves (including the term)
+        self._prefixes = {
+            term: frozenset(term[:i] for i in range(1, len(term) + 1) if term[:i] in self.terms)
+            for term in self.terms
+        }
+        self._pattern = re.compile("(?=(" + _trie_pattern(self.terms) + "))")
+
+    def matches(self, text: str) -> FrozenSet[str]:
+        """Every configured term that occurs in the text (case-insensitive substrings)"""
+        found = set()
+        for match in self._pattern.finditer(text.lower()):
+            term = match.group(1)
+            if term:
+                found |= self._prefixes[term]
+        return frozenset(found)
+
+    def score(self, ticker: str, text: str = None, matches: FrozenSet[str] = None) -> int:
+        """
+        Relevance score of a text for a ticker. Pass the result of matches()
+        to score one article against several tickers without rescanning it.
+        """
+        if matches is None:
+            matches = self.matches(text)
+        ticker = ticker.upper()
+        ticker_lower = ticker.lower()
+        score = 0
+
+        # Direct ticker mention (highest priority); symbols outside the tables need their own scan
+        if ticker_lower in self.terms:
+            mentioned = ticker_lower in matches
+        else:
+            mentioned = text is not None and ticker_lower in text.lower()
+        if mentioned:
+            score += TICKER_WEIGHT
+
+        # Company name variations (only counted once); unknown tickers fall back to the symbol
+        variations = self.variations.get(ticker)
+        if variations is None:
+            if mentioned:
+                score += COMPANY_WEIGHT
+        elif not variations.isdisjoint(matches):
+            score += COMPANY_WEIGHT
+
+        score += min(len(self.keywords & matches) * KEYWORD_WEIGHT, KEYWORD_CAP)
+
+        if not self.industry_terms.get(ticker, frozenset()).isdisjoint(matches):
+            score += INDUSTRY_WEIGHT
+        if not self.competitors.get(ticker, frozenset()).isdisjoint(matches):
+            score += COMPETITOR_WEIGHT
+        return score
+
+    def mentions(self, ticker: str, text: str, matches: FrozenSet[str] = None,
+                 symbols: FrozenSet[str] = None) -> bool:
+        """
+        Whether the text names the ticker itself: its symbol as a whole word
+        (see symbols_in), or one of its company-name variations. Keywords,
+        industry terms and competitors alone don't count.
+        """
+        ticker = ticker.upper()
+        if symbols is None:
+            symbols = symbols_in(text)
+        if ticker in symbols:
+            return True
+        variations = self.variations.get(ticker)
+        if not variations:
+            return False
+        if matches is None:
+            matches = self.matches(text)
+        return not variations.isdisjoint(matches)
+
+    def is_relevant(self, ticker: str, text: str = None, matches: FrozenSet[str] = None) -> bool:
+        return self.score(ticker, text, matches) >= RELEVANCE_THRESHOLD
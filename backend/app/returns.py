@@ -0,0 +1,37 @@
+import numpy as np
+from datetime import datetime
+from typing import NamedTuple
+
+from app.price_store import PriceSeries
+
+
+class ReturnSeries(NamedTuple):
+    """Daily close-to-close returns keyed by trading day"""
+    dates: np.ndarray
+    returns: np.ndarray
+    updated_at: datetime
+
+
+def daily_returns(series: PriceSeries) -> ReturnSeries:
+    """Close-to-close returns of a stored price series (the first day has none)"""
+    closes = series.close
+    returns = closes[1:] / closes[:-1] - 1.0
+    return ReturnSeries(np.asarray(series.dates[1:]), returns, series.updated_at)
+
+
+def align_to(series: ReturnSeries, dates: np.ndarray) -> np.ndarray:
+    """
+    Place a return series on another sorted trading-day axis using integer
+    offsets. Days the series has no return for are NaN.
+    """
+    aligned = np.full(len(dates), np.nan)
+    if len(dates) == 0 or len(series.dates) == 0:
+        return aligned
+
+    positions = np.searchsorted(dates, series.dates)
+    in_range = positions < len(dates)
+    matched = np.zeros(len(positions), dtype=bool)
+    matched[in_range] = dates[positions[in_range]] == series.dates[in_range]
+
+    aligned[positions[matched]] = series.returns[matched]
+    return aligned
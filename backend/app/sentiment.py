@@ -0,0 +1,232 @@
+import os
+import re
+import sys
+import time
+from typing import Dict, List, Sequence
+from xml.etree import ElementTree
+
+import numpy as np
+
+# Polarity cutoffs for the positive / neutral / negative labels
+POSITIVE_THRESHOLD = 0.1
+NEGATIVE_THRESHOLD = -0.1
+
+NEGATIONS = ("no", "not", "never")
+
+# Finance terms that TextBlob's general-purpose lexicon misses or misreads
+FINANCE_POLARITY = {
+    "beat": 0.4, "beats": 0.4, "tops": 0.3, "outperform": 0.5, "outperforms": 0.5,
+    "surge": 0.5, "surges": 0.5, "surged": 0.5, "soar": 0.6, "soars": 0.6, "soared": 0.6,
+    "rally": 0.4, "rallies": 0.4, "rallied": 0.4, "jump": 0.3, "jumps": 0.3, "jumped": 0.3,
+    "gain": 0.3, "gains": 0.3, "gained": 0.3, "rise": 0.2, "rises": 0.2, "rose": 0.2,
+    "upgrade": 0.5, "upgrades": 0.5, "upgraded": 0.5, "bullish": 0.6,
+    "profit": 0.3, "profits": 0.3, "profitable": 0.5, "record": 0.3, "growth": 0.3,
+    "miss": -0.4, "misses": -0.4, "missed": -0.4, "underperform": -0.5, "underperforms": -0.5,
+    "plunge": -0.6, "plunges": -0.6, "plunged": -0.6, "tumble": -0.5, "tumbles": -0.5, "tumbled": -0.5,
+    "slump": -0.5, "slumps": -0.5, "slumped": -0.5, "sink": -0.4, "sinks": -0.4, "sank": -0.4,
+    "drop": -0.3, "drops": -0.3, "dropped": -0.3, "fall": -0.3, "falls": -0.3, "fell": -0.3,
+    "decline": -0.3, "declines": -0.3, "declined": -0.3, "selloff": -0.5, "sell-off": -0.5,
+    "downgrade": -0.5, "downgrades": -0.5, "downgraded": -0.5, "bearish": -0.6,
+    "loss": -0.4, "losses": -0.4, "layoffs": -0.5, "lawsuit": -0.4, "probe": -0.3,
+    "recall": -0.4, "warns": -0.4, "bankruptcy": -0.8, "default": -0.5,
+}
+
+# Words (with contractions and hyphens kept whole, as TextBlob does) and exclamation marks
+TOKEN = re.compile(r"[a-z]+(?:['’-][a-z]+)*|!")
+
+
+def textblob_lexicon_path() -> str:
+    """The en-sentiment.xml lexicon bundled with TextBlob"""
+    import textblob
+    return os.path.join(os.path.dirname(textblob.__file__), "en", "en-sentiment.xml")
+
+
+def label_for(polarity: float) -> str:
+    if polarity > POSITIVE_THRESHOLD:
+        return "positive"
+    elif polarity < NEGATIVE_THRESHOLD:
+        return "negative"
+    return "neutral"
+
+
+class BatchSentiment:
+    """
+    Lexicon sentiment for many texts at once, following TextBlob's pattern
+    analyzer: polarity is the mean over known words, a preceding adverb
+    scales the next word ("very good"), a negation flips and halves it
+    ("not good"), and "!" boosts the word before it.
+
+    The lexicon is compiled once into id-indexed arrays. A batch is tokenized
+    into one flat id array, and the modifier, negation and averaging rules
+    are shifted-array operations over that whole array, not per-word Python
+    state. finance_overrides replaces or adds polarities for market terms.
+    """
+
+    def __init__(self, lexicon_path: str = None, finance_overrides: Dict[str, float] = None):
+        senses: Dict[str, Dict[str, List]] = {}
+        root = ElementTree.parse(lexicon_path or textblob_lexicon_path()).getroot()
+        for word in root.findall("word"):
+            form = word.attrib.get("form")
+            if not form:
+                continue
+            senses.setdefault(form, {}).setdefault(word.attrib.get("pos"), []).append((
+                float(word.attrib.get("polarity", 0.0)),
+                float(word.attrib.get("intensity", 1.0)),
+            ))
+
+        vocabulary = {}
+        polarity, intensity, modifier = [], [], []
+        for form, by_pos in senses.items():
+            # Average senses per part of speech, then across parts of speech (TextBlob's untagged score)
+            per_pos = [np.mean(values, axis=0) for values in by_pos.values()]
+            word_polarity, word_intensity = np.mean(per_pos, axis=0)
+            vocabulary[form] = len(polarity)
+            polarity.append(word_polarity)
+            intensity.append(word_intensity)
+            modifier.append("RB" in by_pos)
+
+        overrides = FINANCE_POLARITY if finance_overrides is None else finance_overrides
+        for form, word_polarity in overrides.items():
+            if form in vocabulary:
+                polarity[vocabulary[form]] = word_polarity
+            else:
+                vocabulary[form] = len(polarity)
+                polarity.append(word_polarity)
+                intensity.append(1.0)
+                modifier.append(False)
+
+        known = len(polarity)
+        # Tokens that matter without being scored themselves
+        for form in NEGATIONS + ("!",):
+            vocabulary.setdefault(form, len(vocabulary))
+
+        self.vocabulary = vocabulary
+        size = len(vocabulary)
+        self._known = np.arange(size) < known
+        self._polarity = np.zeros(size)
+        self._polarity[:known] = polarity
+        self._intensity = np.ones(size)
+        self._intensity[:known] = intensity
+        self._modifier = np.zeros(size, dtype=bool)
+        self._modifier[:known] = modifier
+        self._negation = np.zeros(size, dtype=bool)
+        self._negation[[vocabulary[form] for form in NEGATIONS]] = True
+        self._exclamation = vocabulary["!"]
+
+    def polarities(self, texts: Sequence[str]) -> np.ndarray:
+        """Polarity in [-1, 1] for every text"""
+        lookup = self.vocabulary.get
+        ids, lengths, docs = [], [], []
+        for doc, text in enumerate(texts):
+            tokens = TOKEN.findall(text.lower())
+            ids.extend([lookup(token, -1) for token in tokens])
+            lengths.extend([len(token) for token in tokens])
+            docs.extend([doc] * len(tokens))
+
+        result = np.zeros(len(texts))
+        if not ids:
+            return result
+
+        ids = np.asarray(ids)
+        lengths = np.asarray(lengths)
+        docs = np.asarray(docs)
+        positions = np.arange(len(ids))
+        in_vocab = ids >= 0
+        ids = np.where(in_vocab, ids, 0)
+        known = in_vocab & self._known[ids]
+        negation = in_vocab & self._negation[ids]
+        modifier = known & self._modifier[ids]
+        exclamation = in_vocab & (ids == self._exclamation)
+        polarity = np.where(known, self._polarity[ids], 0.0)
+        intensity = self._intensity[ids]
+
+        def previous(keep: np.ndarray) -> np.ndarray:
+            """Index of the nearest earlier token in the same text with keep set (-1 if none)"""
+            last = np.maximum.accumulate(np.where(keep, positions, -1))
+            before = np.concatenate(([-1], last[:-1]))
+            return np.where((before >= 0) & (docs[np.maximum(before, 0)] == docs), before, -1)
+
+        def at(values: np.ndarray, index: np.ndarray, fill=False) -> np.ndarray:
+            return np.where(index >= 0, values[np.maximum(index, 0)], fill)
+
+        # Like TextBlob, a modifier carries over short unknown words ("really is a good")
+        # and a negation over one-letter ones ("not a good")
+        modifier_before = previous(known | (lengths > 2))
+        negation_before = previous(known | ((lengths > 1) & ~exclamation))
+
+        # A known word after a modifier merges into it: "very good" is one assessment
+        merged = known & at(modifier, modifier_before)
+        modifier_negated = at(negation, at(negation_before, modifier_before, -1))
+        modifier_intensity = at(intensity, modifier_before, 1.0)
+        modifier_intensity = np.where(merged & modifier_negated, 1.0 / modifier_intensity, modifier_intensity)
+        polarity = np.where(merged, np.clip(polarity * modifier_intensity, -1.0, 1.0), polarity)
+        negated = np.where(merged, modifier_negated, at(negation, negation_before))
+
+        # Every known word is an assessment, except modifiers absorbed by the next word
+        absorbed = np.zeros(len(ids), dtype=bool)
+        absorbed[modifier_before[merged]] = True
+        assessment = known & ~absorbed
+
+        # Each "!" boosts the latest assessment before it
+        boosted_index = previous(assessment)[exclamation]
+        boosts = np.bincount(boosted_index[boosted_index >= 0], minlength=len(ids))
+        polarity = np.clip(polarity * 1.25 ** boosts, -1.0, 1.0)
+
+        # "not good" = slightly bad, "not bad" = slightly good
+        polarity = np.where(negated, polarity * -0.5, polarity)
+
+        totals = np.bincount(docs[assessment], weights=polarity[assessment], minlength=len(texts))
+        counts = np.bincount(docs[assessment], minlength=len(texts))
+        np.divide(totals, counts, out=result, where=counts > 0)
+        return result
+
+    def labels(self, texts: Sequence[str]) -> List[str]:
+        """positive / neutral / negative for every text"""
+        return [label_for(polarity) for polarity in self.polarities(texts)]
+
+    def label(self, text: str) -> str:
+        return self.labels([text])[0]
+
+
+def compare_with_textblob(texts: Sequence[str], engine: BatchSentiment = None) -> Dict:
+    """
+    A/B the batch scorer against TextBlob on the same texts: label agreement,
+    the confusion matrix (TextBlob label -> batch label) and throughput.
+    """
+    from textblob import TextBlob
+
+    engine = engine or BatchSentiment()
+
+    start = time.perf_counter()
+    reference = [label_for(TextBlob(text).sentiment.polarity) for text in texts]
+    textblob_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch = engine.labels(texts)
+    batch_seconds = time.perf_counter() - start
+
+    confusion = {expected: {label: 0 for label in ("positive", "neutral", "negative")}
+                 for expected in ("positive", "neutral", "negative")}
+    for expected, label in zip(reference, batch):
+        confusion[expected][label] += 1
+
+    agreed = sum(confusion[label][label] for label in confusion)
+    return {
+        "texts": len(texts),
+        "agreement": round(agreed / len(texts), 4) if texts else None,
+        "confusion": confusion,
+        "textblob_per_second": round(len(texts) / textblob_seconds) if textblob_seconds else None,
+        "batch_per_second": round(len(texts) / batch_seconds) if batch_seconds else None,
+    }
+
+
+if __name__ == "__main__":
+    # python -m app.sentiment headlines.txt  (one text per line)
+    import json
+
+    with open(sys.argv[1]) as f:
+        lines = [line.strip() for line in f if line.strip()]
+    print("TextBlob lexicon only:")
+    print(json.dumps(compare_with_textblob(lines, BatchSentiment(finance_overrides={})), indent=2))
+    print("With finance overrides:")
+    print(json.dumps(compare_with_textblob(lines), indent=2))
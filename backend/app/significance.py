@@ -0,0 +1,89 @@
+import numpy as np
+from typing import Dict, List, Optional, Tuple
+
+BOOTSTRAP_RESAMPLES = 10_000
+CONFIDENCE = 0.95
+
+_rng = np.random.default_rng()
+
+
+def car_significance(
+    estimation_stock: np.ndarray,
+    estimation_market: np.ndarray,
+    event_stock: np.ndarray,
+    event_market: np.ndarray,
+    alpha: float,
+    beta: float,
+    resamples: int = BOOTSTRAP_RESAMPLES,
+    confidence: float = CONFIDENCE,
+    rng: np.random.Generator = None,
+) -> Optional[Dict[str, float]]:
+    """
+    Test whether an event window's CAR differs from zero, given the market
+    model fitted on the estimation window. Days with a NaN return are left out.
+
+    - t_stat: CAR over its standard error sqrt(L * residual variance)
+    - patell_z: Patell standardized CAR, each abnormal return scaled by its
+      out-of-sample forecast error
+    - p_value, ci_low, ci_high: bootstrap from the estimation residuals. All
+      resamples x L draws are one index matrix, and their row sums form the
+      no-event distribution of a CAR over L days.
+
+    CAR and the interval are in percent. Returns None when the market model
+    leaves no residual variance to test against (e.g. the stock is its own
+    market proxy), since every statistic would be infinite or NaN.
+    """
+    rng = rng or _rng
+
+    observed = np.isfinite(estimation_stock) & np.isfinite(estimation_market)
+    market = estimation_market[observed]
+    residuals = estimation_stock[observed] - alpha - beta * market
+    residuals -= residuals.mean()  # centred, so the null CAR has no drift
+    n = len(residuals)
+
+    event_observed = np.isfinite(event_stock) & np.isfinite(event_market)
+    event_market = event_market[event_observed]
+    abnormal = event_stock[event_observed] - alpha - beta * event_market
+    length = len(abnormal)
+    if n < 5 or length == 0:
+        raise ValueError("Insufficient data for significance tests")
+
+    car = abnormal.sum()
+    residual_variance = residuals @ residuals / (n - 2)
+    # Rounding noise of a perfect fit, relative to the variance being explained
+    if not residual_variance > 1e-12 * np.var(estimation_stock[observed]):
+        return None
+    t_stat = car / np.sqrt(length * residual_variance)
+
+    # Patell (1976): standardize by the forecast error of each event day
+    market_mean = market.mean()
+    sxx = ((market - market_mean) ** 2).sum()
+    forecast_sd = np.sqrt(residual_variance * (1 + 1 / n + (event_market - market_mean) ** 2 / sxx))
+    patell_z = (abnormal / forecast_sd).sum() / np.sqrt(length * (n - 2) / (n - 4))
+
+    # resamples x L draws of estimation residuals in one gather
+    null_cars = residuals[rng.integers(0, n, size=(resamples, length))].sum(axis=1)
+    tail = (1 - confidence) / 2
+    low, high = np.quantile(null_cars, [tail, 1 - tail])
+    p_value = (np.count_nonzero(np.abs(null_cars) >= abs(car)) + 1) / (resamples + 1)
+
+    if not np.isfinite([t_stat, patell_z, low, high]).all():
+        return None
+    return {
+        "t_stat": round(float(t_stat), 2),
+        "patell_z": round(float(patell_z), 2),
+        "p_value": round(float(p_value), 4),
+        "ci_low": round(float(car - high) * 100, 2),
+        "ci_high": round(float(car - low) * 100, 2),
+        "confidence": confidence,
+        "resamples": resamples,
+    }
+
+
+def car_significance_many(cases: List[Tuple]) -> List[Optional[Dict[str, float]]]:
+    """
+    car_significance for each (estimation_stock, estimation_market,
+    event_stock, event_market, alpha, beta) case, in one call that can be
+    sent to a worker process
+    """
+    return [car_significance(*case) for case in cases]
@@ -0,0 +1,81 @@
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls for the same key: the first caller runs the
+    fetch, everyone who asks for that key while it is in flight waits for it
+    and shares its result (or exception). Nothing is cached once it finishes.
+
+    do() serves threads (blocking upstream clients such as requests and
+    yfinance); do_async() serves coroutines on the event loop.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self._async_calls: Dict[Hashable, asyncio.Future] = {}
+        self.calls = 0
+        self.shared = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                self.shared += 1
+                leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                self.calls += 1
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+
+    async def do_async(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        future = self._async_calls.get(key)
+        if future is not None:
+            self.shared += 1
+            # shield() so one cancelled waiter doesn't cancel the shared fetch
+            return await asyncio.shield(future)
+
+        future = asyncio.ensure_future(fn())
+        self._async_calls[key] = future
+        self.calls += 1
+        future.add_done_callback(lambda _: self._forget_async(key, future))
+        return await asyncio.shield(future)
+
+    def _forget_async(self, key: Hashable, future: asyncio.Future):
+        if self._async_calls.get(key) is future:
+            del self._async_calls[key]
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "upstream_calls": self.calls,
+            "shared_results": self.shared,
+            "in_flight": len(self._calls) + len(self._async_calls),
+        }
@@ -0,0 +1,154 @@
+import csv
+import json
+import os
+import queue
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Set
+
+from app.single_flight import SingleFlight
+
+SYMBOL_MASTER_PATH = os.path.join(os.path.dirname(__file__), "symbols.csv")
+
+
+class TickerMetadata:
+    """
+    Company name, exchange and sector per ticker. Starts from the bundled
+    symbol-master CSV, overlaid with anything fetched since (persisted as
+    JSON). get() never touches the network: unknown or stale tickers are
+    queued for yfinance's slow .info scrape on one background thread, each
+    ticker at most once at a time.
+    """
+
+    def __init__(self, master_path: str = SYMBOL_MASTER_PATH, path: str = None,
+                 refresh_interval: timedelta = timedelta(days=30)):
+        self.master_path = master_path
+        self.path = path or os.getenv("TICKER_METADATA_PATH", "./data/ticker_metadata.json")
+        self.refresh_interval = refresh_interval
+        self._records: Dict[str, Dict] = {}
+        self._failed_at: Dict[str, datetime] = {}
+        self._lock = threading.Lock()
+        self._flights = SingleFlight()
+        self._master_updated_at: Optional[datetime] = None
+        self._queue: "queue.Queue[str]" = queue.Queue()
+        self._queued: Set[str] = set()
+        self._worker: threading.Thread = None
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.master_path, newline="") as f:
+                for row in csv.DictReader(f):
+                    symbol = row["symbol"].upper()
+                    self._records[symbol] = {
+                        "symbol": symbol,
+                        "name": row["name"],
+                        "exchange": row.get("exchange") or None,
+                        "sector": row.get("sector") or None,
+                        "updated_at": None,  # master rows are as old as the CSV
+                    }
+            self._master_updated_at = datetime.fromtimestamp(os.path.getmtime(self.master_path))
+        except OSError as e:
+            print(f"Symbol master not loaded: {e}")
+
+        try:
+            with open(self.path) as f:
+                self._records.update(json.load(f))
+        except (OSError, ValueError):
+            pass
+
+    def _is_stale(self, record: Dict) -> bool:
+        updated_at = record.get("updated_at")
+        updated_at = datetime.fromisoformat(updated_at) if updated_at else self._master_updated_at
+        return updated_at is None or datetime.now() - updated_at >= self.refresh_interval
+
+    def get(self, ticker: str) -> Optional[Dict]:
+        """Cached metadata for a ticker (None if unknown). Never blocks on the network."""
+        ticker = ticker.upper()
+        record = self._records.get(ticker)
+        if record is None or self._is_stale(record):
+            self._refresh_in_background(ticker)
+        return record
+
+    def company_name(self, ticker: str) -> str:
+        record = self.get(ticker)
+        return record["name"] if record else ticker.upper()
+
+    def resolve(self, ticker: str) -> Optional[Dict]:
+        """
+        Metadata for a ticker, fetching it now if it isn't cached. For callers
+        that have to know whether a ticker exists (e.g. validating /add_ticker).
+        """
+        ticker = ticker.upper()
+        record = self._records.get(ticker)
+        if record is not None:
+            if self._is_stale(record):
+                self._refresh_in_background(ticker)
+            return record
+        return self.refresh(ticker)
+
+    def _refresh_in_background(self, ticker: str):
+        # Don't retry a ticker yfinance just failed on for every lookup
+        failed_at = self._failed_at.get(ticker)
+        if failed_at and datetime.now() - failed_at < timedelta(minutes=15):
+            return
+        with self._lock:
+            if ticker in self._queued:
+                return
+            self._queued.add(ticker)
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._work, name="ticker-metadata", daemon=True)
+                self._worker.start()
+        self._queue.put(ticker)
+
+    def _work(self):
+        """Background refreshes, one ticker at a time"""
+        while True:
+            ticker = self._queue.get()
+            try:
+                self.refresh(ticker)
+            finally:
+                with self._lock:
+                    self._queued.discard(ticker)
+
+    def refresh(self, ticker: str) -> Optional[Dict]:
+        """Look a ticker up with yfinance and persist the result"""
+        ticker = ticker.upper()
+        return self._flights.do(ticker, lambda: self._refresh(ticker))
+
+    def _refresh(self, ticker: str) -> Optional[Dict]:
+        try:
+            import yfinance as yf
+            info = yf.Ticker(ticker).info
+            if not info or "symbol" not in info:
+                self._failed_at[ticker] = datetime.now()
+                return None
+
+            record = {
+                "symbol": ticker,
+                "name": info.get("longName") or info.get("shortName") or ticker,
+                "exchange": info.get("exchange"),
+                "sector": info.get("sector"),
+                "updated_at": datetime.now().isoformat(),
+            }
+            with self._lock:
+                self._records[ticker] = record
+                self._save()
+            return record
+        except Exception as e:
+            print(f"Ticker metadata error for {ticker}: {e}")
+            self._failed_at[ticker] = datetime.now()
+            return None
+
+    def _save(self):
+        """Persist fetched records (master rows that were never refreshed stay in the CSV)"""
+        fetched = {symbol: record for symbol, record in self._records.items() if record["updated_at"]}
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(fetched, f)
+        os.replace(tmp_path, self.path)
+
+    def status(self) -> Dict:
+        with self._lock:
+            return {"tickers": len(self._records), "refresh_queue": len(self._queued)}
@@ -0,0 +1,109 @@
+import numpy as np
+from datetime import date, datetime, timedelta
+from typing import List, Tuple, Union
+
+# Unscheduled full-day NYSE closures (weather, national mourning, 9/11)
+SPECIAL_CLOSURES = [
+    date(2001, 9, 11), date(2001, 9, 12), date(2001, 9, 13), date(2001, 9, 14),
+    date(2004, 6, 11),
+    date(2007, 1, 2),
+    date(2012, 10, 29), date(2012, 10, 30),
+    date(2018, 12, 5),
+    date(2025, 1, 9),
+]
+
+
+def _easter(year: int) -> date:
+    """Gregorian Easter Sunday (anonymous Gregorian algorithm)"""
+    a = year % 19
+    b, c = divmod(year, 100)
+    d, e = divmod(b, 4)
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    month, day = divmod(h + l - 7 * m + 114, 31)
+    return date(year, month, day + 1)
+
+
+def _nth_weekday(year: int, month: int, weekday: int, n: int) -> date:
+    """The nth given weekday of a month (n=-1 for the last one)"""
+    if n > 0:
+        first = date(year, month, 1)
+        return first + timedelta(days=(weekday - first.weekday()) % 7 + 7 * (n - 1))
+    next_month = date(year + month // 12, month % 12 + 1, 1)
+    last = next_month - timedelta(days=1)
+    return last - timedelta(days=(last.weekday() - weekday) % 7)
+
+
+def _observed(holiday: date) -> date:
+    """Saturday holidays are observed on Friday, Sunday holidays on Monday"""
+    if holiday.weekday() == 5:
+        return holiday - timedelta(days=1)
+    if holiday.weekday() == 6:
+        return holiday + timedelta(days=1)
+    return holiday
+
+
+def nyse_holidays(year: int) -> List[date]:
+    """Full-day NYSE market holidays for a year"""
+    holidays = [
+        _nth_weekday(year, 2, 0, 3),       # Washington's Birthday
+        _easter(year) - timedelta(days=2),  # Good Friday
+        _nth_weekday(year, 5, 0, -1),      # Memorial Day
+        _observed(date(year, 7, 4)),       # Independence Day
+        _nth_weekday(year, 9, 0, 1),       # Labor Day
+        _nth_weekday(year, 11, 3, 4),      # Thanksgiving
+        _observed(date(year, 12, 25)),     # Christmas
+    ]
+
+    # New Year's Day falling on a Saturday is not moved to the prior Friday
+    new_year = date(year, 1, 1)
+    if new_year.weekday() != 5:
+        holidays.append(_observed(new_year))
+    if year >= 1998:
+        holidays.append(_nth_weekday(year, 1, 0, 3))  # Martin Luther King Jr. Day
+    if year >= 2022:
+        holidays.append(_observed(date(year, 6, 19)))  # Juneteenth
+
+    holidays.extend(d for d in SPECIAL_CLOSURES if d.year == year)
+    return sorted(holidays)
+
+
+class TradingCalendar:
+    """
+    NYSE trading sessions as a sorted datetime64[D] array. Dates map to
+    session positions with a binary search, so event windows can be taken as
+    exact trading-day offsets and sliced out of session-aligned arrays.
+    """
+
+    def __init__(self, start_year: int = 1995, end_year: int = None):
+        end_year = end_year or datetime.now().year + 1
+        holidays = [d for year in range(start_year, end_year + 1) for d in nyse_holidays(year)]
+        days = np.arange(f"{start_year}-01-01", f"{end_year + 1}-01-01", dtype="datetime64[D]")
+        self.holidays = np.array(holidays, dtype="datetime64[D]")
+        self.sessions = days[np.is_busday(days, holidays=self.holidays)]
+
+    def __len__(self) -> int:
+        return len(self.sessions)
+
+    def is_session(self, day: Union[date, np.datetime64]) -> bool:
+        """Whether the market is open on day"""
+        position = self.position(day)
+        return position < len(self.sessions) and self.sessions[position] == np.datetime64(day, "D")
+
+    def position(self, day: Union[date, np.datetime64, np.ndarray]):
+        """Position of the first session on or after day (vectorized over arrays)"""
+        return np.searchsorted(self.sessions, np.asarray(day, dtype="datetime64[D]"), side="left")
+
+    def window(self, day: Union[date, np.datetime64], start: int, end: int) -> Tuple[int, int]:
+        """
+        Session positions [lo, hi) covering trading-day offsets start..end
+        (inclusive) around day, clipped to the calendar
+        """
+        position = int(self.position(day))
+        lo = min(max(position + start, 0), len(self.sessions))
+        hi = min(max(position + end + 1, 0), len(self.sessions))
+        return lo, hi
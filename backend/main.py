@@ -1,17 +1,35 @@
+if __name__ == "__main__":
+    # `python main.py` serves the app through `python -m uvicorn main:app` instead of running it
+    # from this script: the process pool's spawned workers re-import the __main__ script, and
+    # would otherwise repeat all of the setup below (clients, database, pools) in every worker
+    import os
+    import subprocess
+    import sys
+    raise SystemExit(subprocess.call([
+        sys.executable, "-m", "uvicorn", "main:app", "--host", "0.0.0.0", "--port", "8000",
+        "--app-dir", os.path.dirname(os.path.abspath(__file__)),
+    ]))
+
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import Response
-from pydantic import BaseModel
-from typing import List, Optional, Dict
-from typing import List, Optional, Dict
-from datetime import datetime
+from pydantic import BaseModel, ConfigDict, field_validator
+from typing import List, Optional, Dict, Tuple
+from datetime import datetime, timedelta
+import asyncio
 import os
 from dotenv import load_dotenv
 import google.generativeai as genai
 
 from app.news_service import NewsService
 from app.event_analyzer import EventAnalyzer
+from app.event_study import check_windows
 from app.database import Database
+from app.analysis_cache import AnalysisCache
+from app.ingestion_worker import IngestionWorker
+from app.price_refresher import PriceRefresher
+from app.executor import Executor, ExecutorBusy
+from app.ticker_metadata import TickerMetadata
 from app.agent import WealthVisorAgent
 from pathlib import Path
 from elevenlabs import ElevenLabs
@@ -35,12 +53,25 @@ app.add_middleware(
 )
 
 # Initialize services
+db = Database(os.getenv("DATABASE_URL"))
+# Thread pool for blocking I/O, process pool for heavy numpy work
+executor = Executor()
+ticker_metadata = TickerMetadata()
 news_service = NewsService(
     news_api_key=os.getenv("NEWS_API_KEY"),
-    finnhub_api_key=os.getenv("FINNHUB_API_KEY")
+    finnhub_api_key=os.getenv("FINNHUB_API_KEY"),
+    metadata=ticker_metadata,
+    analysis_cache=AnalysisCache(db),
+    executor=executor,
+    database=db
 )
-event_analyzer = EventAnalyzer(alpha_vantage_key=os.getenv("ALPHA_VANTAGE_KEY"))
-db = Database(os.getenv("DATABASE_URL"))
+event_analyzer = EventAnalyzer(alpha_vantage_key=os.getenv("ALPHA_VANTAGE_KEY"), executor=executor)
+# News ingestion: "worker" polls the providers in the background of this process, "external"
+# leaves polling to `python -m app.ingestion_worker`, "inline" fetches on each request
+ingestion_mode = os.getenv("INGESTION_WORKER", "worker")
+ingestion_worker = IngestionWorker(news_service, db, executor=executor)
+# Nightly refresh of the tracked tickers' daily bars
+price_refresher = PriceRefresher(event_analyzer, db)
 
 # Initialize ElevenLabs
 elevenlabs = ElevenLabs(api_key=os.getenv("ELEVENLABS_API_KEY"))
@@ -78,6 +109,31 @@ class FetchNewsRequest(BaseModel):
 class AnalyzeEventRequest(BaseModel):
     ticker: str
     date: str
+    windows: Optional[List[Tuple[int, int]]] = None  # CAR windows as (first, last) trading-day offsets
+    significance: bool = False
+
+    @field_validator("windows")
+    @classmethod
+    def validate_windows(cls, windows):
+        # A window that starts after it ends is a 422, not a failed analysis
+        return windows if windows is None else check_windows(windows)
+
+class BatchEvent(BaseModel):
+    # Windows and significance are set for the whole batch, so they are rejected here
+    model_config = ConfigDict(extra="forbid")
+
+    ticker: str
+    date: str
+
+class BatchAnalyzeEventRequest(BaseModel):
+    events: List[BatchEvent]
+    windows: Optional[List[Tuple[int, int]]] = None
+    significance: bool = False
+
+    @field_validator("windows")
+    @classmethod
+    def validate_windows(cls, windows):
+        return windows if windows is None else check_windows(windows)
 
 class NewsArticle(BaseModel):
     ticker: str
@@ -87,14 +143,29 @@ class NewsArticle(BaseModel):
     url: str
     published_at: str
 
+class Significance(BaseModel):
+    t_stat: float
+    patell_z: float
+    p_value: float       # bootstrap, two-sided
+    ci_low: float        # bootstrap CAR interval, percent
+    ci_high: float
+    confidence: float
+    resamples: int
+
 class EventAnalysis(BaseModel):
     ticker: str
     event: str
     date: str
     car_0_1: float
+    cars: Dict[str, float] = {}  # CAR per window, keyed like "[-1,+1]"
     volatility_change: float
     sentiment: str
     conclusion: str
+    significance: Optional[Significance] = None
+    estimated: bool = False  # date approximated from a quarterly cadence, not a reported earnings date
+
+class DetectedEvent(EventAnalysis):
+    z_score: float
 
 class UpcomingEvent(BaseModel):
     ticker: str
@@ -137,10 +208,63 @@ class VoiceNewsRequest(BaseModel):
     text: Optional[str] = None
     tracked_stocks: List[str] = []
 
+async def run_blocking(fn, *args, **kwargs):
+    """Run a blocking call off the event loop, mapping a full queue to 503 and a timeout to 504"""
+    try:
+        return await executor.run_io(fn, *args, **kwargs)
+    except ExecutorBusy as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except (TimeoutError, asyncio.TimeoutError) as e:
+        raise HTTPException(status_code=504, detail=str(e))
+
+async def read_news(tickers: List[str]) -> List[Dict]:
+    """Stored news for the tickers (tracked for ingestion from now on); inline mode fetches it first"""
+    if ingestion_mode == "inline":
+        return await news_service.fetch_news_for_tickers(tickers)
+    # Unknown tickers are dropped rather than polled forever
+    tickers = await ingestion_worker.track(tickers)
+    if not tickers:
+        return []
+    # Nothing is stored yet for a ticker tracked just now; give its first poll a moment
+    await ingestion_worker.wait_for_first_poll(tickers)
+    return await news_service.read_news(tickers)
+
+@app.on_event("startup")
+async def startup():
+    if ingestion_mode == "worker":
+        ingestion_worker.start()
+    # Inline mode is for hosts without background tasks; prices are then refreshed on request
+    if ingestion_mode != "inline":
+        price_refresher.start()
+
+@app.on_event("shutdown")
+async def shutdown():
+    await ingestion_worker.stop()
+    await price_refresher.stop()
+    executor.shutdown()
+    await news_service.aclose()
+
 @app.get("/")
 async def root():
     return {"message": "StockLens API is running"}
 
+@app.get("/metrics")
+async def get_metrics():
+    """Cache and upstream usage counters for monitoring"""
+    return {
+        "event_cache": event_analyzer.cache.stats(),
+        "price_fetches": event_analyzer.flights.stats(),
+        "alpha_vantage": event_analyzer.alpha_vantage.scheduler.status(),
+        "earnings_calendar": event_analyzer.earnings_calendar.status(),
+        "news_fetches": news_service.flights.stats(),
+        "news_analysis": news_service.analysis_cache.stats(),
+        "news_dedup": news_service.dedup.stats(),
+        "ingestion": {key: value for key, value in ingestion_worker.status().items() if key != "tickers"},
+        "price_refresh": price_refresher.status(),
+        "executor": executor.status(),
+        "ticker_metadata": ticker_metadata.status(),
+    }
+
 @app.post("/agent/chat", response_model=ChatResponse)
 async def agent_chat(req: ChatRequest) -> ChatResponse:
     try:
@@ -180,63 +304,127 @@ async def add_ticker(request: AddTickerRequest):
     """Add a stock ticker to track"""
     try:
         ticker = request.ticker.upper()
-        # Validate ticker exists
-        import yfinance as yf
-        stock = yf.Ticker(ticker)
-        info = stock.info
+        # Validate ticker exists (cached metadata, looked up only for unknown tickers)
+        metadata = await run_blocking(ticker_metadata.resolve, ticker)
 
-        if not info or 'symbol' not in info:
+        if metadata is None:
             raise HTTPException(status_code=404, detail=f"Ticker {ticker} not found")
 
         # Store in database (simplified for hackathon)
         return {
             "ticker": ticker,
-            "company_name": info.get("longName", ticker),
+            "company_name": metadata["name"],
             "message": "Ticker added successfully"
         }
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/fetch_news")
 async def fetch_news(request: FetchNewsRequest) -> List[NewsArticle]:
-    """Fetch filtered and analyzed news for tracked stocks"""
+    """Filtered and analyzed news for tracked stocks, as last ingested"""
     try:
-        articles = await news_service.fetch_news_for_tickers(request.tickers)
+        articles = await read_news(request.tickers)
         return articles
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/ingestion/status")
+async def ingestion_status():
+    """News ingestion worker lag, backlog and per-ticker poll cadence"""
+    return {"mode": ingestion_mode, **ingestion_worker.status()}
+
 @app.post("/analyze_event")
 async def analyze_event(request: AnalyzeEventRequest) -> EventAnalysis:
     """Analyze the impact of a specific event"""
     try:
         event_date = datetime.fromisoformat(request.date)
-        analysis = event_analyzer.analyze_event(request.ticker, event_date)
+        analysis = await run_blocking(
+            event_analyzer.analyze_event,
+            request.ticker, event_date, windows=request.windows, significance=request.significance
+        )
         return analysis
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/analyze_events/batch")
+async def analyze_events_batch(request: BatchAnalyzeEventRequest) -> List[EventAnalysis]:
+    """Analyze many (ticker, date) events in one pass; events without enough data are left out"""
+    try:
+        events = [(event.ticker, datetime.fromisoformat(event.date)) for event in request.events]
+        analyses = await run_blocking(
+            event_analyzer.analyze_events_batch,
+            events, windows=request.windows, significance=request.significance
+        )
+        return [analysis for analysis in analyses if analysis is not None]
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/events/past")
-async def get_past_events(ticker: str) -> List[EventAnalysis]:
-    """Get past events with their analysis"""
+async def get_past_events(ticker: str, significance: bool = False) -> List[EventAnalysis]:
+    """Get past events with their analysis (significance=true adds t-stat, Patell and bootstrap tests)"""
     try:
-        events = event_analyzer.get_past_earnings_events(ticker)
+        events = await run_blocking(event_analyzer.get_past_earnings_events, ticker, significance=significance)
         return events
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/events/detected")
+async def get_detected_events(ticker: str, refresh: bool = False) -> List[DetectedEvent]:
+    """Get days flagged by the abnormal-return scan of a ticker's full history (rescanned on first use or refresh=true)"""
+    try:
+        return await run_blocking(_detected_events, ticker.upper(), refresh)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+def _detected_events(ticker: str, refresh: bool) -> List[Dict]:
+    """Stored scan results, rescanning and storing them on first use or refresh"""
+    events = None if refresh else db.get_detected_events(ticker)
+    if events is None:
+        events = event_analyzer.detect_events(ticker)
+        db.replace_detected_events(ticker, events)
+    return events
+
 @app.get("/events/upcoming")
 async def get_upcoming_events(ticker: str) -> List[UpcomingEvent]:
     """Get upcoming events for a ticker"""
     try:
-        events = event_analyzer.get_upcoming_events(ticker)
+        events = await run_blocking(event_analyzer.get_upcoming_events, ticker)
         return events
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/events/calendar")
+async def get_earnings_calendar(tickers: str, start: Optional[str] = None, end: Optional[str] = None) -> List[UpcomingEvent]:
+    """Get scheduled earnings for a comma-separated watchlist between start and end (default: next 90 days)"""
+    try:
+        start_date = datetime.fromisoformat(start) if start else datetime.now()
+        end_date = datetime.fromisoformat(end) if end else start_date + timedelta(days=90)
+        ticker_list = [ticker.strip().upper() for ticker in tickers.split(",") if ticker.strip()]
+        return await run_blocking(event_analyzer.get_earnings_calendar, ticker_list, start_date, end_date)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/price/{ticker}")
 async def get_price_data(ticker: str) -> PriceData:
     """Get price data for 1 day, 1 week, and 1 month"""
+    return await run_blocking(_load_price_data, ticker)
+
+def _load_price_data(ticker: str) -> PriceData:
+    """Blocking body of /price (price store, then yfinance, then mock data)"""
     try:
         import yfinance as yf
         from datetime import datetime, timedelta
@@ -247,39 +435,31 @@ async def get_price_data(ticker: str) -> PriceData:
         ticker_upper = ticker.upper()
         stock = yf.Ticker(ticker_upper)
         
-        # Try to get data from Alpha Vantage first
+        # Try the persistent daily price store first (refreshed from Alpha Vantage)
         try:
-            from app.event_analyzer import EventAnalyzer
-            event_analyzer = EventAnalyzer()
-            
-            # Get current price from Alpha Vantage
-            alpha_data = event_analyzer._download_from_alpha_vantage(f"https://www.alphavantage.co/query?function=GLOBAL_QUOTE&symbol={ticker_upper}&apikey={event_analyzer.alpha_vantage_key}")
-            
-            if alpha_data and "Global Quote" in alpha_data:
-                quote = alpha_data["Global Quote"]
-                current_price = float(quote.get("05. price", 0))
-                logging.info(f"Got current price from Alpha Vantage for {ticker_upper}: ${current_price}")
-                
-                # For historical data, we'll use mock data since Alpha Vantage free tier has limits
-                # In a real implementation, you'd use Alpha Vantage's TIME_SERIES_DAILY endpoint
-                price_1d = current_price * (1 + random.uniform(-0.05, 0.05))
-                price_1w = current_price * (1 + random.uniform(-0.15, 0.15))
-                price_1m = current_price * (1 + random.uniform(-0.25, 0.25))
-                
-                change_1d = current_price - price_1d
-                change_1w = current_price - price_1w
-                change_1m = current_price - price_1m
-                
-                change_1d_percent = (change_1d / price_1d) * 100 if price_1d > 0 else 0
-                change_1w_percent = (change_1w / price_1w) * 100 if price_1w > 0 else 0
-                change_1m_percent = (change_1m / price_1m) * 100 if price_1m > 0 else 0
-                
-            else:
-                logging.warning(f"Alpha Vantage returned no data for {ticker_upper}, using mock data")
-                raise Exception("No Alpha Vantage data")
-                
+            series = event_analyzer.get_price_series(ticker_upper)
+            if series is None or len(series) < 2:
+                raise Exception("No stored price data")
+
+            closes = series.close
+            current_price = float(closes[-1])
+            logging.info(f"Got current price from price store for {ticker_upper}: ${current_price}")
+
+            # 1 day, 1 week and 1 month ago in trading days
+            price_1d = float(closes[-2])
+            price_1w = float(closes[-6]) if len(closes) > 5 else current_price
+            price_1m = float(closes[-22]) if len(closes) > 21 else current_price
+
+            change_1d = current_price - price_1d
+            change_1w = current_price - price_1w
+            change_1m = current_price - price_1m
+
+            change_1d_percent = (change_1d / price_1d) * 100 if price_1d > 0 else 0
+            change_1w_percent = (change_1w / price_1w) * 100 if price_1w > 0 else 0
+            change_1m_percent = (change_1m / price_1m) * 100 if price_1m > 0 else 0
+
         except Exception as alpha_error:
-            logging.warning(f"Alpha Vantage failed for {ticker_upper}: {str(alpha_error)}")
+            logging.warning(f"Price store failed for {ticker_upper}: {str(alpha_error)}")
             
             # Fallback to yfinance
             hist = stock.history(period="5d")
@@ -365,6 +545,10 @@ async def get_price_data(ticker: str) -> PriceData:
 @app.get("/chart/{ticker}/{period}")
 async def get_chart_data(ticker: str, period: str) -> ChartData:
     """Get historical chart data for 1 day, 1 week, or 1 month"""
+    return await run_blocking(_load_chart_data, ticker, period)
+
+def _load_chart_data(ticker: str, period: str) -> ChartData:
+    """Blocking body of /chart (yfinance download)"""
     try:
         import yfinance as yf
         from datetime import datetime, timedelta
@@ -529,7 +713,7 @@ async def generate_watchlist_script(tracked_stocks: List[str]) -> str:
     """Generate a ~100-word script about tracked stocks and their news, allowing sentences to complete naturally"""
     try:
         # Fetch news for tracked stocks
-        articles = await news_service.fetch_news_for_tickers(tracked_stocks)
+        articles = await read_news(tracked_stocks)
 
         # Get comprehensive price data for each stock using our existing API
         stock_summaries = []
@@ -770,7 +954,3 @@ async def get_voice_news_script():
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error generating script: {str(e)}")
-
-if __name__ == "__main__":
-    import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -0,0 +1,80 @@
+import pytest
+
+from app.analysis_cache import AnalysisCache, content_key
+from app.news_service import NewsService
+
+ANALYSIS = {"matches": ["apple"], "sentiment": "positive", "polarity": 0.4, "summary": "Apple beats."}
+
+
+def test_content_key_ignores_case_and_whitespace():
+    assert content_key("Apple  Beats\nEstimates", "Shares rise", "newsapi") == \
+        content_key("apple beats estimates", " shares rise ", "newsapi")
+    assert content_key("Apple beats", "", "newsapi") != content_key("Apple beats", "Shares rise", "newsapi")
+
+
+def test_content_key_includes_the_provider():
+    assert content_key("Apple beats", "Shares rise", "newsapi") != content_key("Apple beats", "Shares rise", "finnhub")
+
+
+class Store:
+    def __init__(self):
+        self.rows = {}
+        self.reads = 0
+
+    def get_article_analyses(self, keys, version):
+        self.reads += 1
+        return {key: self.rows[key][1] for key in keys if key in self.rows and self.rows[key][0] == version}
+
+    def save_article_analyses(self, analyses, version):
+        self.rows.update({key: (version, analysis) for key, analysis in analyses.items()})
+
+
+def test_memory_then_store():
+    store = Store()
+    AnalysisCache(store).put_many({"a": ANALYSIS})
+
+    # Another process: a store hit, then served from memory
+    cache = AnalysisCache(store)
+    assert cache.get_many(["a", "b"]) == {"a": ANALYSIS}
+    assert cache.get_many(["a"]) == {"a": ANALYSIS}
+    assert store.reads == 1
+    stats = cache.stats()
+    assert (stats["memory_hits"], stats["store_hits"], stats["misses"]) == (1, 1, 1)
+
+
+def test_other_scoring_versions_are_misses():
+    store = Store()
+    AnalysisCache(store, version=1).put_many({"a": ANALYSIS})
+    assert AnalysisCache(store, version=2).get_many(["a"]) == {}
+
+
+def test_store_errors_fall_back_to_scoring():
+    class Broken:
+        def get_article_analyses(self, keys, version):
+            raise RuntimeError("database is locked")
+
+    cache = AnalysisCache(Broken())
+    assert cache.get_many(["a"]) == {}
+    assert cache.stats()["store_errors"] == 1
+
+
+class Metadata:
+    def company_name(self, ticker):
+        return "Apple"
+
+
+def test_same_story_from_each_provider_keeps_its_own_summary():
+    service = NewsService(metadata=Metadata())
+    description = "Apple beat estimates. Shares rose after hours. Analysts raised targets. " * 4
+    articles = [
+        {"provider": provider, "title": "Apple beats estimates", "description": description,
+         "text": f"Apple beats estimates. {description}"}
+        for provider in ("newsapi", "finnhub")
+    ]
+    newsapi, finnhub = service.analyze_articles(articles)
+    assert newsapi["summary"] == "Apple beat estimates. Shares rose after hours."
+    assert finnhub["summary"].startswith(description[:200])
+
+    # Served from the cache, each provider still gets its own
+    assert service.analyze_articles(articles[::-1])[0]["summary"] == finnhub["summary"]
+    assert service.analysis_cache.stats()["memory_hits"] == 2
@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+
+from app.anomaly_scanner import scan_anomalies
+
+
+@pytest.fixture
+def returns():
+    rng = np.random.default_rng(5)
+    market = rng.normal(0.0005, 0.01, 400)
+    stock = 0.0002 + 1.1 * market + rng.normal(0, 0.01, 400)
+    return stock, market
+
+
+def test_flags_a_jump(returns):
+    stock, market = returns
+    stock = stock.copy()
+    stock[300] += 0.12
+    scan = scan_anomalies(stock, market)
+
+    assert scan["flagged"][300, 0]
+    assert scan["z"][300, 0] > 3
+    assert scan["abnormal_return"][300, 0] > 10
+    # Too little history to score the first days
+    assert np.isnan(scan["z"][:60, 0]).all()
+
+
+def test_z_matches_a_direct_fit(returns):
+    stock, market = returns
+    scan = scan_anomalies(stock, market, estimation_days=120, volatility_window=5)
+
+    day = 250
+    estimation = slice(day - 4 - 120, day - 4)
+    beta, alpha = np.polyfit(market[estimation], stock[estimation], 1)
+    residuals = stock[estimation] - (alpha + beta * market[estimation])
+    z = (stock[day] - alpha - beta * market[day]) / np.sqrt(residuals @ residuals / 118)
+    assert scan["z"][day, 0] == pytest.approx(z, rel=1e-8)
+
+
+def test_volatility_onset_is_flagged_once(returns):
+    stock, market = returns
+    stock = stock.copy()
+    rng = np.random.default_rng(1)
+    stock[300:320] += rng.normal(0, 0.08, 20)
+    scan = scan_anomalies(stock, market, z_threshold=np.inf)
+
+    high = scan["volatility_ratio"][:, 0] >= 2.5
+    assert high[300:320].any()
+    onsets = np.flatnonzero(scan["flagged"][:, 0])
+    assert len(onsets) >= 1
+    assert all(high[day] and not high[day - 1] for day in onsets)
+
+
+def test_panel_columns_match_single_series(returns):
+    stock, market = returns
+    panel = np.column_stack([stock, np.roll(stock, 9)])
+    scan = scan_anomalies(panel, market)
+    single = scan_anomalies(panel[:, 1], market)
+    np.testing.assert_allclose(scan["z"][:, 1], single["z"][:, 0], rtol=1e-12)
@@ -0,0 +1,53 @@
+from datetime import timedelta
+
+import numpy as np
+
+from app.cache import BoundedCache, estimate_size
+
+
+def test_hit_and_miss():
+    cache = BoundedCache(max_bytes=10_000)
+    cache.set("past_events", "AAPL", [1, 2, 3])
+    assert cache.get("past_events", "AAPL") == [1, 2, 3]
+    # Same key in another key class is a different entry
+    assert cache.get("bars", "AAPL", "missing") == "missing"
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+
+def test_evicts_least_recently_used():
+    array = np.zeros(100)
+    cache = BoundedCache(max_bytes=3 * estimate_size(array))
+    for key in "abc":
+        cache.set("bars", key, array.copy())
+    cache.get("bars", "a")
+    cache.set("bars", "d", array.copy())
+
+    assert cache.get("bars", "b") is None
+    assert all(cache.get("bars", key) is not None for key in "acd")
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["bytes"] <= cache.max_bytes
+
+
+def test_oversized_values_are_not_cached():
+    cache = BoundedCache(max_bytes=100)
+    cache.set("bars", "big", np.zeros(1000))
+    assert cache.get("bars", "big") is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_ttl_per_key_class():
+    cache = BoundedCache(max_bytes=10_000, ttls={"quotes": timedelta(0)})
+    cache.set("quotes", "AAPL", 1.0)
+    cache.set("past_events", "AAPL", 2.0)
+    assert cache.get("quotes", "AAPL") is None
+    assert cache.get("past_events", "AAPL") == 2.0
+    assert cache.stats()["expirations"] == 1
+
+
+def test_invalidate():
+    cache = BoundedCache(max_bytes=10_000)
+    cache.set("bars", "AAPL", "x")
+    cache.invalidate("bars", "AAPL")
+    cache.invalidate("bars", "MSFT")
+    assert cache.get("bars", "AAPL") is None
+    assert cache.stats()["bytes"] == 0
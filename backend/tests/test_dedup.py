@@ -0,0 +1,83 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.database import Database
+from app.dedup import Deduplicator, canonical_url, simhash
+from app.news_service import NewsService
+
+HEADLINE = "Apple beats quarterly earnings as iPhone revenue climbs"
+
+
+def test_canonical_url_drops_tracking_and_amp():
+    assert canonical_url("http://www.example.com/story/amp/?utm_source=x&id=2&a=1#top") == \
+        "https://example.com/story?a=1&id=2"
+    assert canonical_url("https://www.google.com/amp/s/example.com/story") == "https://example.com/story"
+
+
+def test_syndicated_headlines_share_a_fingerprint():
+    assert simhash(f"{HEADLINE} - Reuters") == simhash(f"{HEADLINE} | Yahoo Finance")
+    assert (simhash(HEADLINE) ^ simhash("Fed holds rates steady as investors weigh guidance")).bit_count() > 3
+
+
+def test_dedupe_merges_copies():
+    articles = Deduplicator().dedupe([
+        {"title": HEADLINE, "url": "https://example.com/a?utm_source=x", "fetched_for": {"AAPL"}},
+        {"title": "Something else entirely", "url": "https://www.example.com/a", "fetched_for": {"MSFT"}},
+        {"title": f"{HEADLINE} - Reuters", "url": "https://reuters.com/b", "fetched_for": {"QQQ"}},
+    ])
+    assert len(articles) == 1
+    assert articles[0]["story"] == "https://example.com/a"
+    assert articles[0]["fetched_for"] == {"AAPL", "MSFT", "QQQ"}
+
+
+def test_seeded_stories_catch_copies():
+    first = Deduplicator()
+    story = first.story_key({"title": HEADLINE, "url": "https://example.com/a"})
+
+    # Another worker, or this one after a restart
+    second = Deduplicator()
+    second.seed({story: simhash(HEADLINE)})
+    assert second.story_key({"title": f"{HEADLINE} - Reuters", "url": "https://reuters.com/b"}) == story
+    assert second.stats()["near_duplicates"] == 1
+
+
+class Metadata:
+    def company_name(self, ticker):
+        return {"AAPL": "Apple", "MSFT": "Microsoft"}[ticker]
+
+
+def worker(database, articles):
+    service = NewsService("newsapi-key", metadata=Metadata(), database=database)
+
+    async def fetch(ticker, since):
+        return [article for article in articles if ticker in article["title"] or "Apple" in article["title"]]
+    service._fetch_from_newsapi = fetch
+    return service
+
+
+def raw(title, url, summary, minutes_ago=0):
+    published_at = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(minutes=minutes_ago)
+    return {"provider": "newsapi", "title": title, "description": summary, "text": f"{title}. {summary}",
+            "url": url, "published_at": published_at}
+
+
+@pytest.fixture
+def database(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    return Database()
+
+
+def test_copies_across_workers_link_to_the_stored_story(database):
+    original = raw(HEADLINE, "https://example.com/a", "Apple reported record iPhone sales.", minutes_ago=5)
+    asyncio.run(worker(database, [original]).ingest(["AAPL"], min_poll_interval=timedelta(0)))
+
+    # A fresh worker (no in-memory index) sees a syndicated copy fetched for MSFT
+    copy = raw(f"{HEADLINE} - Reuters", "https://reuters.com/b", "Microsoft and Apple shares both rose.")
+    asyncio.run(worker(database, [copy]).ingest(["MSFT"], ["AAPL", "MSFT"], min_poll_interval=timedelta(0)))
+
+    stored = asyncio.run(worker(database, []).read_news(["AAPL", "MSFT"]))
+    assert {article["url"] for article in stored} == {"https://example.com/a"}
+    assert {article["title"] for article in stored} == {HEADLINE}
+    assert {article["ticker"] for article in stored} == {"AAPL", "MSFT"}
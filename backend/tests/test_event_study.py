@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+
+from app.event_study import CAR_WINDOWS, event_study, window_label
+
+
+def ols(x: np.ndarray, y: np.ndarray):
+    """Plain least-squares fit of y = alpha + beta * x"""
+    design = np.column_stack([np.ones_like(x), x])
+    (alpha, beta), *_ = np.linalg.lstsq(design, y, rcond=None)
+    return alpha, beta
+
+
+@pytest.fixture
+def returns():
+    rng = np.random.default_rng(7)
+    days = 400
+    dates = np.arange("2023-01-02", days, dtype="datetime64[D]")
+    market = rng.normal(0.0005, 0.01, days)
+    stock = 0.0003 + 1.3 * market + rng.normal(0, 0.012, days)
+    # Missing stock returns, e.g. halted days
+    stock[rng.choice(days, 25, replace=False)] = np.nan
+    return dates, stock, market
+
+
+def test_matches_plain_ols(returns):
+    dates, stock, market = returns
+    event_dates = dates[[150, 210, 333]]
+    results = event_study(dates, stock, market, event_dates, estimation_days=120, days_before=5, days_after=5)
+
+    for i, position in enumerate([150, 210, 333]):
+        estimation = slice(position - 125, position - 5)
+        event = slice(position - 5, position + 6)
+        observed = np.isfinite(stock[estimation])
+        alpha, beta = ols(market[estimation][observed], stock[estimation][observed])
+
+        assert results["valid"][i]
+        assert results["alpha"][i] == pytest.approx(alpha, abs=1e-12)
+        assert results["beta"][i] == pytest.approx(beta, rel=1e-9)
+
+        abnormal = stock[event] - (alpha + beta * market[event])
+        assert results["car"][i] == pytest.approx(np.nansum(abnormal) * 100, rel=1e-9)
+
+        volatility_ratio = np.nanstd(stock[event], ddof=1) / np.nanstd(stock[estimation], ddof=1)
+        assert results["volatility_ratio"][i] == pytest.approx(volatility_ratio, rel=1e-9)
+
+        for first, last in CAR_WINDOWS:
+            window = slice(position + first, position + last + 1)
+            expected = np.nansum(stock[window] - (alpha + beta * market[window])) * 100
+            assert results["cars"][window_label((first, last))][i] == pytest.approx(expected, rel=1e-9, abs=1e-12)
+
+
+def test_panel_columns_match_single_series(returns):
+    dates, stock, market = returns
+    other = np.roll(stock, 17)
+    panel = np.column_stack([stock, other])
+    event_dates = dates[[200, 200, 260]]
+
+    batch = event_study(dates, panel, market, event_dates, columns=np.array([0, 1, 1]))
+    for i, series in enumerate([stock, other, other]):
+        single = event_study(dates, series, market, event_dates[i:i + 1])
+        assert batch["car"][i] == pytest.approx(single["car"][0], rel=1e-12)
+        assert batch["beta"][i] == pytest.approx(single["beta"][0], rel=1e-12)
+
+
+def test_too_little_estimation_data_is_invalid(returns):
+    dates, stock, market = returns
+    results = event_study(dates, stock, market, dates[[20, 300]])
+    assert results["valid"].tolist() == [False, True]
+
+
+def test_window_label():
+    assert window_label((-1, 1)) == "[-1,+1]"
+    assert window_label((0, 5)) == "[0,+5]"
@@ -0,0 +1,125 @@
+import asyncio
+import time
+
+import pytest
+
+from app.ingestion_worker import IngestionWorker
+
+
+class Metadata:
+    def __init__(self):
+        self.lookups = []
+
+    def resolve(self, ticker):
+        self.lookups.append(ticker)
+        if ticker == "NOPE":
+            raise ValueError("Unknown ticker")
+        return {"name": f"{ticker} Inc"}
+
+
+class NewsService:
+    def __init__(self, counts=None, error=None):
+        self.metadata = Metadata()
+        self.counts = counts or {}
+        self.error = error
+        self.calls = []
+
+    async def ingest(self, tickers, universe=None, min_poll_interval=None):
+        self.calls.append((list(tickers), sorted(universe)))
+        if self.error:
+            raise self.error
+        return {ticker: self.counts.get(ticker, 0) for ticker in tickers}
+
+
+class Database:
+    def __init__(self):
+        self.tracked = {}
+
+    def track_tickers(self, tickers, requested_at):
+        self.tracked.update({ticker: requested_at for ticker in tickers})
+
+    def get_tracked_tickers(self, requested_since):
+        return {}
+
+
+def make_worker(news=None):
+    return IngestionWorker(news or NewsService(), Database(), min_interval=60, max_interval=1800, batch_size=2)
+
+
+def test_track_validates_tickers():
+    worker = make_worker()
+
+    async def main():
+        valid = await worker.track([" aapl", "AAPL", "NOPE", "not a ticker", "brk.b"])
+        # Bad tickers are not looked up again right away
+        await worker.track(["NOPE"])
+        return valid
+
+    assert asyncio.run(main()) == ["AAPL", "BRK.B"]
+    assert worker.news_service.metadata.lookups == ["AAPL", "NOPE", "BRK.B"]
+    assert set(worker.database.tracked) == {"AAPL", "BRK.B"}
+
+
+def test_interval_follows_new_articles():
+    news = NewsService(counts={"AAPL": 3})
+    worker = make_worker(news)
+
+    async def main():
+        await worker.track(["AAPL", "MSFT"])
+        worker._schedule["AAPL"]["interval"] = 240
+        await worker._poll(["AAPL", "MSFT"])
+
+    asyncio.run(main())
+    assert news.calls == [(["AAPL", "MSFT"], ["AAPL", "MSFT"])]
+    assert worker._schedule["AAPL"]["interval"] == 120
+    assert worker._schedule["MSFT"]["interval"] == 90
+    status = worker.status()
+    assert status["backlog"] == 0
+    assert status["tickers"]["AAPL"]["last_new_articles"] == 3
+
+
+def test_failed_poll_retries_after_min_interval():
+    worker = make_worker(NewsService(error=RuntimeError("provider down")))
+
+    async def main():
+        await worker.track(["AAPL"])
+        worker._schedule["AAPL"]["interval"] = 600
+        await worker._poll(["AAPL"])
+
+    asyncio.run(main())
+    entry = worker._schedule["AAPL"]
+    assert entry["interval"] == 600
+    assert worker._next_due(entry, time.time()) == pytest.approx(time.time() + 60, abs=1)
+    assert worker.status()["errors"] == 1
+
+
+def test_idle_tickers_are_polled_less_and_dropped():
+    worker = make_worker()
+    worker.active_seconds = 3600
+    worker.stop_after = 86400
+
+    async def main():
+        await worker.track(["AAPL", "MSFT"])
+        now = time.time()
+        worker._schedule["AAPL"]["requested_at"] = now - 2 * 3600
+        worker._schedule["MSFT"]["requested_at"] = now - 2 * 86400
+        assert worker._interval(worker._schedule["AAPL"], now) == pytest.approx(120, rel=0.01)
+        await worker._sync()
+
+    asyncio.run(main())
+    assert list(worker._schedule) == ["AAPL"]
+
+
+def test_run_polls_new_tickers_and_wakes_waiters():
+    news = NewsService()
+    worker = make_worker(news)
+
+    async def main():
+        worker.start()
+        await worker.track(["AAPL"])
+        await worker.wait_for_first_poll(["AAPL"], timeout=5)
+        await worker.stop()
+
+    asyncio.run(main())
+    assert news.calls[0][0] == ["AAPL"]
+    assert worker._schedule["AAPL"]["polled"].is_set()
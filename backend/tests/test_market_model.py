@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+
+from app.market_model import fit_from_sums, fit_market_model
+
+
+@pytest.fixture
+def returns():
+    rng = np.random.default_rng(11)
+    market = rng.normal(0.0005, 0.01, 250)
+    stocks = np.column_stack([0.0002 + beta * market + rng.normal(0, 0.01, 250) for beta in (0.8, 1.2, 1.5)])
+    stocks[rng.choice(250, 20, replace=False), 1] = np.nan
+    return stocks, market
+
+
+def test_matches_polyfit(returns):
+    stocks, market = returns
+    model = fit_market_model(stocks[:, 0], market)
+    beta, alpha = np.polyfit(market, stocks[:, 0], 1)
+    assert model.alpha == pytest.approx(alpha, abs=1e-12)
+    assert model.beta == pytest.approx(beta, rel=1e-9)
+    residuals = stocks[:, 0] - (alpha + beta * market)
+    assert model.residual_variance == pytest.approx(residuals @ residuals / 248, rel=1e-9)
+    assert model.n == 250
+
+
+def test_stacked_series_fit_like_single_ones(returns):
+    stocks, market = returns
+    stacked = fit_market_model(stocks, market)
+    for column in range(stocks.shape[1]):
+        single = fit_market_model(stocks[:, column], market)
+        assert stacked.beta[column] == pytest.approx(single.beta, rel=1e-12)
+        assert stacked.t_beta[column] == pytest.approx(single.t_beta, rel=1e-12)
+    # Missing returns are left out of that series' fit only
+    assert stacked.n.tolist() == [250, 230, 250]
+
+
+def test_market_stack_of_the_same_shape(returns):
+    stocks, market = returns
+    markets = np.column_stack([market, np.roll(market, 1), market])
+    stacked = fit_market_model(stocks, markets)
+    assert stacked.beta[1] == pytest.approx(fit_market_model(stocks[:, 1], markets[:, 1]).beta, rel=1e-12)
+
+
+def test_fit_from_sums_takes_scalars():
+    x = np.array([1.0, 2.0, 3.0, 4.0])
+    y = 1.0 + 2.0 * x
+    model = fit_from_sums(4.0, x.sum(), y.sum(), x @ x, x @ y, y @ y)
+    assert model.alpha == pytest.approx(1.0)
+    assert model.beta == pytest.approx(2.0)
@@ -0,0 +1,84 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.news_service import NewsService
+
+NOW = datetime(2026, 10, 16, 12, 0)
+
+
+class Metadata:
+    def company_name(self, ticker):
+        return "Apple"
+
+
+def newsapi_items(count):
+    """count NewsAPI items, newest first, one minute apart"""
+    return [
+        {
+            "title": f"Apple story {i}",
+            "description": "",
+            "url": f"https://example.com/{i}",
+            "publishedAt": (NOW - timedelta(minutes=i)).isoformat() + "Z",
+        }
+        for i in range(count)
+    ]
+
+
+@pytest.fixture
+def service():
+    return NewsService("newsapi-key", "finnhub-key", metadata=Metadata())
+
+
+def serve_newsapi(service, items, calls):
+    async def get_json(provider, url, params):
+        calls.append(params["page"])
+        start = (params["page"] - 1) * params["pageSize"]
+        return {"totalResults": len(items), "articles": items[start:start + params["pageSize"]]}
+    service._get_json = get_json
+
+
+def test_newsapi_pages_back_to_the_mark(service):
+    calls = []
+    serve_newsapi(service, newsapi_items(25), calls)
+    articles = asyncio.run(service._fetch_from_newsapi("AAPL", NOW - timedelta(hours=1)))
+    assert len(articles) == 25
+    assert calls == [1, 2, 3]
+
+
+def test_newsapi_stops_at_max_pages(service):
+    calls = []
+    service.max_pages = 2
+    serve_newsapi(service, newsapi_items(25), calls)
+    articles = asyncio.run(service._fetch_from_newsapi("AAPL", NOW - timedelta(hours=1)))
+    assert len(articles) == 20
+    assert calls == [1, 2]
+
+
+def test_newsapi_keeps_earlier_pages_when_a_later_one_fails(service):
+    items = newsapi_items(15)
+
+    async def get_json(provider, url, params):
+        if params["page"] > 1:
+            raise RuntimeError("maximumResultsReached")
+        return {"totalResults": 100, "articles": items[:10]}
+    service._get_json = get_json
+
+    assert len(asyncio.run(service._fetch_from_newsapi("AAPL", NOW - timedelta(hours=1)))) == 10
+
+
+def test_finnhub_keeps_every_item_since_the_mark(service):
+    since = NOW - timedelta(minutes=30)
+
+    async def get_json(provider, url, params):
+        return [
+            {"headline": f"Apple item {i}", "summary": "", "url": f"https://example.com/f{i}",
+             "datetime": int((NOW - timedelta(minutes=i)).replace(tzinfo=timezone.utc).timestamp())}
+            for i in range(60)
+        ]
+    service._get_json = get_json
+
+    articles = asyncio.run(service._fetch_from_finnhub("AAPL", since))
+    assert len(articles) == 31
+    assert min(article["published_at"] for article in articles) >= since
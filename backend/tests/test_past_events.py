@@ -0,0 +1,43 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("yfinance")
+
+from app.event_analyzer import EventAnalyzer
+from app.price_store import PriceStore
+
+
+@pytest.fixture
+def analyzer(tmp_path, monkeypatch):
+    store = PriceStore(str(tmp_path))
+    rng = np.random.default_rng(2)
+    dates = pd.bdate_range(end=datetime.now().date(), periods=600)
+    market = np.cumprod(1 + rng.normal(0.0005, 0.01, len(dates))) * 400
+    stock = np.cumprod(1 + rng.normal(0.0005, 0.015, len(dates))) * 150
+    for ticker, closes in (("SPY", market), ("ACME", stock)):
+        store.write(ticker, pd.DataFrame(
+            {"Open": closes, "High": closes, "Low": closes, "Close": closes, "Volume": np.full(len(dates), 1e6)},
+            index=dates,
+        ))
+    monkeypatch.delenv("ALPHA_VANTAGE_KEY", raising=False)
+    return EventAnalyzer(price_store=store)
+
+
+def test_reported_dates_are_not_estimated(analyzer, monkeypatch):
+    reported = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(days=60)
+    monkeypatch.setattr(analyzer.earnings_history, "past_reports",
+                        lambda ticker, count: [{"date": reported, "fiscal_quarter": "Q2 2026"}])
+    events = analyzer.get_past_earnings_events("ACME")
+    assert [event["event"] for event in events] == ["Q2 2026 Earnings"]
+    assert not events[0]["estimated"]
+
+
+def test_dates_without_earnings_history_are_marked_estimated(analyzer, monkeypatch):
+    monkeypatch.setattr(analyzer.earnings_history, "past_reports", lambda ticker, count: [])
+    events = analyzer.get_past_earnings_events("ACME")
+    assert len(events) == 4
+    assert all(event["estimated"] for event in events)
+    assert all(event["event"].endswith("Earnings (estimated date)") for event in events)
@@ -0,0 +1,83 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.price_store import PriceStore
+
+
+def bars(dates, closes) -> pd.DataFrame:
+    closes = np.asarray(closes, dtype="float64")
+    return pd.DataFrame(
+        {"Open": closes, "High": closes + 1, "Low": closes - 1, "Close": closes, "Volume": closes * 100},
+        index=pd.DatetimeIndex(dates),
+    )
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = PriceStore(str(tmp_path))
+    store.write("AAPL", bars(["2025-01-02", "2025-01-03", "2025-01-06"], [10, 11, 12]))
+    return store
+
+
+def test_append_adds_newer_bars(store):
+    assert store.append("AAPL", bars(["2025-01-07", "2025-01-08"], [13, 14])) == 2
+    series = store.read("AAPL")
+    assert series.dates.tolist() == np.array(
+        ["2025-01-02", "2025-01-03", "2025-01-06", "2025-01-07", "2025-01-08"], dtype="datetime64[D]"
+    ).tolist()
+    assert series.close.tolist() == [10, 11, 12, 13, 14]
+
+
+def test_append_overwrites_partial_last_bar(store):
+    # The 2025-01-06 bar was stored mid-session
+    assert store.append("AAPL", bars(["2025-01-06", "2025-01-07"], [12.5, 13])) == 1
+    series = store.read("AAPL")
+    assert len(series) == 4
+    assert series.close.tolist() == [10, 11, 12.5, 13]
+    assert series.volume.tolist() == [1000, 1100, 1250, 1300]
+
+
+def test_append_leaves_earlier_rows_alone(store):
+    # Overlapping history from a full download only updates the last stored bar
+    assert store.append("AAPL", bars(["2025-01-02", "2025-01-03", "2025-01-06"], [99, 99, 12.25])) == 0
+    assert store.read("AAPL").close.tolist() == [10, 11, 12.25]
+
+
+def test_append_without_new_bars_still_bumps_updated_at(store):
+    before = store.read("AAPL").updated_at
+    assert store.append("AAPL", bars(["2025-01-02"], [10])) == 0
+    assert store.read("AAPL").updated_at >= before
+    assert store.read("AAPL").close.tolist() == [10, 11, 12]
+
+
+def test_append_to_empty_store_writes_everything(tmp_path):
+    store = PriceStore(str(tmp_path))
+    assert store.append("msft", bars(["2025-01-03", "2025-01-02"], [2, 1])) == 2
+    series = store.read("MSFT")
+    assert series.close.tolist() == [1, 2]
+    assert series.to_frame()["Close"].tolist() == [1, 2]
+
+
+def test_mapped_series_keep_their_values(store):
+    before = store.read("AAPL")
+    store.append("AAPL", bars(["2025-01-06", "2025-01-07"], [12.5, 13]))
+    store.append("AAPL", bars(["2025-01-08"], [14]))
+
+    # Series handed out earlier are read-only views of bytes that never change
+    assert len(before) == 3
+    assert before.close.tolist() == [10, 11, 12]
+    assert store.read("AAPL").close.tolist() == [10, 11, 12.5, 13, 14]
+
+
+def test_rewrites_switch_generations(store, tmp_path):
+    store.append("AAPL", bars(["2025-01-06"], [12.5]))
+    store.write("AAPL", bars(["2025-02-03"], [20]))
+
+    # Only the current generation's column files are left
+    files = sorted(name for name in os.listdir(tmp_path / "AAPL") if name.endswith(".bin"))
+    assert files == sorted(f"{column}.2.bin" for column in ["dates", "open", "high", "low", "close", "volume"])
+    assert store.read("AAPL").close.tolist() == [20]
+    assert PriceStore(str(tmp_path)).read("AAPL").close.tolist() == [20]
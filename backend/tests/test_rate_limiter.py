@@ -0,0 +1,60 @@
+import threading
+import time
+
+import pytest
+
+from app.rate_limiter import BACKGROUND, INTERACTIVE, TokenBucketScheduler
+
+
+def test_burst_is_served_immediately():
+    bucket = TokenBucketScheduler(rate_per_minute=60, burst=3)
+    for _ in range(3):
+        assert bucket.wait(bucket.enqueue()) < 0.05
+    assert bucket.status()["granted"] == 3
+
+
+def test_waits_for_a_refill():
+    bucket = TokenBucketScheduler(rate_per_minute=600, burst=1)  # one token per 0.1s
+    bucket.wait(bucket.enqueue())
+    assert bucket.wait(bucket.enqueue(), timeout=2) >= 0.05
+
+
+def test_interactive_lane_goes_first():
+    bucket = TokenBucketScheduler(rate_per_minute=600, burst=1)
+    bucket.tokens = 0.0
+    background = bucket.enqueue(BACKGROUND)
+    interactive = bucket.enqueue(INTERACTIVE)
+    assert interactive.position == 0 and background.position == 1
+    assert interactive.expected_wait < background.expected_wait
+
+    served = []
+    threads = [
+        threading.Thread(target=lambda ticket=ticket: (bucket.wait(ticket, timeout=2), served.append(ticket.lane)))
+        for ticket in (background, interactive)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+    assert served == [INTERACTIVE, BACKGROUND]
+
+
+def test_timeout_leaves_the_queue():
+    bucket = TokenBucketScheduler(rate_per_minute=1, burst=1)
+    bucket.wait(bucket.enqueue())
+    ticket = bucket.enqueue(BACKGROUND)
+    with pytest.raises(TimeoutError):
+        bucket.wait(ticket, timeout=0.05)
+    assert bucket.status()["queued"] == {"interactive": 0, "background": 0}
+
+
+def test_throttled_backs_off():
+    bucket = TokenBucketScheduler(rate_per_minute=600, burst=5)
+    bucket.throttled(retry_after=30)
+    assert bucket.tokens == 0
+    assert bucket.estimate_wait(INTERACTIVE) >= 29
+    assert bucket.status()["throttle_events"] == 1
+    start = time.monotonic()
+    with pytest.raises(TimeoutError):
+        bucket.wait(bucket.enqueue(), timeout=0.05)
+    assert time.monotonic() - start < 1
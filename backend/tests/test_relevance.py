@@ -0,0 +1,86 @@
+import pytest
+
+from app.relevance import COMPANY_VARIATIONS, COMPETITORS, INDUSTRY_TERMS, RelevanceEngine, symbols_in
+
+TEXTS = [
+    "Apple beats quarterly earnings as iPhone revenue climbs",
+    "Tesla shares fall after Ford and GM cut EV prices",
+    "Microsoft and Google race to add AI to cloud software",
+    "NVDA stock hits record on data center demand; AMD and Intel lag",
+    "Netflix subscription growth slows as Disney streaming gains",
+    "Coinbase trading volume jumps with bitcoin",
+    "Fed holds rates steady; investors weigh guidance",
+    "Shopify merchants see strong holiday e-commerce sales",
+    "Snowflake analyst upgrade lifts price target",
+    "Weather: a sunny weekend ahead for the east coast",
+    "Zoom and Microsoft Teams compete for remote work meetings",
+    "DoorDash expands food delivery to new restaurant partners",
+    "Palantir wins government defense contract",
+    "XYZ Corp announces dividend and share buyback",
+    "",
+]
+
+TICKERS = sorted(set(COMPANY_VARIATIONS) | set(INDUSTRY_TERMS) | set(COMPETITORS)) + ["XYZ", "F", "JPM"]
+
+
+def old_is_relevant(ticker: str, text: str) -> bool:
+    """NewsService._is_relevant_to_ticker before the relevance engine, on the same term tables"""
+    text_lower = text.lower()
+    relevance_score = 0
+
+    if ticker.lower() in text_lower:
+        relevance_score += 10
+
+    for variation in COMPANY_VARIATIONS.get(ticker.upper(), [ticker]):
+        if variation.lower() in text_lower:
+            relevance_score += 8
+            break
+
+    stock_specific_keywords = [
+        "earnings", "revenue", "profit", "loss", "stock", "shares",
+        "dividend", "ipo", "merger", "acquisition", "partnership",
+        "quarterly", "annual", "guidance", "forecast", "analyst",
+        "price target", "upgrade", "downgrade", "rating", "trading",
+        "market cap", "valuation", "investor", "shareholder"
+    ]
+    financial_mentions = sum(1 for keyword in stock_specific_keywords if keyword in text_lower)
+    relevance_score += min(financial_mentions * 2, 6)
+
+    for term in INDUSTRY_TERMS.get(ticker.upper(), []):
+        if term.lower() in text_lower:
+            relevance_score += 3
+            break
+
+    for competitor in COMPETITORS.get(ticker.upper(), []):
+        if competitor.lower() in text_lower:
+            relevance_score += 2
+            break
+
+    return relevance_score >= 5
+
+
+@pytest.fixture(scope="module")
+def engine():
+    return RelevanceEngine()
+
+
+@pytest.mark.parametrize("text", TEXTS)
+def test_matches_old_scoring(engine, text):
+    matches = engine.matches(text)
+    for ticker in TICKERS:
+        assert engine.is_relevant(ticker, text, matches) == old_is_relevant(ticker, text), ticker
+
+
+def test_mentions_need_the_symbol_or_company_name(engine):
+    text = "Apple beats quarterly earnings; shares rose after the analyst upgrade. Samsung and Google trail."
+    assert engine.mentions("AAPL", text)
+    # Keywords and competitor names alone score as relevant, but don't name the ticker
+    assert engine.is_relevant("MSFT", text)
+    assert not engine.mentions("MSFT", text)
+    assert not engine.mentions("TSLA", text)
+
+
+def test_symbols_on_word_boundaries():
+    assert symbols_in("Ford (F) and Tesla shares fall; NOW is the time. $XOM up.") >= {"F", "NOW", "XOM"}
+    assert "F" not in symbols_in("F1 racing returns")
+    assert "TSLA" not in symbols_in("TSLAX fund")
@@ -0,0 +1,60 @@
+import pytest
+
+from app.sentiment import BatchSentiment, label_for
+
+LEXICON = """<?xml version="1.0" encoding="UTF-8"?>
+<sentiment>
+<word form="good" pos="JJ" polarity="0.7" intensity="1.0" />
+<word form="bad" pos="JJ" polarity="-0.7" intensity="1.0" />
+<word form="very" pos="RB" polarity="0.2" intensity="1.3" />
+</sentiment>
+"""
+
+TEXTS = [
+    "Apple beats estimates; shares rally to a record",
+    "Tesla stock plunges after a very bad quarter",
+    "Not a good day for Netflix investors",
+    "The company scheduled its annual meeting",
+    "Great results!! Truly excellent guidance",
+    "",
+]
+
+
+@pytest.fixture
+def engine(tmp_path):
+    path = tmp_path / "lexicon.xml"
+    path.write_text(LEXICON)
+    return BatchSentiment(str(path), finance_overrides={"beats": 0.4})
+
+
+def test_lexicon_rules(engine):
+    good, very_good, not_good, not_bad, mixed, beats, nothing = engine.polarities([
+        "good", "very good", "not good", "not bad", "good and bad", "beats", "nothing here",
+    ])
+    assert good == pytest.approx(0.7)
+    assert very_good == pytest.approx(0.91)
+    assert not_good == pytest.approx(-0.35)
+    assert not_bad == pytest.approx(0.35)
+    assert mixed == pytest.approx(0.0)
+    assert beats == pytest.approx(0.4)
+    assert nothing == 0.0
+
+
+def test_exclamation_boosts_the_word_before(engine):
+    assert engine.polarities(["good!"])[0] == pytest.approx(0.875)
+
+
+def test_batch_matches_one_at_a_time(engine):
+    texts = ["very good", "not bad at all", "bad!", ""]
+    assert engine.polarities(texts).tolist() == pytest.approx([engine.polarities([text])[0] for text in texts])
+
+
+def test_labels():
+    assert [label_for(p) for p in (0.5, 0.05, -0.5)] == ["positive", "neutral", "negative"]
+
+
+def test_matches_textblob_without_overrides():
+    textblob = pytest.importorskip("textblob")
+    engine = BatchSentiment(finance_overrides={})
+    for text, polarity in zip(TEXTS, engine.polarities(TEXTS)):
+        assert polarity == pytest.approx(textblob.TextBlob(text).sentiment.polarity, abs=1e-9), text
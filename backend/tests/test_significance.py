@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+
+from app.significance import car_significance
+
+
+@pytest.fixture
+def returns():
+    rng = np.random.default_rng(3)
+    market = rng.normal(0.0005, 0.01, 131)
+    stock = 0.0002 + 1.1 * market + rng.normal(0, 0.01, 131)
+    return stock, market
+
+
+def fit(stock, market):
+    beta, alpha = np.polyfit(market, stock, 1)
+    return alpha, beta
+
+
+def test_reports_every_statistic(returns):
+    stock, market = returns
+    alpha, beta = fit(stock[:120], market[:120])
+    tests = car_significance(stock[:120], market[:120], stock[120:], market[120:], alpha, beta,
+                             resamples=2000, rng=np.random.default_rng(0))
+
+    assert set(tests) == {"t_stat", "patell_z", "p_value", "ci_low", "ci_high", "confidence", "resamples"}
+    assert 0 < tests["p_value"] <= 1
+    assert tests["ci_low"] < tests["ci_high"]
+    assert tests["resamples"] == 2000
+
+
+def test_large_abnormal_return_is_significant(returns):
+    stock, market = returns
+    alpha, beta = fit(stock[:120], market[:120])
+    event = stock[120:].copy()
+    event[0] += 0.15
+    tests = car_significance(stock[:120], market[:120], event, market[120:], alpha, beta,
+                             resamples=2000, rng=np.random.default_rng(0))
+    assert tests["p_value"] < 0.01
+    assert tests["t_stat"] > 3
+
+
+def test_stock_as_its_own_market_proxy_has_no_tests(returns):
+    _, market = returns
+    # e.g. SPY analysed against SPY: zero residual variance, every statistic would be NaN
+    assert car_significance(market[:120], market[:120], market[120:], market[120:], 0.0, 1.0) is None
+    alpha, beta = fit(market[:120], market[:120])
+    assert car_significance(market[:120], market[:120], market[120:], market[120:], alpha, beta) is None
+
+
+def test_too_little_data_raises(returns):
+    stock, market = returns
+    with pytest.raises(ValueError):
+        car_significance(stock[:3], market[:3], stock[120:], market[120:], 0.0, 1.0)
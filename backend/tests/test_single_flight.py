@@ -0,0 +1,80 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.single_flight import SingleFlight
+
+
+def test_concurrent_threads_share_one_call():
+    flights = SingleFlight()
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return "bars"
+
+    with ThreadPoolExecutor(4) as pool:
+        leader = pool.submit(flights.do, "AAPL", fetch)
+        started.wait(5)
+        followers = [pool.submit(flights.do, "AAPL", fetch) for _ in range(3)]
+        # Followers are waiting on the leader's call before it is released
+        while flights.stats()["shared_results"] < 3:
+            threading.Event().wait(0.01)
+        release.set()
+        results = [leader.result(5)] + [future.result(5) for future in followers]
+
+    assert results == ["bars"] * 4
+    assert len(calls) == 1
+    assert flights.stats() == {"upstream_calls": 1, "shared_results": 3, "in_flight": 0}
+
+
+def test_errors_are_shared_and_not_kept():
+    flights = SingleFlight()
+
+    def fail():
+        raise RuntimeError("upstream down")
+
+    with pytest.raises(RuntimeError):
+        flights.do("AAPL", fail)
+    # Nothing is cached once the call finishes
+    assert flights.do("AAPL", lambda: "ok") == "ok"
+    assert flights.stats()["upstream_calls"] == 2
+
+
+def test_concurrent_coroutines_share_one_call():
+    flights = SingleFlight()
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return "news"
+
+    async def main():
+        return await asyncio.gather(*(flights.do_async("AAPL", fetch) for _ in range(5)))
+
+    assert asyncio.run(main()) == ["news"] * 5
+    assert len(calls) == 1
+    assert flights.stats()["in_flight"] == 0
+
+
+def test_cancelled_waiter_does_not_cancel_the_fetch():
+    flights = SingleFlight()
+
+    async def fetch():
+        await asyncio.sleep(0.02)
+        return "news"
+
+    async def main():
+        waiter = asyncio.ensure_future(flights.do_async("AAPL", fetch))
+        other = asyncio.ensure_future(flights.do_async("AAPL", fetch))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        return await other
+
+    assert asyncio.run(main()) == "news"
@@ -0,0 +1,62 @@
+import os
+import threading
+import time
+
+import pytest
+
+from app.ticker_metadata import TickerMetadata
+
+
+@pytest.fixture
+def master(tmp_path):
+    path = tmp_path / "symbols.csv"
+    path.write_text("symbol,name,exchange,sector\nAAPL,Apple Inc.,NASDAQ,Technology\n")
+    return path
+
+
+def metadata(master, tmp_path, monkeypatch, release=None):
+    """TickerMetadata whose yfinance lookups are recorded (and held until release is set)"""
+    meta = TickerMetadata(str(master), str(tmp_path / "fetched.json"))
+    calls = []
+
+    def refresh(ticker):
+        calls.append((ticker, threading.current_thread().name))
+        if release is not None:
+            release.wait(5)
+        return None
+    monkeypatch.setattr(meta, "_refresh", refresh)
+    return meta, calls
+
+
+def wait_for(condition):
+    deadline = time.monotonic() + 5
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert condition()
+
+
+def test_fresh_master_rows_are_not_refreshed(master, tmp_path, monkeypatch):
+    meta, calls = metadata(master, tmp_path, monkeypatch)
+    for _ in range(5):
+        assert meta.company_name("aapl") == "Apple Inc."
+    time.sleep(0.05)
+    assert calls == []
+
+
+def test_stale_lookups_queue_one_refresh(master, tmp_path, monkeypatch):
+    month_ago = time.time() - 31 * 24 * 3600
+    os.utime(master, (month_ago, month_ago))
+    release = threading.Event()
+    meta, calls = metadata(master, tmp_path, monkeypatch, release)
+
+    threads_before = threading.active_count()
+    for _ in range(20):
+        assert meta.get("AAPL")["name"] == "Apple Inc."
+        meta.get("MSFT")
+    assert threading.active_count() <= threads_before + 1
+    assert meta.status()["refresh_queue"] == 2
+
+    release.set()
+    wait_for(lambda: meta.status()["refresh_queue"] == 0)
+    assert sorted(ticker for ticker, _ in calls) == ["AAPL", "MSFT"]
+    assert {thread for _, thread in calls} == {"ticker-metadata"}
@@ -0,0 +1,43 @@
+from datetime import date
+
+import numpy as np
+import pytest
+
+from app.trading_calendar import TradingCalendar, nyse_holidays
+
+
+@pytest.fixture(scope="module")
+def calendar():
+    return TradingCalendar(2023, 2025)
+
+
+def test_holidays_2024():
+    assert nyse_holidays(2024) == [
+        date(2024, 1, 1), date(2024, 1, 15), date(2024, 2, 19), date(2024, 3, 29), date(2024, 5, 27),
+        date(2024, 6, 19), date(2024, 7, 4), date(2024, 9, 2), date(2024, 11, 28), date(2024, 12, 25),
+    ]
+
+
+def test_observed_holidays():
+    # New Year's Day on a Saturday is not observed; Juneteenth 2027 on a Saturday is observed Friday
+    assert date(2021, 12, 31) not in nyse_holidays(2022)
+    assert date(2027, 6, 18) in nyse_holidays(2027)
+
+
+def test_sessions(calendar):
+    assert len(calendar) == 250 + 252 + 250
+    assert calendar.is_session(date(2024, 3, 28))
+    assert not calendar.is_session(date(2024, 3, 29))  # Good Friday
+    assert not calendar.is_session(np.datetime64("2024-03-30"))
+    assert not calendar.is_session(date(2025, 1, 9))  # National day of mourning
+
+
+def test_window_counts_trading_days(calendar):
+    # 2024-03-29 is a holiday, so the event falls on Monday 2024-04-01
+    lo, hi = calendar.window(date(2024, 3, 29), -1, 1)
+    assert calendar.sessions[lo:hi].tolist() == [date(2024, 3, 28), date(2024, 4, 1), date(2024, 4, 2)]
+
+
+def test_window_is_clipped(calendar):
+    assert calendar.window(date(2023, 1, 3), -5, 0) == (0, 1)
+    assert calendar.window(date(2025, 12, 31), 0, 5) == (len(calendar) - 1, len(calendar))
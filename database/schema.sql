@@ -11,8 +11,12 @@ CREATE TABLE IF NOT EXISTS users (
 CREATE TABLE IF NOT EXISTS stocks (
   id SERIAL PRIMARY KEY,
   ticker TEXT UNIQUE NOT NULL,
-  company_name TEXT
+  company_name TEXT,
+  last_requested_at TIMESTAMP,
+  anomalies_scanned_at TIMESTAMP
 );
+ALTER TABLE stocks ADD COLUMN IF NOT EXISTS last_requested_at TIMESTAMP;
+ALTER TABLE stocks ADD COLUMN IF NOT EXISTS anomalies_scanned_at TIMESTAMP;
 
 -- Events table
 CREATE TABLE IF NOT EXISTS events (
@@ -27,14 +31,67 @@ CREATE TABLE IF NOT EXISTS events (
   created_at TIMESTAMP DEFAULT NOW()
 );
 
--- Articles table
+-- Upgrading from the one-row-per-ticker articles table: keep it as articles_legacy
+DO $$
+BEGIN
+  IF EXISTS (
+    SELECT 1 FROM information_schema.columns
+    WHERE table_name = 'articles' AND column_name = 'ticker'
+  ) THEN
+    ALTER TABLE articles RENAME TO articles_legacy;
+    DROP INDEX IF EXISTS idx_articles_ticker;
+    DROP INDEX IF EXISTS idx_articles_published;
+  END IF;
+END $$;
+
+-- Articles table (one row per story, keyed by its canonical URL)
 CREATE TABLE IF NOT EXISTS articles (
   id SERIAL PRIMARY KEY,
-  ticker TEXT NOT NULL,
+  canonical_url TEXT UNIQUE NOT NULL,
+  provider TEXT,
   title TEXT NOT NULL,
   url TEXT,
   published_at TIMESTAMP,
   sentiment TEXT,
+  polarity FLOAT,
+  summary TEXT,
+  created_at TIMESTAMP DEFAULT NOW()
+);
+
+-- Tickers each article is relevant to (published_at copied for the per-ticker index)
+CREATE TABLE IF NOT EXISTS article_tickers (
+  article_id INTEGER NOT NULL REFERENCES articles(id) ON DELETE CASCADE,
+  ticker TEXT NOT NULL,
+  relevance INTEGER,
+  published_at TIMESTAMP,
+  PRIMARY KEY (article_id, ticker)
+);
+
+-- Headline SimHash of each stored story, filed once per 16-bit band (near-duplicate lookups)
+CREATE TABLE IF NOT EXISTS article_fingerprints (
+  band INTEGER NOT NULL,
+  value INTEGER NOT NULL,
+  article_id INTEGER NOT NULL REFERENCES articles(id) ON DELETE CASCADE,
+  fingerprint BIGINT,
+  PRIMARY KEY (band, value, article_id)
+);
+
+-- Newest published_at seen per ticker and provider (incremental polling)
+CREATE TABLE IF NOT EXISTS news_watermarks (
+  ticker TEXT NOT NULL,
+  provider TEXT NOT NULL,
+  last_published_at TIMESTAMP,
+  last_polled_at TIMESTAMP,
+  PRIMARY KEY (ticker, provider)
+);
+
+-- Article analysis cache (keyed by a hash of the provider and normalized title + description)
+CREATE TABLE IF NOT EXISTS article_analyses (
+  content_hash VARCHAR(64) PRIMARY KEY,
+  scoring_version INTEGER NOT NULL,
+  matches JSONB,
+  sentiment TEXT,
+  polarity FLOAT,
   summary TEXT,
   created_at TIMESTAMP DEFAULT NOW()
 );
@@ -42,7 +99,7 @@ CREATE TABLE IF NOT EXISTS articles (
 -- Indexes for better query performance
 CREATE INDEX IF NOT EXISTS idx_events_ticker ON events(ticker);
 CREATE INDEX IF NOT EXISTS idx_events_date ON events(date);
-CREATE INDEX IF NOT EXISTS idx_articles_ticker ON articles(ticker);
+CREATE INDEX IF NOT EXISTS idx_article_tickers_recent ON article_tickers(ticker, published_at);
 CREATE INDEX IF NOT EXISTS idx_articles_published ON articles(published_at);
 
 -- Comments
@@ -50,3 +107,7 @@ COMMENT ON TABLE users IS 'User accounts for StockLens';
 COMMENT ON TABLE stocks IS 'Tracked stock tickers and company information';
 COMMENT ON TABLE events IS 'Historical and upcoming events with analysis';
 COMMENT ON TABLE articles IS 'News articles with sentiment analysis';
+COMMENT ON TABLE article_tickers IS 'Tickers each article is relevant to, with relevance score';
+COMMENT ON TABLE article_fingerprints IS 'Headline fingerprints of stored stories, so copies found by any worker link to them';
+COMMENT ON TABLE news_watermarks IS 'Per ticker and provider high-water marks for incremental news fetching';
+COMMENT ON TABLE article_analyses IS 'Relevance, sentiment and summary per article content, reused across fetches';
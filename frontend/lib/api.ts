@@ -23,9 +23,20 @@ export interface EventAnalysis {
   event: string;
   date: string;
   car_0_1: number;
+  cars?: Record<string, number>; // CAR per window, keyed like "[-1,+1]"
   volatility_change: number;
   sentiment: string;
   conclusion: string;
+  significance?: {
+    t_stat: number;
+    patell_z: number;
+    p_value: number;
+    ci_low: number;
+    ci_high: number;
+    confidence: number;
+    resamples: number;
+  };
+  estimated?: boolean; // date approximated from a quarterly cadence, not a reported earnings date
 }
 
 export interface UpcomingEvent {